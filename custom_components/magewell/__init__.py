@@ -2,18 +2,79 @@
 
 import logging
 from dataclasses import dataclass
+from datetime import datetime
+from functools import partial
 
-from homeassistant.config_entries import ConfigEntry
+import homeassistant.helpers.config_validation as cv
+import voluptuous as vol
+from homeassistant.config_entries import SOURCE_IMPORT, ConfigEntry
 from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME
 from homeassistant.core import HomeAssistant
-from homeassistant.exceptions import ConfigEntryAuthFailed
-
-from .api import MagewellAuthError, MagewellClient
-from .const import CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL, PLATFORMS
+from homeassistant.exceptions import ConfigEntryAuthFailed, ConfigEntryNotReady
+from homeassistant.helpers import issue_registry as ir
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.typing import ConfigType
+
+from .api import MagewellApiError, MagewellAuthError, MagewellClient
+from .capture import MagewellCapture
+from .command_queue import MagewellCommandQueue
+from .config_flow import async_validate_hosts
+from .const import (
+    CONF_COMMAND_TTL,
+    CONF_FORMAT_SETTLE_TIME,
+    CONF_HEDGE_READS,
+    CONF_HOSTS,
+    CONF_RATE_BURST,
+    CONF_RATE_LIMIT,
+    CONF_RETRY_ATTEMPTS,
+    CONF_SAMPLE_INTERVAL,
+    CONF_SCAN_INTERVAL,
+    CONF_WATCHDOG_THRESHOLD,
+    DEFAULT_COMMAND_TTL,
+    DEFAULT_FORMAT_SETTLE_TIME,
+    DEFAULT_HEDGE_READS,
+    DEFAULT_RATE_BURST,
+    DEFAULT_RATE_LIMIT,
+    DEFAULT_RETRY_ATTEMPTS,
+    DEFAULT_SAMPLE_INTERVAL,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_USERNAME,
+    DEFAULT_WATCHDOG_THRESHOLD,
+    DOMAIN,
+    KEEPALIVE_INTERVAL,
+    MAX_SCAN_INTERVAL,
+    MIN_SCAN_INTERVAL,
+    MIN_WATCHDOG_THRESHOLD,
+    PLATFORMS,
+)
 from .coordinator import MagewellCoordinator
+from .cues import MagewellCueScheduler
+from .fleet import async_get_fleet
+from .limiter import async_get_limiter
+from .services import async_setup_services
+from .storage import async_get_command_store, async_get_session_store
+from .watchdog import MagewellWatchdog
+from .websocket_api import async_setup_websocket_api
 
 _LOGGER = logging.getLogger(__name__)
 
+CONFIG_SCHEMA = vol.Schema(
+    {
+        DOMAIN: vol.Schema(
+            {
+                vol.Required(CONF_HOSTS): vol.All(cv.ensure_list, [cv.string]),
+                vol.Optional(CONF_USERNAME, default=DEFAULT_USERNAME): cv.string,
+                vol.Required(CONF_PASSWORD): cv.string,
+                vol.Optional(CONF_SCAN_INTERVAL, default=DEFAULT_SCAN_INTERVAL): vol.All(
+                    vol.Coerce(int),
+                    vol.Range(min=MIN_SCAN_INTERVAL, max=MAX_SCAN_INTERVAL),
+                ),
+            }
+        )
+    },
+    extra=vol.ALLOW_EXTRA,
+)
+
 
 @dataclass
 class MagewellRuntimeData:
@@ -21,42 +82,172 @@ class MagewellRuntimeData:
 
     client: MagewellClient
     coordinator: MagewellCoordinator
+    commands: MagewellCommandQueue | None = None
+    capture: MagewellCapture | None = None
+    cues: MagewellCueScheduler | None = None
 
 
 type MagewellConfigEntry = ConfigEntry[MagewellRuntimeData]
 
 
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Magewell integration, importing any devices listed in YAML."""
+    async_setup_services(hass)
+    async_setup_websocket_api(hass)
+    if DOMAIN in config:
+        hass.async_create_task(_async_import_hosts(hass, config[DOMAIN]))
+    return True
+
+
+async def _async_import_hosts(hass: HomeAssistant, conf: ConfigType) -> None:
+    """Validate a list of hosts in one pass and create an entry for each good one."""
+    configured = {entry.unique_id for entry in hass.config_entries.async_entries(DOMAIN)}
+    hosts = [host for host in dict.fromkeys(conf[CONF_HOSTS]) if host not in configured]
+
+    failures = await async_validate_hosts(hass, hosts, conf[CONF_USERNAME], conf[CONF_PASSWORD])
+
+    for host in hosts:
+        if host in failures:
+            continue
+        await hass.config_entries.flow.async_init(
+            DOMAIN,
+            context={"source": SOURCE_IMPORT},
+            data={
+                CONF_HOST: host,
+                CONF_USERNAME: conf[CONF_USERNAME],
+                CONF_PASSWORD: conf[CONF_PASSWORD],
+                CONF_SCAN_INTERVAL: conf[CONF_SCAN_INTERVAL],
+            },
+        )
+
+    if not failures:
+        ir.async_delete_issue(hass, DOMAIN, "bulk_import_failed")
+        return
+
+    _LOGGER.warning(
+        "Bulk import failed for %d of %d Magewell devices: %s",
+        len(failures),
+        len(hosts),
+        ", ".join(f"{host} ({reason})" for host, reason in failures.items()),
+    )
+    ir.async_create_issue(
+        hass,
+        DOMAIN,
+        "bulk_import_failed",
+        is_fixable=False,
+        severity=ir.IssueSeverity.WARNING,
+        translation_key="bulk_import_failed",
+        translation_placeholders={
+            "count": str(len(failures)),
+            "failures": "\n".join(f"- {host}: {reason}" for host, reason in failures.items()),
+        },
+    )
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: MagewellConfigEntry) -> bool:
     """Set up Magewell Pro Convert from a config entry."""
+    sessions = await async_get_session_store(hass)
     client = MagewellClient(
         host=entry.data[CONF_HOST],
         username=entry.data[CONF_USERNAME],
         password=entry.data[CONF_PASSWORD],
+        session_callback=partial(sessions.async_set, entry.entry_id),
+        min_session_lifetime=entry.data.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
+        hedge_reads=entry.options.get(CONF_HEDGE_READS, DEFAULT_HEDGE_READS),
+        retry_attempts=entry.options.get(CONF_RETRY_ATTEMPTS, DEFAULT_RETRY_ATTEMPTS),
+        limiter=async_get_limiter(hass, entry.data[CONF_HOST]),
+    )
+    client.limiter.configure(
+        entry.options.get(CONF_RATE_LIMIT, DEFAULT_RATE_LIMIT),
+        entry.options.get(CONF_RATE_BURST, DEFAULT_RATE_BURST),
     )
 
-    try:
-        await client.login()
-    except MagewellAuthError as err:
-        await client.close()
-        raise ConfigEntryAuthFailed from err
+    if cookies := sessions.get(entry.entry_id):
+        # Try the saved session first; the first poll logs in if it was rejected
+        client.restore_session(cookies)
+    else:
+        try:
+            await client.login()
+        except MagewellAuthError as err:
+            await client.close()
+            raise ConfigEntryAuthFailed from err
+        except MagewellApiError as err:
+            # Unreachable, or out of sessions; try again later
+            await client.close()
+            raise ConfigEntryNotReady(str(err)) from err
+
+    watchdog = None
+    if threshold := entry.options.get(CONF_WATCHDOG_THRESHOLD, DEFAULT_WATCHDOG_THRESHOLD):
+        # Options saved before the minimum existed may be lower
+        watchdog = MagewellWatchdog(entry.title, max(threshold, MIN_WATCHDOG_THRESHOLD) / 1000)
 
     coordinator = MagewellCoordinator(
         hass,
         client,
         scan_interval=entry.data.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
         entry=entry,
+        sample_interval=entry.options.get(CONF_SAMPLE_INTERVAL, DEFAULT_SAMPLE_INTERVAL),
+        format_settle_time=entry.options.get(CONF_FORMAT_SETTLE_TIME, DEFAULT_FORMAT_SETTLE_TIME),
+        watchdog=watchdog,
+    )
+    entry.async_on_unload(coordinator.discovery.async_register(coordinator, entry.data[CONF_HOST]))
+    try:
+        await coordinator.async_config_entry_first_refresh()
+    except (ConfigEntryAuthFailed, ConfigEntryNotReady):
+        await client.close()
+        raise
+
+    if watchdog is not None:
+        entry.async_on_unload(watchdog.async_start(hass))
+    if entry.options.get(CONF_SAMPLE_INTERVAL, DEFAULT_SAMPLE_INTERVAL):
+        entry.async_on_unload(coordinator.sampler.async_start(hass, client))
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+
+    async def _async_keepalive(now: datetime) -> None:
+        try:
+            await client.async_keepalive()
+        except MagewellApiError as err:
+            _LOGGER.debug("Session keepalive for %s failed: %s", entry.title, err)
+
+    entry.async_on_unload(
+        async_track_time_interval(
+            hass, _async_keepalive, KEEPALIVE_INTERVAL, name="Magewell keepalive", cancel_on_shutdown=True
+        )
     )
-    await coordinator.async_config_entry_first_refresh()
 
-    entry.runtime_data = MagewellRuntimeData(client=client, coordinator=coordinator)
+    commands = None
+    if ttl := entry.options.get(CONF_COMMAND_TTL, DEFAULT_COMMAND_TTL):
+        commands = MagewellCommandQueue(hass, entry, client, coordinator, await async_get_command_store(hass), ttl)
+        entry.async_on_unload(commands.async_start())
+
+    cues = MagewellCueScheduler(hass, entry, client, coordinator)
+    entry.async_on_unload(cues.async_stop)
+
+    entry.runtime_data = MagewellRuntimeData(client=client, coordinator=coordinator, commands=commands, cues=cues)
+    entry.async_on_unload(async_get_fleet(hass).async_register(entry, coordinator))
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     return True
 
 
+async def _async_update_listener(hass: HomeAssistant, entry: MagewellConfigEntry) -> None:
+    """Reload the entry when its options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: MagewellConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
+        if (capture := entry.runtime_data.capture) is not None:
+            await capture.async_stop()
         await entry.runtime_data.client.close()
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: MagewellConfigEntry) -> None:
+    """Forget the stored session and any queued command of a removed entry."""
+    sessions = await async_get_session_store(hass)
+    sessions.async_remove(entry.entry_id)
+    commands = await async_get_command_store(hass)
+    commands.async_remove(entry.entry_id)
@@ -1,13 +1,26 @@
 """Async HTTP client for Magewell Pro Convert devices."""
 
+import asyncio
 import hashlib
 import logging
+import random
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
 from typing import Any
 
 import aiohttp
+from yarl import URL
+
+from .const import DEFAULT_RATE_BURST, DEFAULT_RATE_LIMIT
+from .limiter import TokenBucket
+from .stats import RingBuffer, TokenBudget
+from .tracing import trace_span
 
 _LOGGER = logging.getLogger(__name__)
 
+type ResponseHook = Callable[[dict[str, Any], float, dict | None, BaseException | None], None]
+
 
 class MagewellApiError(Exception):
     """Base exception for Magewell API errors."""
@@ -17,18 +30,201 @@ class MagewellAuthError(MagewellApiError):
     """Authentication failed."""
 
 
+class MagewellDeviceError(MagewellApiError):
+    """The device rejected a call for a reason other than authentication."""
+
+
+STATUS_OK = 0
+# Status the device returns (or a missing status) when the session cookie has expired
+STATUS_SESSION_EXPIRED = -1
+# The same code in reply to a login means the credentials were rejected; any
+# other non-zero login status (e.g. no free sessions) is a device error
+STATUS_INVALID_CREDENTIALS = -1
+
+# Refresh the session once this fraction of the learned lifetime has passed
+SESSION_REFRESH_MARGIN = 0.8
+# Recent expiries the lifetime estimate is the median of
+SESSION_LIFETIME_SAMPLES = 8
+
+# Methods without side effects, which may be sent more than once
+READ_METHODS = frozenset({"get-summary-info", "get-channel", "get-ndi-sources", "list-channels"})
+
+# Latency samples kept per method, and how many are needed before hedging
+LATENCY_SAMPLES = 64
+HEDGE_MIN_SAMPLES = 20
+# Each read earns this fraction of a hedge, so hedges add at most 5% of
+# recent reads; at most HEDGE_BUDGET_CAPACITY hedges can be saved up
+HEDGE_BUDGET = 0.05
+HEDGE_BUDGET_CAPACITY = 2
+
+# Transport failures on reads are retried with decorrelated jitter between
+# these bounds (seconds). Each successful request earns a tenth of a retry,
+# up to a burst of RETRY_BUDGET_CAPACITY, so an outage where nothing
+# succeeds spends the burst once and then stops retrying
+RETRY_BASE_DELAY = 0.2
+RETRY_MAX_DELAY = 2.0
+RETRY_BUDGET = 0.1
+RETRY_BUDGET_CAPACITY = 10
+# Errors raised when a pooled keep-alive socket was closed by the device;
+# ClientConnectorError (a refused or unreachable connection) is not one
+STALE_SOCKET_ERRORS = (aiohttp.ServerDisconnectedError, aiohttp.ClientOSError)
+
+
+@dataclass
+class MagewellClientStats:
+    """Counters describing how the client has used the device."""
+
+    logins: int = 0
+    session_expiries: int = 0
+    inline_relogins: int = 0
+    proactive_refreshes: int = 0
+    relogins_avoided: int = 0
+    session_evictions: int = 0
+    session_lifetime: float | None = None
+    session_lifetime_mode: str | None = None
+    requests: int = 0
+    hedged_requests: int = 0
+    hedge_wins: int = 0
+    retries: int = 0
+    retry_time: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters for diagnostics."""
+        return asdict(self)
+
+
+def _spread(samples: RingBuffer) -> float:
+    """Return the relative spread of samples around their median."""
+    median = samples.percentile(50) or 0.0
+    if not median:
+        return float("inf")
+    return ((samples.max() or 0.0) - (samples.min() or 0.0)) / median
+
+
+class SessionLifetime:
+    """Estimate how long the device keeps a session alive.
+
+    Each expiry gives two observations: how long the session had been idle
+    and how long ago it was created. The device either drops idle sessions
+    or sessions of a fixed age, whichever explains the expiries with the
+    smaller spread is used. The estimate is the median of recent expiries,
+    so it can grow again and a single early loss does not drag it down.
+    Expiries sooner than ``floor`` (reboots, the web UI taking the session,
+    a rejected saved cookie) are not a lifetime at all and are ignored.
+    """
+
+    def __init__(self, floor: float) -> None:
+        """Initialize with no observations."""
+        self.floor = floor
+        self._idle = RingBuffer(SESSION_LIFETIME_SAMPLES)
+        self._age = RingBuffer(SESSION_LIFETIME_SAMPLES)
+
+    def observe(self, idle: float, age: float | None) -> bool:
+        """Record an expiry; return False if it was discarded as an eviction."""
+        if idle < self.floor and (age is None or age < self.floor):
+            return False
+        if idle >= self.floor:
+            self._idle.append(idle)
+        if age is not None and age >= self.floor:
+            self._age.append(age)
+        return True
+
+    @property
+    def mode(self) -> str | None:
+        """Return "idle" or "absolute", whichever fits the expiries best."""
+        if not self._idle and not self._age:
+            return None
+        if not self._age:
+            return "idle"
+        if not self._idle:
+            return "absolute"
+        if len(self._idle) < 2 or len(self._age) < 2:
+            return "idle"
+        return "absolute" if _spread(self._age) < _spread(self._idle) else "idle"
+
+    @property
+    def seconds(self) -> float | None:
+        """Return the estimated lifetime in the current mode."""
+        mode = self.mode
+        if mode is None:
+            return None
+        return (self._idle if mode == "idle" else self._age).percentile(50)
+
+
 class MagewellClient:
     """Async client for Magewell Pro Convert HTTP API."""
 
-    def __init__(self, host: str, username: str, password: str) -> None:
-        """Initialize the client."""
+    def __init__(
+        self,
+        host: str,
+        username: str,
+        password: str,
+        session_callback: Callable[[dict[str, str]], None] | None = None,
+        min_session_lifetime: float = 0,
+        hedge_reads: bool = False,
+        retry_attempts: int = 0,
+        limiter: TokenBucket | None = None,
+        session: aiohttp.ClientSession | None = None,
+    ) -> None:
+        """Initialize the client.
+
+        ``session_callback`` receives the session cookies after every login so
+        they can be persisted and restored with ``restore_session``. Session
+        expiries sooner than ``min_session_lifetime`` are treated as evictions
+        rather than the device's session lifetime. With
+        ``hedge_reads``, a read that is slower than its observed p95 is sent a
+        second time and the first answer wins. Reads that fail in transport
+        are retried up to ``retry_attempts`` times; writes never are. Every
+        request waits on ``limiter``, which callers share between all clients
+        for the same host; without one the client gets a private limiter.
+        A ``session`` replaces the client's own HTTP session, for example to
+        replay captured traffic; it stays the caller's to close.
+        """
         self._host = host
         self._username = username
         self._password_md5 = hashlib.md5(password.encode()).hexdigest()
         self._base_url = f"http://{host}/mwapi"
-        self._session: aiohttp.ClientSession | None = None
+        self._session: aiohttp.ClientSession | None = session
         self._connector: aiohttp.TCPConnector | None = None
+        # Only a session the client created itself is closed by close()
+        self._owns_session = session is None
         self._logged_in = False
+        self._auth_failed = False
+        self._last_activity: float | None = None
+        self._login_time: float | None = None
+        self._session_lifetime = SessionLifetime(min_session_lifetime)
+        # Activity and login time the session would have had without the
+        # last proactive refresh, to tell whether it avoided an expiry
+        self._refreshed_from: tuple[float, float | None] | None = None
+        self._session_callback = session_callback
+        self._hedge_reads = hedge_reads
+        self._retry_attempts = retry_attempts
+        self.limiter = limiter or TokenBucket(DEFAULT_RATE_LIMIT, DEFAULT_RATE_BURST)
+        self._latency: dict[str, RingBuffer] = {}
+        self._hedge_budget = TokenBudget(HEDGE_BUDGET, HEDGE_BUDGET_CAPACITY)
+        self._retry_budget = TokenBudget(RETRY_BUDGET, RETRY_BUDGET_CAPACITY, initial=RETRY_BUDGET_CAPACITY)
+        self.stats = MagewellClientStats()
+        # Called with the query, duration and raw reply or transport error of
+        # every request; set at runtime to capture traffic
+        self.response_hook: ResponseHook | None = None
+
+    @property
+    def session_cookies(self) -> dict[str, str]:
+        """Return the current session cookies."""
+        if self._session is None:
+            return {}
+        return {cookie.key: cookie.value for cookie in self._session.cookie_jar}
+
+    def restore_session(self, cookies: dict[str, str]) -> None:
+        """Reuse saved session cookies; a rejected cookie falls back to login."""
+        session = self._ensure_session()
+        session.cookie_jar.update_cookies(cookies, URL(f"http://{self._host}/"))
+        self._logged_in = True
+
+    @property
+    def auth_failed(self) -> bool:
+        """Return True once the device has rejected the configured credentials."""
+        return self._auth_failed
 
     def _ensure_session(self) -> aiohttp.ClientSession:
         """Create session if needed."""
@@ -39,71 +235,266 @@ class MagewellClient:
             )
             jar = aiohttp.CookieJar(unsafe=True)
             self._session = aiohttp.ClientSession(connector=self._connector, cookie_jar=jar)
+            self._owns_session = True
             self._logged_in = False
         return self._session
 
     async def login(self) -> None:
         """Authenticate with the device."""
-        session = self._ensure_session()
         try:
-            async with session.get(
-                self._base_url,
-                params={
-                    "method": "login",
-                    "id": self._username,
-                    "pass": self._password_md5,
-                },
-                timeout=aiohttp.ClientTimeout(total=10),
-            ) as resp:
-                data = await resp.json(content_type=None)
+            with trace_span("login"):
+                data = await self._request(
+                    {
+                        "method": "login",
+                        "id": self._username,
+                        "pass": self._password_md5,
+                    }
+                )
         except (aiohttp.ClientError, TimeoutError) as err:
             self._logged_in = False
             raise MagewellApiError(f"Cannot connect to {self._host}: {err}") from err
 
-        if data.get("status") != 0:
+        status = data.get("status")
+        if status == STATUS_INVALID_CREDENTIALS:
+            self._logged_in = False
+            # Remember the rejection so polls stop retrying bad credentials
+            self._auth_failed = True
+            raise MagewellAuthError(f"Login failed (status={status})")
+        if status != STATUS_OK:
+            # A temporary refusal such as running out of sessions; retry later
             self._logged_in = False
-            raise MagewellAuthError(f"Login failed (status={data.get('status')})")
+            raise MagewellDeviceError(f"Login to {self._host} refused (status={status})")
 
         self._logged_in = True
+        self._auth_failed = False
+        self._last_activity = self._login_time = time.monotonic()
+        self.stats.logins += 1
         _LOGGER.debug("Logged in to Magewell at %s", self._host)
+        if self._session_callback is not None:
+            self._session_callback(self.session_cookies)
 
-    async def _call(self, method: str, **params: Any) -> dict:
-        """Call an API method, re-logging in on session expiry."""
-        session = self._ensure_session()
+    def _learn_session_lifetime(self) -> None:
+        """Update the session lifetime estimate using an observed expiry."""
+        self.stats.session_expiries += 1
+        self._refreshed_from = None
+        if self._last_activity is None:
+            # A restored cookie that was rejected says nothing about the lifetime
+            return
+        now = time.monotonic()
+        age = None if self._login_time is None else now - self._login_time
+        if not self._session_lifetime.observe(now - self._last_activity, age):
+            self.stats.session_evictions += 1
+            _LOGGER.debug("Ignoring early session loss on %s", self._host)
+            return
+        self.stats.session_lifetime = self._session_lifetime.seconds
+        self.stats.session_lifetime_mode = self._session_lifetime.mode
+        _LOGGER.debug(
+            "Session lifetime of %s estimated at %.0f s (%s)",
+            self._host,
+            self.stats.session_lifetime,
+            self.stats.session_lifetime_mode,
+        )
 
-        if not self._logged_in:
-            await self.login()
+    def _session_elapsed(self, last_activity: float, login_time: float | None, now: float) -> float | None:
+        """Return how far the session is into its lifetime under the current mode."""
+        if self.stats.session_lifetime_mode == "absolute":
+            return None if login_time is None else now - login_time
+        return now - last_activity
 
-        query = {"method": method, **params}
+    async def async_keepalive(self) -> bool:
+        """Refresh the session before it expires; return True if a login was made.
+
+        Called periodically so that foreground polls and commands never have
+        to pay for a re-login inline.
+        """
+        lifetime = self.stats.session_lifetime
+        if not self._logged_in or self._auth_failed or lifetime is None or self._last_activity is None:
+            return False
+        elapsed = self._session_elapsed(self._last_activity, self._login_time, time.monotonic())
+        if elapsed is None or elapsed < lifetime * SESSION_REFRESH_MARGIN:
+            return False
+        refreshed_from = self._refreshed_from or (self._last_activity, self._login_time)
+        await self.login()
+        self._refreshed_from = refreshed_from
+        self.stats.proactive_refreshes += 1
+        return True
+
+    def _count_avoided_relogin(self, now: float) -> None:
+        """Count a re-login as avoided if the old session would have expired by now."""
+        if self._refreshed_from is None:
+            return
+        last_activity, login_time = self._refreshed_from
+        self._refreshed_from = None
+        elapsed = self._session_elapsed(last_activity, login_time, now)
+        if elapsed is not None and self.stats.session_lifetime is not None and elapsed >= self.stats.session_lifetime:
+            self.stats.relogins_avoided += 1
+
+    def latency(self, method: str) -> RingBuffer:
+        """Return the recent latencies (seconds) of a method."""
+        if (buffer := self._latency.get(method)) is None:
+            buffer = self._latency[method] = RingBuffer(LATENCY_SAMPLES)
+        return buffer
+
+    async def _request(self, query: dict[str, Any], *, record: bool = True) -> dict:
+        """Send one request to the device and decode the JSON reply.
+
+        Without ``record`` the round trip is not added to the method's latency.
+        """
+        session = self._ensure_session()
+        await self.limiter.acquire()
+        self.stats.requests += 1
+        started = time.monotonic()
         try:
             async with session.get(
                 self._base_url,
                 params=query,
                 timeout=aiohttp.ClientTimeout(total=10),
             ) as resp:
-                data = await resp.json(content_type=None)
+                # Reading and decoding the body; large source lists show up here
+                with trace_span(f"{query['method']} parse"):
+                    data = await resp.json(content_type=None)
+        except (aiohttp.ClientError, TimeoutError) as err:
+            if self.response_hook is not None:
+                self.response_hook(query, time.monotonic() - started, None, err)
+            raise
+        elapsed = time.monotonic() - started
+        if record:
+            self.latency(query["method"]).append(elapsed)
+        if self.response_hook is not None:
+            self.response_hook(query, elapsed, data, None)
+        return data
+
+    def _hedge_delay(self, method: str) -> float | None:
+        """Return how long to wait before hedging a read, or None to not hedge."""
+        if not self._hedge_reads or method not in READ_METHODS:
+            return None
+        latency = self.latency(method)
+        if len(latency) < HEDGE_MIN_SAMPLES:
+            return None
+        return latency.percentile(95)
+
+    async def _fetch(self, query: dict[str, Any]) -> dict:
+        """Send a request, hedging slow idempotent reads within the budget.
+
+        A hedged read adds the caller's wait for the first answer to the
+        latency history rather than the round trip of the winning copy, so
+        a stall still raises the p95 that decides when to hedge.
+        """
+        if query["method"] in READ_METHODS:
+            self._hedge_budget.deposit()
+        delay = self._hedge_delay(query["method"])
+        if delay is None:
+            return await self._request(query)
+
+        started = time.monotonic()
+        primary = asyncio.ensure_future(self._request(query))
+        pending = {primary}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=delay)
+            if done or not self._hedge_budget.try_spend():
+                return await primary
+
+            _LOGGER.debug("Hedging %s to %s after %.2f s", query["method"], self._host, delay)
+            self.stats.hedged_requests += 1
+            hedge = asyncio.ensure_future(self._request(query, record=False))
+            pending = {primary, hedge}
+            error: BaseException | None = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if (error := task.exception()) is None:
+                        if task is hedge:
+                            # The primary records its own round trip when it wins
+                            self.stats.hedge_wins += 1
+                            self.latency(query["method"]).append(time.monotonic() - started)
+                        return task.result()
+            assert error is not None
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    @staticmethod
+    def _is_stale_socket(err: Exception) -> bool:
+        """Return True if the error came from a pooled socket the device closed."""
+        return isinstance(err, STALE_SOCKET_ERRORS) and not isinstance(err, aiohttp.ClientConnectorError)
+
+    async def _send(self, query: dict[str, Any]) -> dict:
+        """Send a request, retrying transport failures of idempotent reads."""
+        attempts = self._retry_attempts if query["method"] in READ_METHODS else 0
+        delay = RETRY_BASE_DELAY
+        retry_started: float | None = None
+        attempt = 0
+        try:
+            while True:
+                try:
+                    data = await self._fetch(query)
+                except (aiohttp.ClientError, TimeoutError) as err:
+                    if attempt >= attempts or not self._retry_budget.try_spend():
+                        raise
+                    if retry_started is None:
+                        retry_started = time.monotonic()
+                    self.stats.retries += 1
+                    attempt += 1
+                    if attempt == 1 and self._is_stale_socket(err):
+                        # The device closed an idle pooled socket; aiohttp has
+                        # dropped it, so retry at once on a fresh connection
+                        _LOGGER.debug("Retrying %s on %s after stale connection: %s", query["method"], self._host, err)
+                        continue
+                    # Decorrelated jitter keeps a fleet of clients from retrying in lockstep
+                    delay = min(RETRY_MAX_DELAY, random.uniform(RETRY_BASE_DELAY, delay * 3))
+                    _LOGGER.debug("Retrying %s on %s in %.2f s: %s", query["method"], self._host, delay, err)
+                    await asyncio.sleep(delay)
+                else:
+                    self._retry_budget.deposit()
+                    return data
+        finally:
+            if retry_started is not None:
+                self.stats.retry_time += time.monotonic() - retry_started
+
+    async def _call(self, method: str, **params: Any) -> dict:
+        """Call an API method, re-logging in on session expiry."""
+        with trace_span(method):
+            return await self._call_traced(method, params)
+
+    async def _call_traced(self, method: str, params: dict[str, Any]) -> dict:
+        """Call an API method within its trace span."""
+        if self._auth_failed:
+            raise MagewellAuthError(f"Credentials for {self._host} were rejected; reauthentication required")
+
+        if not self._logged_in:
+            await self.login()
+
+        query = {"method": method, **params}
+        try:
+            data = await self._send(query)
         except (aiohttp.ClientError, TimeoutError) as err:
             raise MagewellApiError(f"API call {method} failed: {err}") from err
 
-        # Re-login once on session expiry (status -1 or missing)
-        status = data.get("status", -1)
-        if status != 0 and self._logged_in:
+        # Classify the status without another round trip: anything other than
+        # an expired session is a device error and re-logging in will not help
+        status = data.get("status", STATUS_SESSION_EXPIRED)
+        if status not in (STATUS_OK, STATUS_SESSION_EXPIRED):
+            raise MagewellDeviceError(f"API call {method} returned status {status}")
+
+        # Re-login once on session expiry; a rejected login raises MagewellAuthError
+        if status == STATUS_SESSION_EXPIRED and self._logged_in:
             _LOGGER.debug("Session expired, re-logging in")
+            self._learn_session_lifetime()
             self._logged_in = False
             await self.login()
+            self.stats.inline_relogins += 1
             try:
-                async with session.get(
-                    self._base_url,
-                    params=query,
-                    timeout=aiohttp.ClientTimeout(total=10),
-                ) as resp:
-                    data = await resp.json(content_type=None)
+                data = await self._send(query)
             except (aiohttp.ClientError, TimeoutError) as err:
                 raise MagewellApiError(f"API call {method} failed after re-login: {err}") from err
 
-            if data.get("status") != 0:
-                raise MagewellApiError(f"API call {method} returned status {data.get('status')}")
+            if data.get("status") != STATUS_OK:
+                raise MagewellDeviceError(f"API call {method} returned status {data.get('status')}")
 
+        now = time.monotonic()
+        self._count_avoided_relogin(now)
+        self._last_activity = now
         return data
 
     async def get_summary_info(self) -> dict:
@@ -130,7 +521,14 @@ class MagewellClient:
         return data.get("channels", [])
 
     async def close(self) -> None:
-        """Close the HTTP session and connector."""
+        """Close the HTTP session and connector, if the client created them.
+
+        A session passed in by the caller is left open and kept, so the
+        client can still be used with it.
+        """
+        if not self._owns_session:
+            self._logged_in = False
+            return
         if self._session and not self._session.closed:
             await self._session.close()
         if self._connector and not self._connector.closed:
@@ -9,7 +9,7 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .coordinator import MagewellCoordinator
-from .sensor import MagewellEntity, _get_ndi_source_name, _get_resolution
+from .sensor import MagewellEntity, _format_label
 
 PARALLEL_UPDATES = 0
 
@@ -49,8 +49,7 @@ class MagewellNdiConnectedSensor(MagewellEntity, BinarySensorEntity):
         """Return NDI source details."""
         if self.coordinator.data is None:
             return {}
-        summary = self.coordinator.data.get("summary", {})
         return {
-            "ndi_source": _get_ndi_source_name(summary),
-            "video_resolution": _get_resolution(summary),
+            "ndi_source": self.coordinator.source_name,
+            "video_resolution": _format_label(self.coordinator.video_format.current),
         }
@@ -0,0 +1,131 @@
+"""Capture of raw device traffic to rotating JSON-lines files."""
+
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HassJob, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.json import json_bytes
+
+from .api import MagewellClient
+
+_LOGGER = logging.getLogger(__name__)
+
+CAPTURE_DIRECTORY = "magewell_capture"
+
+# Lines are written in batches, at the latest this long after being captured
+CAPTURE_FLUSH_DELAY = 5
+CAPTURE_BATCH_SIZE = 100
+
+# Each device's file is rotated at this size, keeping this many old files
+DEFAULT_CAPTURE_MAX_BYTES = 5 * 1024 * 1024
+CAPTURE_BACKUPS = 3
+
+# Login parameters carry the credentials and are never written
+_REDACTED_PARAMS = frozenset({"id", "pass"})
+
+
+class MagewellCapture:
+    """Append every request a client makes, with its timing, to a JSON-lines file.
+
+    Each line holds the wall-clock start time, method, parameters, duration
+    and either the raw reply or the transport error. Lines are buffered and
+    written in batches from the executor, rotating the file like a
+    RotatingFileHandler once it would grow past ``max_bytes``.
+    """
+
+    def __init__(self, hass: HomeAssistant, path: str, max_bytes: int = DEFAULT_CAPTURE_MAX_BYTES) -> None:
+        """Initialize a capture writing to ``path``."""
+        self.hass = hass
+        self.path = path
+        self.max_bytes = max_bytes
+        self._client: MagewellClient | None = None
+        self._buffer: list[dict[str, Any]] = []
+        self._flush_unsub: CALLBACK_TYPE | None = None
+        self._write_lock = asyncio.Lock()
+        self.lines = 0
+
+    @callback
+    def async_start(self, client: MagewellClient) -> None:
+        """Start capturing the traffic of ``client``."""
+        self._client = client
+        client.response_hook = self._record
+
+    async def async_stop(self) -> None:
+        """Stop capturing and write whatever is still buffered."""
+        if self._client is not None and self._client.response_hook == self._record:
+            self._client.response_hook = None
+        self._client = None
+        await self.async_flush()
+
+    @callback
+    def _record(self, query: dict[str, Any], duration: float, data: dict | None, error: BaseException | None) -> None:
+        """Buffer one request."""
+        params = {key: value for key, value in query.items() if key not in _REDACTED_PARAMS}
+        line: dict[str, Any] = {
+            "time": round(time.time() - duration, 6),
+            "method": params.pop("method"),
+            "params": params,
+            "duration": round(duration, 6),
+        }
+        if error is None:
+            line["response"] = data
+        else:
+            line["error"] = f"{type(error).__name__}: {error}"
+        self._buffer.append(line)
+
+        if len(self._buffer) >= CAPTURE_BATCH_SIZE:
+            self._async_flush_soon()
+        elif self._flush_unsub is None:
+            self._flush_unsub = async_call_later(
+                self.hass, CAPTURE_FLUSH_DELAY, HassJob(self._async_flush_later, cancel_on_shutdown=True)
+            )
+
+    @callback
+    def _async_flush_later(self, _now: datetime) -> None:
+        """Write the batch once the flush delay has passed."""
+        self._flush_unsub = None
+        self._async_flush_soon()
+
+    @callback
+    def _async_flush_soon(self) -> None:
+        """Write the buffered lines in the background."""
+        self.hass.async_create_background_task(self.async_flush(), "magewell_capture_flush")
+
+    async def async_flush(self) -> None:
+        """Write the buffered lines to disk."""
+        if self._flush_unsub is not None:
+            self._flush_unsub()
+            self._flush_unsub = None
+        if not self._buffer:
+            return
+        lines, self._buffer = self._buffer, []
+        # One writer at a time so that rotations never interleave
+        async with self._write_lock:
+            try:
+                await self.hass.async_add_executor_job(_write_lines, self.path, lines, self.max_bytes)
+            except OSError as err:
+                _LOGGER.warning("Could not write Magewell capture to %s: %s", self.path, err)
+                return
+        self.lines += len(lines)
+
+
+def _write_lines(path: str, lines: list[dict[str, Any]], max_bytes: int) -> None:
+    """Append lines to the capture file, rotating it first if it would grow too large."""
+    payload = b"".join(json_bytes(line) + b"\n" for line in lines)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    try:
+        size = os.path.getsize(path)
+    except FileNotFoundError:
+        size = 0
+    if size and size + len(payload) > max_bytes:
+        for index in range(CAPTURE_BACKUPS - 1, 0, -1):
+            if os.path.exists(f"{path}.{index}"):
+                os.replace(f"{path}.{index}", f"{path}.{index + 1}")
+        os.replace(path, f"{path}.1")
+    with open(path, "ab") as file:
+        file.write(payload)
@@ -0,0 +1,155 @@
+"""Store-and-forward channel changes for decoders that are temporarily offline."""
+
+import logging
+from datetime import datetime
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HassJob, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
+
+from .api import MagewellApiError, MagewellClient, MagewellDeviceError
+from .const import EVENT_COMMAND_APPLIED, EVENT_COMMAND_EXPIRED, EVENT_COMMAND_QUEUED
+from .coordinator import MagewellCoordinator
+from .storage import MagewellCommandStore
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class MagewellCommandQueue:
+    """Hold the latest desired source until the decoder can take it.
+
+    Only the most recent request is kept: switching to A and then to B while
+    the decoder is rebooting should end on B without passing through A. The
+    command is retried after each successful poll and dropped once it is
+    older than the TTL.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        client: MagewellClient,
+        coordinator: MagewellCoordinator,
+        store: MagewellCommandStore,
+        ttl: int,
+    ) -> None:
+        """Initialize the queue."""
+        self.hass = hass
+        self._entry = entry
+        self._client = client
+        self._coordinator = coordinator
+        self._store = store
+        self.ttl = ttl
+        self._applying = False
+        self._expire_unsub: CALLBACK_TYPE | None = None
+
+    @property
+    def pending(self) -> str | None:
+        """Return the queued source, if any."""
+        command = self._store.get(self._entry.entry_id)
+        return command["source"] if command else None
+
+    def _event_data(self, source: str, **data) -> dict:
+        """Return the common event payload."""
+        return {"config_entry_id": self._entry.entry_id, "source": source, **data}
+
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        """Resume a command saved before a restart and return a function that stops the queue."""
+        remove_listener = self._coordinator.async_add_listener(self._async_coordinator_updated)
+        if (command := self._store.get(self._entry.entry_id)) is not None:
+            self._async_schedule_expiry(command["queued_at"])
+            self._async_coordinator_updated()
+
+        @callback
+        def _async_stop() -> None:
+            remove_listener()
+            self._async_cancel_expiry()
+
+        return _async_stop
+
+    @callback
+    def async_enqueue(self, source: str) -> None:
+        """Queue a source to switch to once the decoder is reachable again."""
+        queued_at = dt_util.utcnow().timestamp()
+        self._store.async_set(self._entry.entry_id, {"source": source, "queued_at": queued_at})
+        self._async_schedule_expiry(queued_at)
+        _LOGGER.debug("Queued switch of %s to %s", self._entry.title, source)
+        self.hass.bus.async_fire(EVENT_COMMAND_QUEUED, self._event_data(source, ttl=self.ttl))
+
+    @callback
+    def async_cancel(self) -> None:
+        """Drop any queued command, e.g. after a newer switch went through directly."""
+        self._store.async_remove(self._entry.entry_id)
+        self._async_cancel_expiry()
+
+    @callback
+    def _async_schedule_expiry(self, queued_at: float) -> None:
+        """Expire the command once it is older than the TTL."""
+        self._async_cancel_expiry()
+        delay = max(0.0, queued_at + self.ttl - dt_util.utcnow().timestamp())
+        self._expire_unsub = async_call_later(self.hass, delay, HassJob(self._async_expire, cancel_on_shutdown=True))
+
+    @callback
+    def _async_cancel_expiry(self) -> None:
+        """Cancel the expiry timer."""
+        if self._expire_unsub is not None:
+            self._expire_unsub()
+            self._expire_unsub = None
+
+    @callback
+    def _async_expire(self, _now: datetime) -> None:
+        """Drop a command the decoder did not take within the TTL."""
+        self._expire_unsub = None
+        self._async_drop("ttl")
+
+    @callback
+    def _async_drop(self, reason: str) -> None:
+        """Drop the queued command and report why."""
+        if (source := self.pending) is None:
+            return
+        self.async_cancel()
+        _LOGGER.warning("Dropped queued switch of %s to %s (%s)", self._entry.title, source, reason)
+        self.hass.bus.async_fire(EVENT_COMMAND_EXPIRED, self._event_data(source, reason=reason))
+
+    @callback
+    def _async_coordinator_updated(self) -> None:
+        """Apply the queued command once the decoder is healthy again."""
+        if self.pending is None or self._applying or not self._coordinator.last_update_success:
+            return
+        self._applying = True
+        self._entry.async_create_background_task(self.hass, self._async_apply(), "magewell_apply_queued_command")
+
+    async def _async_apply(self) -> None:
+        """Send the queued command, keeping it queued if the decoder is still unreachable."""
+        try:
+            command = self._store.get(self._entry.entry_id)
+            if command is None:
+                return
+            if dt_util.utcnow().timestamp() >= command["queued_at"] + self.ttl:
+                self._async_drop("ttl")
+                return
+            source = command["source"]
+            try:
+                await self._client.set_channel(source)
+            except MagewellDeviceError as err:
+                # The decoder is up and refused the source; retrying will not help
+                _LOGGER.debug("Queued switch of %s to %s rejected: %s", self._entry.title, source, err)
+                self._async_drop("rejected")
+                return
+            except MagewellApiError as err:
+                _LOGGER.debug("Queued switch of %s to %s not applied yet: %s", self._entry.title, source, err)
+                return
+        finally:
+            self._applying = False
+
+        if self._store.get(self._entry.entry_id) is not command:
+            # Replaced while the switch was in flight; the newer one goes next
+            self._async_coordinator_updated()
+            return
+        self.async_cancel()
+        delay = dt_util.utcnow().timestamp() - command["queued_at"]
+        _LOGGER.info("Applied queued switch of %s to %s after %.0f s", self._entry.title, source, delay)
+        self.hass.bus.async_fire(EVENT_COMMAND_APPLIED, self._event_data(source, delay=round(delay, 1)))
+        await self._coordinator.async_request_refresh()
@@ -1,18 +1,75 @@
 """Config flow for Magewell Pro Convert."""
 
+import asyncio
+
 import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant, callback
 
 from .api import MagewellAuthError, MagewellClient
 from .const import (
+    BULK_VALIDATION_CONCURRENCY,
+    CONF_COMMAND_TTL,
+    CONF_FORMAT_SETTLE_TIME,
+    CONF_HEDGE_READS,
+    CONF_RATE_BURST,
+    CONF_RATE_LIMIT,
+    CONF_RETRY_ATTEMPTS,
+    CONF_SAMPLE_INTERVAL,
     CONF_SCAN_INTERVAL,
+    CONF_WATCHDOG_THRESHOLD,
+    DEFAULT_COMMAND_TTL,
+    DEFAULT_FORMAT_SETTLE_TIME,
+    DEFAULT_HEDGE_READS,
+    DEFAULT_RATE_BURST,
+    DEFAULT_RATE_LIMIT,
+    DEFAULT_RETRY_ATTEMPTS,
+    DEFAULT_SAMPLE_INTERVAL,
     DEFAULT_SCAN_INTERVAL,
     DEFAULT_USERNAME,
+    DEFAULT_WATCHDOG_THRESHOLD,
     DOMAIN,
+    MAX_COMMAND_TTL,
+    MAX_FORMAT_SETTLE_TIME,
+    MAX_RATE_BURST,
+    MAX_RATE_LIMIT,
+    MAX_RETRY_ATTEMPTS,
+    MAX_SAMPLE_INTERVAL,
     MAX_SCAN_INTERVAL,
+    MAX_WATCHDOG_THRESHOLD,
     MIN_SCAN_INTERVAL,
+    MIN_WATCHDOG_THRESHOLD,
 )
+from .limiter import async_get_limiter
+
+
+async def async_validate_host(hass: HomeAssistant, host: str, username: str, password: str) -> None:
+    """Log in and fetch the summary to prove the device is reachable."""
+    client = MagewellClient(host, username, password, limiter=async_get_limiter(hass, host))
+    try:
+        await client.login()
+        await client.get_summary_info()
+    finally:
+        await client.close()
+
+
+async def async_validate_hosts(hass: HomeAssistant, hosts: list[str], username: str, password: str) -> dict[str, str]:
+    """Validate many devices concurrently, returning the failure reason per host."""
+    semaphore = asyncio.Semaphore(BULK_VALIDATION_CONCURRENCY)
+
+    async def _validate(host: str) -> tuple[str, str | None]:
+        async with semaphore:
+            try:
+                await async_validate_host(hass, host, username, password)
+            except MagewellAuthError:
+                return host, "invalid_auth"
+            except Exception as err:
+                return host, f"cannot_connect ({err})"
+            return host, None
+
+    results = await asyncio.gather(*(_validate(host) for host in hosts))
+    return {host: reason for host, reason in results if reason}
 
 
 class MagewellConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -20,6 +77,12 @@ class MagewellConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry):
+        """Return the options flow handler."""
+        return MagewellOptionsFlow()
+
     async def async_step_user(self, user_input=None):
         """Handle the initial step."""
         errors = {}
@@ -29,16 +92,12 @@ class MagewellConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             username = user_input[CONF_USERNAME]
             password = user_input[CONF_PASSWORD]
 
-            client = MagewellClient(host, username, password)
             try:
-                await client.login()
-                await client.get_summary_info()
+                await async_validate_host(self.hass, host, username, password)
             except MagewellAuthError:
                 errors["base"] = "invalid_auth"
             except Exception:
                 errors["base"] = "cannot_connect"
-            finally:
-                await client.close()
 
             if not errors:
                 await self.async_set_unique_id(host)
@@ -64,6 +123,16 @@ class MagewellConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             errors=errors,
         )
 
+    async def async_step_import(self, import_data):
+        """Create an entry for a device already validated by the bulk YAML import."""
+        host = import_data[CONF_HOST]
+        await self.async_set_unique_id(host)
+        self._abort_if_unique_id_configured()
+        return self.async_create_entry(
+            title=f"Magewell ({host})",
+            data=import_data,
+        )
+
     async def async_step_reauth(self, entry_data):
         """Handle reauthentication when credentials become invalid."""
         return await self.async_step_reauth_confirm()
@@ -78,16 +147,12 @@ class MagewellConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             username = user_input[CONF_USERNAME]
             password = user_input[CONF_PASSWORD]
 
-            client = MagewellClient(host, username, password)
             try:
-                await client.login()
-                await client.get_summary_info()
+                await async_validate_host(self.hass, host, username, password)
             except MagewellAuthError:
                 errors["base"] = "invalid_auth"
             except Exception:
                 errors["base"] = "cannot_connect"
-            finally:
-                await client.close()
 
             if not errors:
                 return self.async_update_reload_and_abort(
@@ -116,16 +181,12 @@ class MagewellConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             username = user_input[CONF_USERNAME]
             password = user_input[CONF_PASSWORD]
 
-            client = MagewellClient(host, username, password)
             try:
-                await client.login()
-                await client.get_summary_info()
+                await async_validate_host(self.hass, host, username, password)
             except MagewellAuthError:
                 errors["base"] = "invalid_auth"
             except Exception:
                 errors["base"] = "cannot_connect"
-            finally:
-                await client.close()
 
             if not errors:
                 return self.async_update_reload_and_abort(
@@ -155,3 +216,79 @@ class MagewellConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             ),
             errors=errors,
         )
+
+
+class MagewellOptionsFlow(config_entries.OptionsFlow):
+    """Handle runtime tuning options for a Magewell device."""
+
+    async def async_step_init(self, user_input=None):
+        """Manage the options."""
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            if 0 < user_input.get(CONF_WATCHDOG_THRESHOLD, 0) < MIN_WATCHDOG_THRESHOLD:
+                errors[CONF_WATCHDOG_THRESHOLD] = "watchdog_threshold_too_low"
+            else:
+                return self.async_create_entry(data=user_input)
+
+        options = self.config_entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        CONF_SAMPLE_INTERVAL,
+                        default=options.get(CONF_SAMPLE_INTERVAL, DEFAULT_SAMPLE_INTERVAL),
+                    ): vol.All(
+                        vol.Coerce(int),
+                        vol.Range(min=0, max=MAX_SAMPLE_INTERVAL),
+                    ),
+                    vol.Optional(
+                        CONF_FORMAT_SETTLE_TIME,
+                        default=options.get(CONF_FORMAT_SETTLE_TIME, DEFAULT_FORMAT_SETTLE_TIME),
+                    ): vol.All(
+                        vol.Coerce(int),
+                        vol.Range(min=0, max=MAX_FORMAT_SETTLE_TIME),
+                    ),
+                    vol.Optional(
+                        CONF_HEDGE_READS,
+                        default=options.get(CONF_HEDGE_READS, DEFAULT_HEDGE_READS),
+                    ): bool,
+                    vol.Optional(
+                        CONF_RETRY_ATTEMPTS,
+                        default=options.get(CONF_RETRY_ATTEMPTS, DEFAULT_RETRY_ATTEMPTS),
+                    ): vol.All(
+                        vol.Coerce(int),
+                        vol.Range(min=0, max=MAX_RETRY_ATTEMPTS),
+                    ),
+                    vol.Optional(
+                        CONF_RATE_LIMIT,
+                        default=options.get(CONF_RATE_LIMIT, DEFAULT_RATE_LIMIT),
+                    ): vol.All(
+                        vol.Coerce(float),
+                        vol.Range(min=0, max=MAX_RATE_LIMIT),
+                    ),
+                    vol.Optional(
+                        CONF_RATE_BURST,
+                        default=options.get(CONF_RATE_BURST, DEFAULT_RATE_BURST),
+                    ): vol.All(
+                        vol.Coerce(int),
+                        vol.Range(min=1, max=MAX_RATE_BURST),
+                    ),
+                    vol.Optional(
+                        CONF_COMMAND_TTL,
+                        default=options.get(CONF_COMMAND_TTL, DEFAULT_COMMAND_TTL),
+                    ): vol.All(
+                        vol.Coerce(int),
+                        vol.Range(min=0, max=MAX_COMMAND_TTL),
+                    ),
+                    vol.Optional(
+                        CONF_WATCHDOG_THRESHOLD,
+                        default=options.get(CONF_WATCHDOG_THRESHOLD, DEFAULT_WATCHDOG_THRESHOLD),
+                    ): vol.All(
+                        vol.Coerce(int),
+                        vol.Range(min=0, max=MAX_WATCHDOG_THRESHOLD),
+                    ),
+                }
+            ),
+            errors=errors,
+        )
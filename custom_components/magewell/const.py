@@ -1,5 +1,7 @@
 """Constants for the Magewell Pro Convert integration."""
 
+from datetime import timedelta
+
 DOMAIN = "magewell"
 
 DEFAULT_USERNAME = "Admin"
@@ -7,6 +9,73 @@ DEFAULT_SCAN_INTERVAL = 30
 MIN_SCAN_INTERVAL = 10
 MAX_SCAN_INTERVAL = 300
 
+# CPU/temperature sampling between polls; 0 disables it and only polls are sampled
+DEFAULT_SAMPLE_INTERVAL = 0
+MAX_SAMPLE_INTERVAL = 60
+SAMPLE_WINDOW = timedelta(minutes=5)
+SAMPLE_STATISTICS = ("min", "max", "mean", "p95")
+
+# Number of recent update traces kept for diagnostics
+TRACE_HISTORY = 20
+
+# How often the client checks whether its session needs a proactive refresh
+KEEPALIVE_INTERVAL = timedelta(seconds=10)
+
+# How long before a scheduled switch the session and connection are warmed up
+CUE_PREWARM = timedelta(seconds=5)
+
+# How long (seconds) a new video format must persist before it is reported
+DEFAULT_FORMAT_SETTLE_TIME = 5
+MAX_FORMAT_SETTLE_TIME = 300
+
+# Re-send reads that run past their p95 latency; off by default
+DEFAULT_HEDGE_READS = False
+
+# Requests per second and burst allowed to each device, shared by every caller
+DEFAULT_RATE_LIMIT = 5.0
+MAX_RATE_LIMIT = 50.0
+DEFAULT_RATE_BURST = 10
+MAX_RATE_BURST = 100
+
+# How long (seconds) a channel change for an unreachable decoder is kept to
+# be applied when it comes back; 0 disables queuing
+DEFAULT_COMMAND_TTL = 0
+MAX_COMMAND_TTL = 3600
+
+# Callbacks running longer than this (milliseconds) on the event loop are
+# flagged with a stack sample; 0 disables the watchdog. The sampler thread
+# wakes every half threshold, so lower thresholds are refused
+DEFAULT_WATCHDOG_THRESHOLD = 0
+MIN_WATCHDOG_THRESHOLD = 10
+MAX_WATCHDOG_THRESHOLD = 1000
+
+# Extra attempts for status reads that fail in transport; channel changes are never retried
+DEFAULT_RETRY_ATTEMPTS = 2
+MAX_RETRY_ATTEMPTS = 5
+
 CONF_SCAN_INTERVAL = "scan_interval"
+CONF_HOSTS = "hosts"
+CONF_SAMPLE_INTERVAL = "sample_interval"
+CONF_FORMAT_SETTLE_TIME = "format_settle_time"
+CONF_HEDGE_READS = "hedge_reads"
+CONF_RETRY_ATTEMPTS = "retry_attempts"
+CONF_RATE_LIMIT = "rate_limit"
+CONF_RATE_BURST = "rate_burst"
+CONF_COMMAND_TTL = "command_ttl"
+CONF_WATCHDOG_THRESHOLD = "watchdog_threshold"
+
+# Maximum number of devices validated at once during a bulk YAML import
+BULK_VALIDATION_CONCURRENCY = 8
 
 PLATFORMS = ["sensor", "binary_sensor", "select"]
+
+# Number of healthy decoders per network segment that query get-ndi-sources
+DISCOVERY_POLLERS_PER_SEGMENT = 2
+
+EVENT_NDI_SOURCE_APPEARED = f"{DOMAIN}_ndi_source_appeared"
+EVENT_NDI_SOURCE_DISAPPEARED = f"{DOMAIN}_ndi_source_disappeared"
+EVENT_VIDEO_FORMAT_CHANGED = f"{DOMAIN}_video_format_changed"
+EVENT_COMMAND_QUEUED = f"{DOMAIN}_command_queued"
+EVENT_COMMAND_APPLIED = f"{DOMAIN}_command_applied"
+EVENT_COMMAND_EXPIRED = f"{DOMAIN}_command_expired"
+EVENT_CUE_FIRED = f"{DOMAIN}_cue_fired"
@@ -1,20 +1,44 @@
 """DataUpdateCoordinator for Magewell Pro Convert."""
 
 import logging
-from datetime import timedelta
+import time
+from datetime import datetime, timedelta
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import CONF_HOST
+from homeassistant.core import CALLBACK_TYPE, HassJob, HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers import issue_registry as ir
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
-from .api import MagewellApiError, MagewellClient
-from .const import DOMAIN
+from .api import MagewellApiError, MagewellAuthError, MagewellClient
+from .const import (
+    DEFAULT_FORMAT_SETTLE_TIME,
+    DOMAIN,
+    EVENT_NDI_SOURCE_APPEARED,
+    EVENT_NDI_SOURCE_DISAPPEARED,
+    EVENT_VIDEO_FORMAT_CHANGED,
+    TRACE_HISTORY,
+)
+from .discovery import async_get_discovery
+from .profiler import async_get_profiler
+from .sampler import MagewellSampler
+from .sources import NdiSourceIndex, _get_ndi_source_name
+from .tracing import PollTrace, PollTracer, trace_span
+from .video import VideoFormat, VideoFormatTracker, VideoPipelineTracker
+from .watchdog import MagewellWatchdog
 
 _LOGGER = logging.getLogger(__name__)
 
 CONSECUTIVE_FAILURE_THRESHOLD = 5
 
+# Boot time estimates closer than this are treated as the same boot (poll jitter)
+BOOT_TIME_TOLERANCE = timedelta(seconds=60)
+
 
 class MagewellCoordinator(DataUpdateCoordinator):
     """Polls Magewell device for summary, channel, and NDI sources."""
@@ -25,6 +49,9 @@ class MagewellCoordinator(DataUpdateCoordinator):
         client: MagewellClient,
         scan_interval: int,
         entry: ConfigEntry,
+        sample_interval: int = 0,
+        format_settle_time: float = DEFAULT_FORMAT_SETTLE_TIME,
+        watchdog: MagewellWatchdog | None = None,
     ) -> None:
         """Initialize the coordinator."""
         super().__init__(
@@ -36,13 +63,83 @@ class MagewellCoordinator(DataUpdateCoordinator):
         self.client = client
         self._entry = entry
         self._consecutive_failures = 0
+        self.discovery = async_get_discovery(hass)
+        self.profiler = async_get_profiler(hass)
+        self.watchdog = watchdog
+        self.ndi_sources = NdiSourceIndex()
+        # Friendly name of the source shown, and the discovered source it matches
+        self.source_name: str | None = None
+        self.current_source: str | None = None
+        self.sampler = MagewellSampler(sample_interval or scan_interval)
+        self.video = VideoPipelineTracker()
+        self.video_format = VideoFormatTracker(format_settle_time)
+        self.traces = PollTracer(TRACE_HISTORY)
+        self._dispatch_trace: PollTrace | None = None
+        self._format_confirmation: CALLBACK_TYPE | None = None
+        entry.async_on_unload(self._async_cancel_format_confirmation)
+        self._ndi_sources_seeded = False
+        self.boot_time: datetime | None = None
+        self._device_identity: tuple[str, str, str, str] | None = None
+        self.device_info = self._build_device_info({})
 
     async def _async_update_data(self) -> dict:
+        """Fetch data from the device, tracing and profiling the update."""
+        if (profile := self.profiler.session) is not None:
+            profile.begin()
+        self._dispatch_trace = None
+        try:
+            with self.traces.trace(close=False) as trace:
+                try:
+                    return await self._async_fetch_data()
+                finally:
+                    # Listener dispatch runs after this returns; it joins the trace,
+                    # which is closed before anything started meanwhile runs again
+                    self._dispatch_trace = trace
+                    self.hass.loop.call_soon(trace.close)
+        finally:
+            if profile is not None:
+                # The dispatch follows without yielding; profile it as part of the update
+                self.hass.loop.call_soon(profile.end, True)
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update all listeners, timing the dispatch that follows an update."""
+        if (profile := self.profiler.session) is not None:
+            profile.begin()
+        try:
+            if (trace := self._dispatch_trace) is None:
+                self._async_dispatch()
+                return
+            self._dispatch_trace = None
+            with trace.span("dispatch"):
+                self._async_dispatch()
+            trace.close()
+        finally:
+            if profile is not None:
+                profile.end()
+
+    @callback
+    def _async_dispatch(self) -> None:
+        """Update all listeners under the watchdog, if enabled."""
+        if self.watchdog is None:
+            super().async_update_listeners()
+            return
+        with self.watchdog.watch("listener dispatch"):
+            super().async_update_listeners()
+
+    async def _async_fetch_data(self) -> dict:
         """Fetch data from the device."""
         try:
             summary = await self.client.get_summary_info()
             channel = await self.client.get_channel()
-            ndi_sources = await self.client.get_ndi_sources()
+            ndi_sources = await self._async_get_ndi_sources()
+        except MagewellAuthError as err:
+            # Start reauth; the coordinator stops polling until the entry is reloaded
+            raise ConfigEntryAuthFailed(
+                translation_domain=DOMAIN,
+                translation_key="auth_failed",
+                translation_placeholders={"error": str(err)},
+            ) from err
         except MagewellApiError as err:
             self._consecutive_failures += 1
             if self._consecutive_failures >= CONSECUTIVE_FAILURE_THRESHOLD:
@@ -71,9 +168,168 @@ class MagewellCoordinator(DataUpdateCoordinator):
                 f"persistent_connection_failure_{self._entry.entry_id}",
             )
         self._consecutive_failures = 0
+        with trace_span("process"):
+            self.sampler.add_poll(summary)
+            now = time.monotonic()
+            self.video.update(summary, now)
+            self._update_video_format(summary, now)
+            self._update_boot_time(summary)
+            self._update_device_identity(summary)
+
+            return {
+                "summary": summary,
+                "channel": channel,
+                "ndi_sources": self._apply_ndi_sources(ndi_sources, summary),
+            }
+
+    def _build_device_info(self, device: dict) -> DeviceInfo:
+        """Build the device info shared by all entities of this decoder."""
+        return DeviceInfo(
+            identifiers={(DOMAIN, self._entry.entry_id)},
+            name=device.get("name", "Magewell Pro Convert"),
+            manufacturer="Magewell",
+            model=device.get("product", "Pro Convert"),
+            sw_version=device.get("firmware-version", ""),
+            serial_number=device.get("serial-number", ""),
+            configuration_url=f"http://{self._entry.data[CONF_HOST]}",
+        )
+
+    def _update_device_identity(self, summary: dict) -> None:
+        """Rebuild device info and update the registry only when identity changes."""
+        device = summary.get("device", {})
+        identity = (
+            device.get("name", ""),
+            device.get("product", ""),
+            device.get("firmware-version", ""),
+            device.get("serial-number", ""),
+        )
+        if identity == self._device_identity:
+            return
+        first_snapshot = self._device_identity is None
+        self._device_identity = identity
+        self.device_info = self._build_device_info(device)
+        if first_snapshot:
+            # Entities register the device with this info when they are added
+            return
+
+        _LOGGER.debug("Device identity of %s changed to %s", self._entry.title, identity)
+        device_registry = dr.async_get(self.hass)
+        device_entry = device_registry.async_get_device(identifiers={(DOMAIN, self._entry.entry_id)})
+        if device_entry is None:
+            return
+        device_registry.async_update_device(
+            device_entry.id,
+            name=self.device_info["name"],
+            model=self.device_info["model"],
+            sw_version=self.device_info["sw_version"],
+            serial_number=self.device_info["serial_number"],
+        )
 
-        return {
-            "summary": summary,
-            "channel": channel,
-            "ndi_sources": ndi_sources,
-        }
+    def _update_video_format(self, summary: dict, now: float) -> None:
+        """Track the debounced video format and fire an event when it changes."""
+        previous = self.video_format.current
+        changed = self.video_format.update(VideoFormat.from_summary(summary), now)
+        if self.video_format.pending and self._format_confirmation is None:
+            # Look again once the settle time has passed instead of waiting
+            # for the next poll, which may be much later
+            self._format_confirmation = async_call_later(
+                self.hass,
+                self.video_format.settle_time,
+                HassJob(self._async_confirm_format, cancel_on_shutdown=True),
+            )
+        if not changed:
+            return
+        current = self.video_format.current
+        self.hass.bus.async_fire(
+            EVENT_VIDEO_FORMAT_CHANGED,
+            {
+                "config_entry_id": self._entry.entry_id,
+                **(current.as_dict() if current else {"width": None, "height": None, "rate": None}),
+                "previous": previous.as_dict() if previous else None,
+            },
+        )
+
+    async def _async_confirm_format(self, _now: datetime) -> None:
+        """Refresh to confirm or discard a format that was waiting to settle."""
+        self._format_confirmation = None
+        await self.async_refresh()
+
+    @callback
+    def _async_cancel_format_confirmation(self) -> None:
+        """Cancel a pending format confirmation refresh."""
+        if self._format_confirmation is not None:
+            self._format_confirmation()
+            self._format_confirmation = None
+
+    def _update_boot_time(self, summary: dict) -> None:
+        """Derive a stable boot timestamp from the device's uptime counter."""
+        uptime = summary.get("device", {}).get("up-time")
+        if uptime is None:
+            return
+        boot_time = (dt_util.utcnow() - timedelta(seconds=uptime)).replace(microsecond=0)
+        if self.boot_time is None or abs(boot_time - self.boot_time) > BOOT_TIME_TOLERANCE:
+            self.boot_time = boot_time
+
+    async def _async_get_ndi_sources(self) -> list[str]:
+        """Return NDI sources, reusing the segment's shared list when possible."""
+        cached = self.discovery.cached_sources(self)
+        if cached is not None:
+            return cached
+        ndi_sources = await self.client.get_ndi_sources()
+        self.discovery.async_publish(self, ndi_sources)
+        return ndi_sources
+
+    @callback
+    def async_set_ndi_sources(self, ndi_sources: list[str]) -> None:
+        """Apply a source list discovered by another decoder on the same network.
+
+        Only the data and entities are updated: the decoder's own health and
+        poll schedule are left alone, so an offline decoder stays unavailable
+        and keeps its regular refresh.
+        """
+        if self.data is None or not self.last_update_success:
+            return
+        self.data = {**self.data, "ndi_sources": self._apply_ndi_sources(ndi_sources, self.data["summary"])}
+        self.async_update_listeners()
+
+    async def async_resolve_source(self, name: str, refresh: bool = False) -> str | None:
+        """Return the discovered source ``name`` refers to, or None if it is unknown.
+
+        Names are checked against the cached source index without a round
+        trip. With ``refresh``, a name missing from the index makes the
+        decoder list its sources once more before the name is rejected.
+        """
+        if (source := self.ndi_sources.resolve(name)) is not None or not refresh:
+            return source
+        names = self._apply_ndi_sources(await self.client.get_ndi_sources(), self.data["summary"])
+        if names is not self.data["ndi_sources"]:
+            self.data = {**self.data, "ndi_sources": names}
+            self.async_update_listeners()
+        return self.ndi_sources.resolve(name)
+
+    def _apply_ndi_sources(self, ndi_sources: list[str], summary: dict) -> list[str]:
+        """Update the source index, fire events for real changes, return stable names.
+
+        The source shown by the decoder is looked up in the index here, once
+        per poll or discovery, rather than by every entity on every read.
+        """
+        if self.watchdog is None:
+            added, removed = self.ndi_sources.update(ndi_sources)
+        else:
+            with self.watchdog.watch("NDI source index"):
+                added, removed = self.ndi_sources.update(ndi_sources)
+        if self._ndi_sources_seeded:
+            for source in added:
+                self.hass.bus.async_fire(
+                    EVENT_NDI_SOURCE_APPEARED,
+                    {"config_entry_id": self._entry.entry_id, "source": source},
+                )
+            for source in removed:
+                self.hass.bus.async_fire(
+                    EVENT_NDI_SOURCE_DISAPPEARED,
+                    {"config_entry_id": self._entry.entry_id, "source": source},
+                )
+        self._ndi_sources_seeded = True
+        self.source_name = _get_ndi_source_name(summary)
+        self.current_source = self.ndi_sources.match(summary.get("ndi", {}).get("name"), self.source_name)
+        return self.ndi_sources.names
@@ -0,0 +1,143 @@
+"""Source switches timed to land on a wall-clock cue."""
+
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from functools import partial
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HassJob, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.util import dt as dt_util
+
+from .api import MagewellApiError, MagewellClient
+from .const import CUE_PREWARM, EVENT_CUE_FIRED
+from .coordinator import MagewellCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Methods whose median round trip estimates how long a switch takes to land,
+# best first: a measured switch, then the read sent while warming up
+_LEAD_METHODS = ("set-channel", "get-channel")
+
+
+@dataclass
+class _Cue:
+    """A switch waiting for its time."""
+
+    source: str
+    target: datetime
+    lead: float = 0.0
+    unsub: CALLBACK_TYPE | None = field(default=None, repr=False)
+
+
+class MagewellCueScheduler:
+    """Switch a decoder's source so that the switch lands at a given time.
+
+    Shortly before the cue the session is refreshed and the connection is
+    opened with a cheap read, so the switch itself never waits for a login
+    or a TCP handshake. The switch is then sent early by the decoder's
+    median set-channel round trip, and an event reports how far from the
+    cue the decoder confirmed it. Cues are not kept across restarts.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        client: MagewellClient,
+        coordinator: MagewellCoordinator,
+    ) -> None:
+        """Initialize the scheduler."""
+        self.hass = hass
+        self._entry = entry
+        self._client = client
+        self._coordinator = coordinator
+        self._cues: list[_Cue] = []
+
+    @property
+    def lead(self) -> float:
+        """Return how long before the cue (seconds) the switch is sent."""
+        for method in _LEAD_METHODS:
+            if (latency := self._client.latency(method).percentile(50)) is not None:
+                return latency
+        return 0.0
+
+    @callback
+    def async_stop(self) -> None:
+        """Cancel every scheduled cue."""
+        for cue in self._cues:
+            if cue.unsub is not None:
+                cue.unsub()
+        self._cues.clear()
+
+    @callback
+    def async_schedule(self, source: str, target: datetime) -> None:
+        """Switch to ``source`` at ``target``."""
+        cue = _Cue(source, dt_util.as_utc(target))
+        self._cues.append(cue)
+        self._async_at(cue, cue.target - CUE_PREWARM, self._async_prewarm_soon)
+        _LOGGER.debug("Scheduled switch of %s to %s at %s", self._entry.title, source, cue.target)
+
+    @callback
+    def _async_at(self, cue: _Cue, when: datetime, action: Callable[[_Cue, datetime], None]) -> None:
+        """Run ``action(cue, now)`` at ``when``, or as soon as possible if that has passed."""
+        cue.unsub = async_track_point_in_utc_time(
+            self.hass, HassJob(partial(action, cue), cancel_on_shutdown=True), when
+        )
+
+    @callback
+    def _async_prewarm_soon(self, cue: _Cue, _now: datetime) -> None:
+        """Warm up the connection in the background."""
+        cue.unsub = None
+        self._entry.async_create_background_task(self.hass, self._async_prewarm(cue), "magewell_cue_prewarm")
+
+    async def _async_prewarm(self, cue: _Cue) -> None:
+        """Refresh the session and open the connection, then time the switch."""
+        try:
+            await self._client.async_keepalive()
+            await self._client.get_channel()
+        except MagewellApiError as err:
+            # The switch still goes out and reports its own failure
+            _LOGGER.debug("Warming up %s for a cue failed: %s", self._entry.title, err)
+        if cue in self._cues:
+            cue.lead = self.lead
+            self._async_at(cue, cue.target - timedelta(seconds=cue.lead), self._async_fire_soon)
+
+    @callback
+    def _async_fire_soon(self, cue: _Cue, _now: datetime) -> None:
+        """Send the switch in the background."""
+        cue.unsub = None
+        self._cues.remove(cue)
+        self._entry.async_create_background_task(self.hass, self._async_fire(cue), "magewell_cue_fire")
+
+    async def _async_fire(self, cue: _Cue) -> None:
+        """Send the switch and report how far from the cue it landed."""
+        error = None
+        try:
+            await self._client.set_channel(cue.source)
+        except MagewellApiError as err:
+            error = str(err)
+        offset = (dt_util.utcnow() - cue.target).total_seconds()
+
+        if error is None:
+            _LOGGER.info("Switched %s to %s %+.3f s from its cue", self._entry.title, cue.source, offset)
+        else:
+            _LOGGER.warning("Cued switch of %s to %s failed: %s", self._entry.title, cue.source, error)
+        self.hass.bus.async_fire(
+            EVENT_CUE_FIRED,
+            {
+                "config_entry_id": self._entry.entry_id,
+                "source": cue.source,
+                "target": cue.target.isoformat(),
+                "lead": round(cue.lead, 3),
+                "offset": round(offset, 3),
+                "error": error,
+            },
+        )
+        if error is None:
+            if (commands := self._entry.runtime_data.commands) is not None:
+                # The cue supersedes a switch still queued for an offline decoder
+                commands.async_cancel()
+            await self._coordinator.async_request_refresh()
@@ -25,4 +25,11 @@ async def async_get_config_entry_diagnostics(
             "channel": coordinator.data.get("channel", {}) if coordinator.data else {},
             "ndi_sources": coordinator.data.get("ndi_sources", []) if coordinator.data else [],
         },
+        "ndi_discovery": coordinator.discovery.as_dict(coordinator),
+        "client": entry.runtime_data.client.stats.as_dict(),
+        "rate_limiter": entry.runtime_data.client.limiter.as_dict(),
+        "traces": coordinator.traces.as_list(),
+        # Save this value to a .json file to open it in Perfetto or chrome://tracing
+        "trace_events": coordinator.traces.as_trace_events(entry.title),
+        "watchdog": coordinator.watchdog.as_dict() if coordinator.watchdog else None,
     }
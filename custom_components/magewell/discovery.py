@@ -0,0 +1,153 @@
+"""Domain-wide NDI source discovery shared by decoders on the same network."""
+
+from __future__ import annotations
+
+import ipaddress
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.singleton import singleton
+from homeassistant.util.hass_dict import HassKey
+
+from .const import DISCOVERY_POLLERS_PER_SEGMENT, DOMAIN
+
+if TYPE_CHECKING:
+    from .coordinator import MagewellCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_DISCOVERY: HassKey[MagewellDiscovery] = HassKey(f"{DOMAIN}_discovery")
+
+
+def network_segment(host: str) -> str:
+    """Return the network segment a host belongs to (/24 for IPv4, /64 for IPv6)."""
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        # Hostnames cannot be grouped reliably, so each one is its own segment
+        return host
+    prefix = 24 if address.version == 4 else 64
+    return str(ipaddress.ip_network(f"{address}/{prefix}", strict=False))
+
+
+@dataclass
+class _Segment:
+    """Discovery state for one network segment."""
+
+    members: list[MagewellCoordinator] = field(default_factory=list)
+    sources: list[str] | None = None
+    updated: float = 0.0
+    owner: MagewellCoordinator | None = None
+
+
+class MagewellDiscovery:
+    """Share get-ndi-sources results between decoders on the same segment.
+
+    Only the first few healthy decoders in each segment query the device for
+    NDI sources; everyone else reuses their list. The first poller owns the
+    shared list and the others are standbys whose lists are only used once the
+    owner's has gone stale, so slightly different views from two decoders do
+    not make the list flip. If a poller fails, the next healthy member takes
+    over on its following update, and a stale cache makes any member poll for
+    itself.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the discovery cache."""
+        self._segments: dict[str, _Segment] = {}
+        self._member_segment: dict[MagewellCoordinator, str] = {}
+
+    @callback
+    def async_register(self, coordinator: MagewellCoordinator, host: str) -> CALLBACK_TYPE:
+        """Add a coordinator to its segment and return a function to remove it."""
+        key = network_segment(host)
+        self._segments.setdefault(key, _Segment()).members.append(coordinator)
+        self._member_segment[coordinator] = key
+
+        @callback
+        def _unregister() -> None:
+            segment = self._segments[key]
+            segment.members.remove(coordinator)
+            del self._member_segment[coordinator]
+            if segment.owner is coordinator:
+                segment.owner = None
+            if not segment.members:
+                del self._segments[key]
+
+        return _unregister
+
+    def _pollers(self, segment: _Segment) -> list[MagewellCoordinator]:
+        """Return the members currently responsible for polling the segment."""
+        healthy = [member for member in segment.members if member.last_update_success]
+        return healthy[:DISCOVERY_POLLERS_PER_SEGMENT]
+
+    def is_poller(self, coordinator: MagewellCoordinator) -> bool:
+        """Return True if the coordinator should query its device for sources."""
+        key = self._member_segment.get(coordinator)
+        if key is None:
+            return True
+        return coordinator in self._pollers(self._segments[key])
+
+    @staticmethod
+    def _is_fresh(segment: _Segment, coordinator: MagewellCoordinator) -> bool:
+        """Return True if the shared list is recent enough for the coordinator."""
+        max_age = 2 * coordinator.update_interval.total_seconds() if coordinator.update_interval else 0
+        return segment.sources is not None and time.monotonic() - segment.updated <= max_age
+
+    def cached_sources(self, coordinator: MagewellCoordinator) -> list[str] | None:
+        """Return the shared source list, or None if the coordinator must poll itself."""
+        key = self._member_segment.get(coordinator)
+        if key is None or self.is_poller(coordinator):
+            return None
+        segment = self._segments[key]
+        if not self._is_fresh(segment, coordinator):
+            return None
+        return segment.sources
+
+    @callback
+    def async_publish(self, coordinator: MagewellCoordinator, sources: list[str]) -> None:
+        """Store a freshly polled source list and fan changes out to the segment."""
+        key = self._member_segment.get(coordinator)
+        if key is None:
+            return
+        segment = self._segments[key]
+        if (
+            segment.owner is not None
+            and segment.owner is not coordinator
+            and segment.owner in self._pollers(segment)
+            and self._is_fresh(segment, coordinator)
+        ):
+            # A standby poller; the owner's list stays authoritative while fresh
+            return
+        segment.owner = coordinator
+        changed = segment.sources != sources
+        segment.sources = sources
+        segment.updated = time.monotonic()
+        if not changed:
+            return
+        _LOGGER.debug("NDI sources changed on segment %s, updating %d decoders", key, len(segment.members) - 1)
+        for member in segment.members:
+            if member is not coordinator:
+                member.async_set_ndi_sources(sources)
+
+    def as_dict(self, coordinator: MagewellCoordinator) -> dict:
+        """Return the coordinator's discovery role for diagnostics."""
+        key = self._member_segment.get(coordinator)
+        if key is None:
+            return {}
+        segment = self._segments[key]
+        return {
+            "segment": key,
+            "members": len(segment.members),
+            "poller": self.is_poller(coordinator),
+        }
+
+
+@callback
+@singleton(DATA_DISCOVERY)
+def async_get_discovery(hass: HomeAssistant) -> MagewellDiscovery:
+    """Return the domain-wide discovery cache."""
+    return MagewellDiscovery()
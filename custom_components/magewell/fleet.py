@@ -0,0 +1,213 @@
+"""Registry of every loaded decoder, for views over the whole fleet."""
+
+import heapq
+from collections.abc import Callable
+from functools import partial
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.singleton import singleton
+from homeassistant.util.hass_dict import HassKey
+
+from .const import DOMAIN
+from .coordinator import MagewellCoordinator
+
+DATA_FLEET: HassKey["MagewellFleet"] = HassKey(f"{DOMAIN}_fleet")
+
+# Bumped whenever a field of the decoder snapshot changes meaning or is removed
+FLEET_SCHEMA_VERSION = 1
+
+LATENCY_METHOD = "get-summary-info"
+
+
+def decoder_snapshot(entry: ConfigEntry, coordinator: MagewellCoordinator) -> dict[str, Any]:
+    """Return the compact view of one decoder shown on fleet dashboards."""
+    summary = coordinator.data.get("summary", {}) if coordinator.data else {}
+    device = summary.get("device", {})
+    video_format = coordinator.video_format.current
+    latency = coordinator.client.latency(LATENCY_METHOD).percentile(50)
+    return {
+        "name": entry.title,
+        "available": coordinator.last_update_success,
+        "status": ("ok" if summary.get("status") == 0 else "error") if summary else None,
+        "source": coordinator.source_name if summary else None,
+        "connected": bool(summary.get("ndi", {}).get("connected")),
+        "resolution": video_format.label if video_format else None,
+        "cpu_usage": device.get("cpu-usage"),
+        "core_temperature": device.get("core-temp"),
+        # Median poll latency in whole milliseconds, so jitter does not flood subscribers
+        "latency": round(latency * 1000) if latency is not None else None,
+    }
+
+
+class FleetTotals:
+    """Fleet-wide counts kept up to date one decoder at a time.
+
+    Each update replaces one decoder's previous contribution, so the totals
+    cost O(1) per decoder update (O(log n) for the hottest temperature)
+    instead of a scan of the fleet. The hottest temperature comes from a
+    max-heap whose outdated readings are dropped lazily when they reach the
+    top, and the heap is rebuilt once outdated readings outnumber live ones.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty totals."""
+        self.decoders = 0
+        self.connected = 0
+        self.errors = 0
+        self._cpu_total = 0.0
+        self._cpu_count = 0
+        self._cpu: dict[str, float] = {}
+        self._temperatures: dict[str, float] = {}
+        self._temperature_heap: list[tuple[float, str]] = []
+        self._contributions: dict[str, tuple[bool, bool]] = {}
+
+    @property
+    def mean_cpu_usage(self) -> float | None:
+        """Return the mean CPU usage of the decoders reporting one."""
+        return self._cpu_total / self._cpu_count if self._cpu_count else None
+
+    @property
+    def max_core_temperature(self) -> float | None:
+        """Return the hottest core temperature reported."""
+        heap = self._temperature_heap
+        while heap and self._temperatures.get(heap[0][1]) != -heap[0][0]:
+            heapq.heappop(heap)
+        return -heap[0][0] if heap else None
+
+    def update(self, entry_id: str, coordinator: MagewellCoordinator | None) -> None:
+        """Replace the contribution of one decoder; None removes it."""
+        if (previous := self._contributions.pop(entry_id, None)) is not None:
+            self.decoders -= 1
+            self.connected -= previous[0]
+            self.errors -= previous[1]
+        if (cpu := self._cpu.pop(entry_id, None)) is not None:
+            self._cpu_total -= cpu
+            self._cpu_count -= 1
+        self._temperatures.pop(entry_id, None)
+        if coordinator is None:
+            return
+
+        summary = coordinator.data.get("summary", {}) if coordinator.last_update_success and coordinator.data else {}
+        device = summary.get("device", {})
+        connected = bool(summary.get("ndi", {}).get("connected"))
+        error = not summary or summary.get("status") != 0
+        self._contributions[entry_id] = (connected, error)
+        self.decoders += 1
+        self.connected += connected
+        self.errors += error
+        if (cpu := device.get("cpu-usage")) is not None:
+            self._cpu[entry_id] = cpu
+            self._cpu_total += cpu
+            self._cpu_count += 1
+        if (temperature := device.get("core-temp")) is not None:
+            self._temperatures[entry_id] = temperature
+            heapq.heappush(self._temperature_heap, (-temperature, entry_id))
+            if len(self._temperature_heap) > 2 * len(self._temperatures) + 16:
+                self._temperature_heap = [(-value, key) for key, value in self._temperatures.items()]
+                heapq.heapify(self._temperature_heap)
+
+
+class MagewellFleet:
+    """Every loaded decoder, notifying subscribers when one changes.
+
+    Subscribers are called with the entry id of a decoder that was added,
+    updated or removed, and look up its current snapshot themselves. The
+    fleet sensors belong to one decoder's sensor platform at a time; when
+    that decoder is unloaded another one that offered to host them takes over.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize an empty fleet."""
+        self.hass = hass
+        self.totals = FleetTotals()
+        self._members: dict[str, tuple[ConfigEntry, MagewellCoordinator]] = {}
+        self._listeners: list[Callable[[str], None]] = []
+        self._hosts: dict[str, Callable[[], None]] = {}
+        self._host: str | None = None
+
+    @callback
+    def async_register(self, entry: ConfigEntry, coordinator: MagewellCoordinator) -> CALLBACK_TYPE:
+        """Add a decoder and return a function that removes it."""
+        entry_id = entry.entry_id
+        self._members[entry_id] = (entry, coordinator)
+        remove_listener = coordinator.async_add_listener(partial(self._async_member_updated, entry_id))
+        self._async_member_updated(entry_id)
+
+        @callback
+        def _async_unregister() -> None:
+            remove_listener()
+            self._members.pop(entry_id, None)
+            self._async_member_updated(entry_id)
+
+        return _async_unregister
+
+    @callback
+    def async_offer_host(self, entry_id: str, add_sensors: Callable[[], None]) -> CALLBACK_TYPE:
+        """Offer a decoder's sensor platform to host the fleet sensors.
+
+        ``add_sensors`` is called if and when this decoder becomes the host.
+        Returns a function that withdraws the offer, handing the sensors to
+        another decoder if this one was hosting them.
+        """
+        self._hosts[entry_id] = add_sensors
+        if self._host is None:
+            self._async_elect_host()
+
+        @callback
+        def _async_withdraw() -> None:
+            self._hosts.pop(entry_id, None)
+            if self._host == entry_id:
+                self._host = None
+                if not self.hass.is_stopping:
+                    self._async_elect_host()
+
+        return _async_withdraw
+
+    @callback
+    def _async_elect_host(self) -> None:
+        """Let the first decoder that offered add the fleet sensors."""
+        if self._hosts:
+            self._host, add_sensors = next(iter(self._hosts.items()))
+            add_sensors()
+
+    @callback
+    def _async_member_updated(self, entry_id: str) -> None:
+        """Fold a decoder's new data into the totals and tell the subscribers."""
+        member = self._members.get(entry_id)
+        self.totals.update(entry_id, member[1] if member else None)
+        self._async_notify(entry_id)
+
+    @callback
+    def async_subscribe(self, listener: Callable[[str], None]) -> CALLBACK_TYPE:
+        """Call ``listener`` with the entry id of every decoder that changes."""
+        self._listeners.append(listener)
+
+        @callback
+        def _async_unsubscribe() -> None:
+            self._listeners.remove(listener)
+
+        return _async_unsubscribe
+
+    @callback
+    def _async_notify(self, entry_id: str) -> None:
+        """Tell the subscribers a decoder changed."""
+        for listener in list(self._listeners):
+            listener(entry_id)
+
+    def snapshot(self, entry_id: str) -> dict[str, Any] | None:
+        """Return the snapshot of one decoder, or None if it is not loaded."""
+        if (member := self._members.get(entry_id)) is None:
+            return None
+        return decoder_snapshot(*member)
+
+    def snapshots(self) -> dict[str, dict[str, Any]]:
+        """Return the snapshot of every decoder, keyed by entry id."""
+        return {entry_id: decoder_snapshot(*member) for entry_id, member in self._members.items()}
+
+
+@singleton(DATA_FLEET)
+def async_get_fleet(hass: HomeAssistant) -> MagewellFleet:
+    """Return the domain-wide fleet registry."""
+    return MagewellFleet(hass)
@@ -0,0 +1,123 @@
+"""Per-host request rate limiting for Magewell devices."""
+
+import asyncio
+import time
+from collections import deque
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.singleton import singleton
+from homeassistant.util.hass_dict import HassKey
+
+from .const import DEFAULT_RATE_BURST, DEFAULT_RATE_LIMIT, DOMAIN
+
+DATA_LIMITERS: HassKey["MagewellLimiters"] = HassKey(f"{DOMAIN}_limiters")
+
+
+class TokenBucket:
+    """Token-bucket limiter that admits waiting callers in arrival order.
+
+    The decoder only serves a few HTTP sessions, so every client for a host
+    shares one bucket. Only the caller at the head of the queue waits for a
+    token; the others wait for their turn, so a burst of polls, samples and
+    channel changes is spread out without any caller being starved.
+    """
+
+    def __init__(self, rate: float, burst: int) -> None:
+        """Initialize a full bucket refilling at ``rate`` tokens per second."""
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._waiters: deque[asyncio.Future[None]] = deque()
+        self.throttled = 0
+        self.throttle_time = 0.0
+        self.max_queue_depth = 0
+
+    @property
+    def queue_depth(self) -> int:
+        """Return the number of callers waiting for a token."""
+        return len(self._waiters)
+
+    def configure(self, rate: float, burst: int) -> None:
+        """Change the rate (0 disables limiting) and burst size."""
+        self._refill()
+        self.rate = rate
+        self.burst = burst
+        self._tokens = min(self._tokens, float(burst))
+
+    def _refill(self) -> None:
+        """Add the tokens earned since the last refill."""
+        now = time.monotonic()
+        self._tokens = min(float(self.burst), self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        """Wait for a token, queuing behind earlier callers."""
+        if self.rate <= 0:
+            return
+        self._refill()
+        if not self._waiters and self._tokens >= 1:
+            self._tokens -= 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.max_queue_depth = max(self.max_queue_depth, len(self._waiters))
+        self.throttled += 1
+        started = time.monotonic()
+        try:
+            if self._waiters[0] is not waiter:
+                # Resolved by the caller ahead of us once it has its token
+                await waiter
+            while True:
+                self._refill()
+                if self._tokens >= 1 or self.rate <= 0:
+                    break
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+            self._tokens = max(0.0, self._tokens - 1)
+        finally:
+            self.throttle_time += time.monotonic() - started
+            was_head = self._waiters[0] is waiter
+            self._waiters.remove(waiter)
+            if was_head and self._waiters and not self._waiters[0].done():
+                self._waiters[0].set_result(None)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the limiter state for diagnostics."""
+        self._refill()
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            "tokens": round(self._tokens, 2),
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "throttled": self.throttled,
+            "throttle_time": round(self.throttle_time, 3),
+        }
+
+
+class MagewellLimiters:
+    """Rate limiters for every Magewell host, keyed by host."""
+
+    def __init__(self) -> None:
+        """Initialize with no limiters."""
+        self._limiters: dict[str, TokenBucket] = {}
+
+    def get(self, host: str) -> TokenBucket:
+        """Return the limiter for ``host``, creating it with the defaults."""
+        if (limiter := self._limiters.get(host)) is None:
+            limiter = self._limiters[host] = TokenBucket(DEFAULT_RATE_LIMIT, DEFAULT_RATE_BURST)
+        return limiter
+
+
+@singleton(DATA_LIMITERS)
+def _async_get_limiters(hass: HomeAssistant) -> MagewellLimiters:
+    """Return the domain-wide limiter registry."""
+    return MagewellLimiters()
+
+
+@callback
+def async_get_limiter(hass: HomeAssistant, host: str) -> TokenBucket:
+    """Return the limiter shared by every client talking to ``host``."""
+    return _async_get_limiters(hass).get(host)
@@ -0,0 +1,135 @@
+"""On-demand profiling of Magewell coordinator updates and entity state writes."""
+
+import asyncio
+import cProfile
+import pstats
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.singleton import singleton
+from homeassistant.util.hass_dict import HassKey
+
+from .const import DOMAIN
+
+DATA_PROFILER: HassKey["MagewellProfiler"] = HassKey(f"{DOMAIN}_profiler")
+
+# Functions listed in the summary returned by the profile service
+PROFILE_TOP_FUNCTIONS = 20
+
+
+class ProfileSession:
+    """A profile collected over a fixed number of coordinator updates.
+
+    The profiler is only enabled while a Magewell update or listener dispatch
+    is running, so the profile shows what the integration does on the event
+    loop. Anything else the loop runs while an update awaits the device is
+    included too, which is where loop lag caused by the integration shows up.
+    """
+
+    def __init__(self, updates: int) -> None:
+        """Initialize a session that stops after ``updates`` updates."""
+        self.profile = cProfile.Profile()
+        self.updates = 0
+        self._remaining = updates
+        self._depth = 0
+        self.finished = asyncio.get_running_loop().create_future()
+
+    @callback
+    def begin(self) -> None:
+        """Profile until the matching end()."""
+        if self.finished.done():
+            return
+        if not self._depth:
+            try:
+                self.profile.enable()
+            except ValueError:
+                # Another profiler took over the interpreter; end the session
+                self.stop()
+                return
+        self._depth += 1
+
+    @callback
+    def end(self, update: bool = False) -> None:
+        """Stop profiling a region, counting it as an update if ``update``."""
+        if self.finished.done():
+            return
+        self._depth -= 1
+        if not self._depth:
+            self.profile.disable()
+        if update:
+            self.updates += 1
+            self._remaining -= 1
+            if self._remaining <= 0:
+                self.stop()
+
+    @callback
+    def stop(self) -> None:
+        """Stop the session, even in the middle of a region."""
+        if self.finished.done():
+            return
+        if self._depth:
+            self.profile.disable()
+            self._depth = 0
+        self.finished.set_result(None)
+
+
+class MagewellProfiler:
+    """The profile session shared by every Magewell coordinator.
+
+    Coordinators only look at ``session``, so while no profile is being
+    taken the hot path pays for a single attribute check.
+    """
+
+    def __init__(self) -> None:
+        """Initialize with profiling off."""
+        self.session: ProfileSession | None = None
+
+    async def async_profile(self, hass: HomeAssistant, updates: int, timeout: float, path: str) -> dict[str, Any]:
+        """Profile the next ``updates`` updates and write the profile to ``path``.
+
+        Returns a summary of the functions with the most cumulative time. The
+        session ends early, with whatever it collected, after ``timeout``
+        seconds.
+        """
+        if self.session is not None:
+            raise RuntimeError("A profile is already being taken")
+        session = ProfileSession(updates)
+        # Fail now rather than on the first update if another profiler is active
+        session.profile.enable()
+        session.profile.disable()
+        self.session = session
+        try:
+            async with asyncio.timeout(timeout):
+                await asyncio.shield(session.finished)
+        except TimeoutError:
+            pass
+        finally:
+            session.stop()
+            self.session = None
+        top = await hass.async_add_executor_job(_write_profile, session.profile, path)
+        return {"path": path, "updates": session.updates, "top": top}
+
+
+def _write_profile(profile: cProfile.Profile, path: str) -> list[dict[str, Any]]:
+    """Write the profile to disk and return its most expensive functions."""
+    profile.dump_stats(path)
+    stats = pstats.Stats(profile)
+    top = []
+    # Rows are (primitive calls, calls, total time, cumulative time, callers)
+    rows = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)
+    for (filename, line, function), (_, calls, total_time, cumulative_time, _) in rows[:PROFILE_TOP_FUNCTIONS]:
+        top.append(
+            {
+                "function": f"{filename}:{line}({function})",
+                "calls": calls,
+                "total_time": round(total_time, 6),
+                "cumulative_time": round(cumulative_time, 6),
+            }
+        )
+    return top
+
+
+@singleton(DATA_PROFILER)
+def async_get_profiler(hass: HomeAssistant) -> MagewellProfiler:
+    """Return the domain-wide profiler."""
+    return MagewellProfiler()
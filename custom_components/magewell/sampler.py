@@ -0,0 +1,88 @@
+"""High-resolution CPU and temperature sampling for Magewell devices."""
+
+import logging
+from datetime import datetime, timedelta
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .api import MagewellApiError, MagewellClient
+from .const import SAMPLE_STATISTICS, SAMPLE_WINDOW
+from .stats import RingBuffer
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class MagewellSampler:
+    """Collect CPU and core temperature samples into per-device ring buffers.
+
+    Without a sample interval, every coordinator poll contributes a sample.
+    When one is configured, the sampler reads the summary on its own timer so
+    short spikes show up in the aggregates without a recorder row per sample;
+    polls then stop adding samples so the buffers hold exactly one window.
+    """
+
+    def __init__(self, sample_interval: int) -> None:
+        """Initialize buffers sized to hold one window of samples."""
+        capacity = max(1, int(SAMPLE_WINDOW.total_seconds()) // sample_interval)
+        self.sample_interval = sample_interval
+        self.buffers = {
+            "cpu-usage": RingBuffer(capacity),
+            "core-temp": RingBuffer(capacity),
+        }
+        self._sampling = False
+        self._running = False
+
+    def add(self, summary: dict) -> None:
+        """Record the CPU and temperature readings from a summary."""
+        device = summary.get("device", {})
+        for key, buffer in self.buffers.items():
+            value = device.get(key)
+            if isinstance(value, int | float):
+                buffer.append(value)
+
+    def add_poll(self, summary: dict) -> None:
+        """Record a poll's summary unless the sampler's own timer is running."""
+        if not self._running:
+            self.add(summary)
+
+    def statistic(self, key: str, statistic: str) -> float | None:
+        """Return an aggregate (min, max, mean or p95) over the window."""
+        buffer = self.buffers[key]
+        if statistic == "p95":
+            return buffer.percentile(95)
+        if statistic not in SAMPLE_STATISTICS:
+            raise ValueError(f"Unknown statistic {statistic}")
+        return getattr(buffer, statistic)()
+
+    @callback
+    def async_start(self, hass: HomeAssistant, client: MagewellClient) -> CALLBACK_TYPE:
+        """Start sampling between polls and return a function that stops it."""
+
+        async def _async_sample(now: datetime) -> None:
+            if self._sampling:
+                # The previous sample is still waiting on a slow device
+                return
+            self._sampling = True
+            try:
+                self.add(await client.get_summary_info())
+            except MagewellApiError as err:
+                _LOGGER.debug("Skipping sample: %s", err)
+            finally:
+                self._sampling = False
+
+        unsub = async_track_time_interval(
+            hass,
+            _async_sample,
+            timedelta(seconds=self.sample_interval),
+            name="Magewell sampler",
+            cancel_on_shutdown=True,
+        )
+        self._running = True
+
+        @callback
+        def _async_stop() -> None:
+            self._running = False
+            unsub()
+
+        return _async_stop
@@ -6,10 +6,11 @@ from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .api import MagewellApiError
+from .api import MagewellApiError, MagewellAuthError, MagewellDeviceError
 from .const import DOMAIN
 from .coordinator import MagewellCoordinator
-from .sensor import MagewellEntity, _get_ndi_source_name
+from .sensor import MagewellEntity
+from .services import async_resolve_source
 
 PARALLEL_UPDATES = 1
 
@@ -36,6 +37,18 @@ class MagewellNdiSourceSelect(MagewellEntity, SelectEntity):
         self._client = client
         self._attr_unique_id = f"{entry.entry_id}_ndi_source_select"
 
+    @property
+    def available(self) -> bool:
+        """Return True if the decoder answered, or a switch to it can be queued.
+
+        With command queuing enabled the picker stays usable after a failed
+        poll, showing the last known sources, so a change made while the
+        decoder is unreachable reaches the queue instead of being dropped.
+        """
+        if super().available:
+            return True
+        return self._entry.runtime_data.commands is not None and self.coordinator.data is not None
+
     @property
     def options(self) -> list[str]:
         """Return discovered NDI sources as dropdown options."""
@@ -48,21 +61,33 @@ class MagewellNdiSourceSelect(MagewellEntity, SelectEntity):
         """Return the currently active NDI source."""
         if self.coordinator.data is None:
             return None
-        summary = self.coordinator.data.get("summary", {})
-        current = _get_ndi_source_name(summary)
-        # Return current only if it's in the options list
-        if current in self.options:
-            return current
-        return current if self.options == [] else None
+        if self.coordinator.ndi_sources:
+            # Matched against the options once per poll by the coordinator
+            return self.coordinator.current_source
+        return self.coordinator.source_name
 
     async def async_select_option(self, option: str) -> None:
-        """Switch the decoder to the selected NDI source."""
+        """Switch the decoder to the selected NDI source.
+
+        If the decoder cannot be reached and command queuing is enabled, the
+        switch is queued and applied once the decoder is back.
+        """
+        # Refused here, without a round trip, if the decoder no longer sees it
+        option = await async_resolve_source(self._entry, option)
+        commands = self._entry.runtime_data.commands
         try:
             await self._client.set_channel(option)
         except MagewellApiError as err:
+            if commands is not None and not isinstance(err, (MagewellAuthError, MagewellDeviceError)):
+                # Unreachable rather than refused; keep the intent for later
+                commands.async_enqueue(option)
+                return
             raise HomeAssistantError(
                 translation_domain=DOMAIN,
                 translation_key="set_ndi_source_failed",
                 translation_placeholders={"source": option, "error": str(err)},
             ) from err
+        if commands is not None:
+            # A direct switch supersedes anything still queued
+            commands.async_cancel()
         await self.coordinator.async_request_refresh()
@@ -1,52 +1,58 @@
 """Sensor platform for Magewell Pro Convert."""
 
-import urllib.parse
-
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import PERCENTAGE, UnitOfTemperature
-from homeassistant.core import HomeAssistant
+from homeassistant.const import PERCENTAGE, UnitOfDataRate, UnitOfTemperature
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
+from .const import DOMAIN, SAMPLE_STATISTICS
 from .coordinator import MagewellCoordinator
+from .fleet import MagewellFleet, async_get_fleet
+from .video import VideoFormat
 
 PARALLEL_UPDATES = 0
 
-
-def _get_ndi_source_name(summary: dict) -> str:
-    """Extract friendly NDI source name from summary info."""
-    ndi = summary.get("ndi", {})
-    ndi_name = ndi.get("name", "unknown")
-    ndi_url = ndi.get("url", "")
-
-    if "name=" in ndi_url:
-        try:
-            raw = ndi_url.split("name=", 1)[1].split("&", 1)[0]
-            friendly = urllib.parse.unquote(raw)
-            if friendly:
-                return friendly
-        except (IndexError, ValueError):
-            pass
-
-    return ndi_name
+# Sampled summary key -> (translation key prefix, unique id prefix)
+_SAMPLED_METRICS = {
+    "cpu-usage": ("cpu_usage", "cpu_usage"),
+    "core-temp": ("core_temperature", "core_temp"),
+}
+
+# Video pipeline rate -> unit of measurement
+_VIDEO_RATES = {
+    "frame_rate": "fps",
+    "dropped_frame_rate": "fps",
+    "repeated_frame_rate": "fps",
+    "bitrate": UnitOfDataRate.KILOBITS_PER_SECOND,
+}
+
+# Fleet total (a FleetTotals attribute) -> unit of measurement
+_FLEET_TOTALS = {
+    "connected": None,
+    "errors": None,
+    "max_core_temperature": UnitOfTemperature.CELSIUS,
+    "mean_cpu_usage": PERCENTAGE,
+}
+
+FLEET_DEVICE_INFO = DeviceInfo(
+    identifiers={(DOMAIN, "fleet")},
+    name="Magewell fleet",
+    manufacturer="Magewell",
+    entry_type=DeviceEntryType.SERVICE,
+)
 
 
-def _get_resolution(summary: dict) -> str:
-    """Build resolution string from summary."""
-    ndi = summary.get("ndi", {})
-    w = ndi.get("video-width", 0)
-    h = ndi.get("video-height", 0)
-    rate = ndi.get("video-field-rate", 0)
-    if w and h:
-        return f"{w}x{h}@{rate}fps"
-    return ""
+def _format_label(video_format: VideoFormat | None) -> str:
+    """Return the display label of a tracked video format."""
+    return video_format.label if video_format else ""
 
 
 class MagewellEntity(CoordinatorEntity):
@@ -60,19 +66,18 @@ class MagewellEntity(CoordinatorEntity):
         self._entry = entry
 
     @property
-    def device_info(self):
+    def device_info(self) -> DeviceInfo:
         """Return device info to group entities."""
-        summary = self.coordinator.data.get("summary", {}) if self.coordinator.data else {}
-        device = summary.get("device", {})
-        return {
-            "identifiers": {(DOMAIN, self._entry.entry_id)},
-            "name": device.get("name", "Magewell Pro Convert"),
-            "manufacturer": "Magewell",
-            "model": device.get("product", "Pro Convert"),
-            "sw_version": device.get("firmware-version", ""),
-            "serial_number": device.get("serial-number", ""),
-            "configuration_url": f"http://{self._entry.data['host']}",
-        }
+        return self.coordinator.device_info
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the new state, timing the property getters if the watchdog is on."""
+        if (watchdog := self.coordinator.watchdog) is None:
+            super()._handle_coordinator_update()
+            return
+        with watchdog.watch(f"{self.entity_id} state write"):
+            super()._handle_coordinator_update()
 
 
 async def async_setup_entry(
@@ -88,9 +93,23 @@ async def async_setup_entry(
             MagewellNdiSourceSensor(coordinator, entry),
             MagewellCpuSensor(coordinator, entry),
             MagewellTemperatureSensor(coordinator, entry),
+            *(
+                MagewellSampleStatisticSensor(coordinator, entry, key, statistic)
+                for key in _SAMPLED_METRICS
+                for statistic in SAMPLE_STATISTICS
+            ),
+            *(MagewellVideoRateSensor(coordinator, entry, rate) for rate in _VIDEO_RATES),
         ]
     )
 
+    fleet = async_get_fleet(hass)
+    entry.async_on_unload(
+        fleet.async_offer_host(
+            entry.entry_id,
+            lambda: async_add_entities(MagewellFleetSensor(fleet, key) for key in _FLEET_TOTALS),
+        )
+    )
+
 
 class MagewellStatusSensor(MagewellEntity, SensorEntity):
     """Sensor showing overall device status."""
@@ -117,10 +136,12 @@ class MagewellStatusSensor(MagewellEntity, SensorEntity):
             return {}
         summary = self.coordinator.data.get("summary", {})
         device = summary.get("device", {})
+        # A boot timestamp instead of the raw uptime counter keeps the state
+        # (and its recorder row) unchanged between polls
         return {
             "device_name": device.get("name", ""),
             "firmware": device.get("firmware-version", ""),
-            "uptime": device.get("up-time", 0),
+            "boot_time": self.coordinator.boot_time,
         }
 
 
@@ -139,8 +160,7 @@ class MagewellNdiSourceSensor(MagewellEntity, SensorEntity):
         """Return the friendly NDI source name."""
         if self.coordinator.data is None:
             return None
-        summary = self.coordinator.data.get("summary", {})
-        return _get_ndi_source_name(summary)
+        return self.coordinator.source_name
 
     @property
     def extra_state_attributes(self) -> dict:
@@ -149,9 +169,13 @@ class MagewellNdiSourceSensor(MagewellEntity, SensorEntity):
             return {}
         summary = self.coordinator.data.get("summary", {})
         ndi = summary.get("ndi", {})
+        video_format = self.coordinator.video_format.current
         return {
             "connected": ndi.get("connected", False),
-            "video_resolution": _get_resolution(summary),
+            "video_resolution": _format_label(video_format),
+            "video_width": video_format.width if video_format else None,
+            "video_height": video_format.height if video_format else None,
+            "video_field_rate": video_format.rate if video_format else None,
             "ip_addr": ndi.get("ip-addr", ""),
         }
 
@@ -203,3 +227,113 @@ class MagewellTemperatureSensor(MagewellEntity, SensorEntity):
         summary = self.coordinator.data.get("summary", {})
         device = summary.get("device", {})
         return device.get("core-temp")
+
+
+class MagewellSampleStatisticSensor(MagewellEntity, SensorEntity):
+    """Sensor aggregating CPU or temperature samples over the sampling window."""
+
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_suggested_display_precision = 1
+
+    def __init__(self, coordinator: MagewellCoordinator, entry: ConfigEntry, key: str, statistic: str) -> None:
+        """Initialize."""
+        super().__init__(coordinator, entry)
+        self._key = key
+        self._statistic = statistic
+        translation_prefix, unique_id_prefix = _SAMPLED_METRICS[key]
+        self._attr_translation_key = f"{translation_prefix}_{statistic}"
+        self._attr_unique_id = f"{entry.entry_id}_{unique_id_prefix}_{statistic}"
+        if key == "core-temp":
+            self._attr_device_class = SensorDeviceClass.TEMPERATURE
+            self._attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
+        else:
+            self._attr_native_unit_of_measurement = PERCENTAGE
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the aggregate over the buffered samples."""
+        if self.coordinator.data is None:
+            return None
+        return self.coordinator.sampler.statistic(self._key, self._statistic)
+
+
+class MagewellVideoRateSensor(MagewellEntity, SensorEntity):
+    """Sensor showing a per-interval NDI video pipeline rate.
+
+    The counters behind the rates are unverified key names (see video.py);
+    the sensor is unavailable whenever the summary does not carry them.
+    """
+
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_suggested_display_precision = 1
+
+    def __init__(self, coordinator: MagewellCoordinator, entry: ConfigEntry, rate: str) -> None:
+        """Initialize."""
+        super().__init__(coordinator, entry)
+        self._rate = rate
+        self._attr_translation_key = f"video_{rate}"
+        self._attr_unique_id = f"{entry.entry_id}_video_{rate}"
+        self._attr_native_unit_of_measurement = _VIDEO_RATES[rate]
+        if rate == "bitrate":
+            self._attr_device_class = SensorDeviceClass.DATA_RATE
+
+    @property
+    def available(self) -> bool:
+        """Return False if the device does not report the underlying counter."""
+        return super().available and self.coordinator.video.reports(self._rate)
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the rate measured over the last poll interval."""
+        if self.coordinator.data is None:
+            return None
+        return getattr(self.coordinator.video, self._rate)
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Return the nominal frame rate alongside the measured one."""
+        if self._rate != "frame_rate":
+            return {}
+        return {"nominal_frame_rate": self.coordinator.video.nominal_frame_rate}
+
+
+class MagewellFleetSensor(SensorEntity):
+    """Sensor showing a total over every loaded decoder.
+
+    The totals are folded in as each decoder updates, so a state write costs
+    the same however many decoders there are.
+    """
+
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_device_info = FLEET_DEVICE_INFO
+
+    def __init__(self, fleet: MagewellFleet, key: str) -> None:
+        """Initialize."""
+        self._fleet = fleet
+        self._key = key
+        self._attr_translation_key = f"fleet_{key}"
+        self._attr_unique_id = f"fleet_{key}"
+        self._attr_native_unit_of_measurement = _FLEET_TOTALS[key]
+        if key == "max_core_temperature":
+            self._attr_device_class = SensorDeviceClass.TEMPERATURE
+        if key == "mean_cpu_usage":
+            self._attr_suggested_display_precision = 1
+
+    async def async_added_to_hass(self) -> None:
+        """Follow the fleet totals."""
+        self._attr_native_value = getattr(self._fleet.totals, self._key)
+        self.async_on_remove(self._fleet.async_subscribe(self._async_fleet_updated))
+
+    @callback
+    def _async_fleet_updated(self, entry_id: str) -> None:
+        """Write the state if this total changed."""
+        value = getattr(self._fleet.totals, self._key)
+        if value != self._attr_native_value:
+            self._attr_native_value = value
+            self.async_write_ha_state()
@@ -0,0 +1,170 @@
+"""Service actions for the Magewell Pro Convert integration."""
+
+import logging
+
+import homeassistant.helpers.config_validation as cv
+import voluptuous as vol
+from homeassistant.config_entries import ConfigEntry, ConfigEntryState
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse, callback
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.util import dt as dt_util
+from homeassistant.util import slugify
+
+from .api import MagewellApiError
+from .capture import CAPTURE_DIRECTORY, MagewellCapture
+from .const import DOMAIN
+from .profiler import async_get_profiler
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_PROFILE = "profile"
+SERVICE_CAPTURE = "capture"
+SERVICE_SCHEDULE_SOURCE = "schedule_source"
+
+ATTR_UPDATES = "updates"
+ATTR_TIMEOUT = "timeout"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_ENABLED = "enabled"
+ATTR_MAX_SIZE = "max_size"
+ATTR_SOURCE = "source"
+ATTR_AT = "at"
+ATTR_REFRESH = "refresh"
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_UPDATES, default=10): vol.All(vol.Coerce(int), vol.Range(min=1, max=1000)),
+        vol.Optional(ATTR_TIMEOUT, default=600): vol.All(vol.Coerce(int), vol.Range(min=1, max=3600)),
+    }
+)
+
+CAPTURE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Required(ATTR_ENABLED): cv.boolean,
+        vol.Optional(ATTR_MAX_SIZE, default=5): vol.All(vol.Coerce(int), vol.Range(min=1, max=100)),
+    }
+)
+
+SCHEDULE_SOURCE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Required(ATTR_SOURCE): cv.string,
+        vol.Required(ATTR_AT): cv.datetime,
+        vol.Optional(ATTR_REFRESH, default=False): cv.boolean,
+    }
+)
+
+
+@callback
+def _async_get_loaded_entry(hass: HomeAssistant, entry_id: str) -> ConfigEntry:
+    """Return a loaded Magewell config entry or raise."""
+    entry = hass.config_entries.async_get_entry(entry_id)
+    if entry is None or entry.domain != DOMAIN or entry.state is not ConfigEntryState.LOADED:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="entry_not_loaded",
+            translation_placeholders={"entry_id": entry_id},
+        )
+    return entry
+
+
+async def async_resolve_source(entry: ConfigEntry, name: str, refresh: bool = False) -> str:
+    """Return the discovered source ``name`` refers to, or raise if the decoder does not see it."""
+    try:
+        source = await entry.runtime_data.coordinator.async_resolve_source(name, refresh)
+    except MagewellApiError as err:
+        raise HomeAssistantError(
+            translation_domain=DOMAIN,
+            translation_key="set_ndi_source_failed",
+            translation_placeholders={"source": name, "error": str(err)},
+        ) from err
+    if source is None:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="unknown_source",
+            translation_placeholders={"source": name, "device": entry.title},
+        )
+    return source
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the Magewell service actions."""
+
+    async def _async_profile(call: ServiceCall) -> ServiceResponse:
+        """Profile the next coordinator updates of every device."""
+        if not hass.config_entries.async_loaded_entries(DOMAIN):
+            raise ServiceValidationError(translation_domain=DOMAIN, translation_key="no_devices")
+        profiler = async_get_profiler(hass)
+        if profiler.session is not None:
+            raise ServiceValidationError(translation_domain=DOMAIN, translation_key="profile_running")
+
+        path = hass.config.path(f"magewell_profile_{dt_util.utcnow().strftime('%Y%m%d%H%M%S')}.prof")
+        try:
+            result = await profiler.async_profile(hass, call.data[ATTR_UPDATES], call.data[ATTR_TIMEOUT], path)
+        except ValueError as err:
+            # cProfile refuses to start while another profiler is active
+            raise HomeAssistantError(
+                translation_domain=DOMAIN,
+                translation_key="profile_failed",
+                translation_placeholders={"error": str(err)},
+            ) from err
+        _LOGGER.info("Wrote profile of %d Magewell updates to %s", result["updates"], path)
+        return result
+
+    async def _async_capture(call: ServiceCall) -> ServiceResponse:
+        """Start or stop capturing a device's traffic without reloading it."""
+        entry = _async_get_loaded_entry(hass, call.data[ATTR_CONFIG_ENTRY_ID])
+        runtime_data = entry.runtime_data
+        path = hass.config.path(CAPTURE_DIRECTORY, f"{slugify(entry.data[CONF_HOST])}.jsonl")
+        lines = 0
+        if (capture := runtime_data.capture) is not None:
+            runtime_data.capture = None
+            await capture.async_stop()
+            lines = capture.lines
+            _LOGGER.info("Stopped capturing %s after %d requests", entry.title, lines)
+        if call.data[ATTR_ENABLED]:
+            capture = runtime_data.capture = MagewellCapture(hass, path, call.data[ATTR_MAX_SIZE] * 1024 * 1024)
+            capture.async_start(runtime_data.client)
+            _LOGGER.info("Capturing the traffic of %s to %s", entry.title, path)
+        # Lines written by the capture that was running before this call, if any
+        return {"path": path, "enabled": call.data[ATTR_ENABLED], "lines": lines}
+
+    async def _async_schedule_source(call: ServiceCall) -> ServiceResponse:
+        """Switch a device's source at an exact time."""
+        entry = _async_get_loaded_entry(hass, call.data[ATTR_CONFIG_ENTRY_ID])
+        target = dt_util.as_utc(call.data[ATTR_AT])
+        if target <= dt_util.utcnow():
+            raise ServiceValidationError(
+                translation_domain=DOMAIN,
+                translation_key="cue_in_past",
+                translation_placeholders={"at": target.isoformat()},
+            )
+        source = await async_resolve_source(entry, call.data[ATTR_SOURCE], call.data[ATTR_REFRESH])
+        cues = entry.runtime_data.cues
+        cues.async_schedule(source, target)
+        # The lead is measured again when the connection is warmed up
+        return {"target": target.isoformat(), "source": source, "lead": round(cues.lead, 3)}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_CAPTURE,
+        _async_capture,
+        schema=CAPTURE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE,
+        _async_profile,
+        schema=PROFILE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SCHEDULE_SOURCE,
+        _async_schedule_source,
+        schema=SCHEDULE_SOURCE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
@@ -0,0 +1,106 @@
+"""Indexed set of NDI sources discovered by a Magewell decoder."""
+
+import urllib.parse
+
+
+def _sort_key(name: str) -> tuple[str, str]:
+    """Order sources case-insensitively, falling back to the exact name."""
+    return name.casefold(), name
+
+
+def _get_ndi_source_name(summary: dict) -> str:
+    """Extract friendly NDI source name from summary info."""
+    ndi = summary.get("ndi", {})
+    ndi_name = ndi.get("name", "unknown")
+    ndi_url = ndi.get("url", "")
+
+    if "name=" in ndi_url:
+        try:
+            raw = ndi_url.split("name=", 1)[1].split("&", 1)[0]
+            friendly = urllib.parse.unquote(raw)
+            if friendly:
+                return friendly
+        except (IndexError, ValueError):
+            pass
+
+    return ndi_name
+
+
+def _stream_name(name: str) -> str:
+    """Return the stream part of a full NDI name, e.g. ``Camera 1`` of ``STUDIO (Camera 1)``."""
+    if name.endswith(")") and (start := name.find(" (")) != -1:
+        return name[start + 2 : -1]
+    return name
+
+
+class NdiSourceIndex:
+    """Stably ordered NDI source set with O(1) membership checks.
+
+    The device may return sources in any order. The index keeps them sorted
+    and hands out the same list object until the membership actually changes,
+    so entities only see a new options list when a source comes or goes.
+    Both directions between full and stream names are indexed when the
+    membership changes: a source can be looked up by its stream name, the
+    friendly name a decoder reports in its NDI URL, as long as only one
+    machine offers it, and every source's stream name is known.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        self._members: frozenset[str] = frozenset()
+        self._names: list[str] = []
+        self._by_stream: dict[str, str | None] = {}
+        self._streams: dict[str, str] = {}
+
+    def __contains__(self, name: object) -> bool:
+        """Return True if the source is currently discovered."""
+        return name in self._members
+
+    def __len__(self) -> int:
+        """Return the number of discovered sources."""
+        return len(self._members)
+
+    @property
+    def names(self) -> list[str]:
+        """Return the sources in stable order."""
+        return self._names
+
+    def update(self, sources: list[str]) -> tuple[list[str], list[str]]:
+        """Replace the membership and return the (added, removed) sources."""
+        members = frozenset(sources)
+        if members == self._members:
+            return [], []
+        added = sorted(members - self._members, key=_sort_key)
+        removed = sorted(self._members - members, key=_sort_key)
+        self._members = members
+        self._names = sorted(members, key=_sort_key)
+        self._streams = {source: _stream_name(source) for source in self._names}
+        by_stream: dict[str, str | None] = {}
+        for source, stream in self._streams.items():
+            # A stream name offered by several machines does not identify a source
+            by_stream[stream] = None if stream in by_stream else source
+        self._by_stream = by_stream
+        return added, removed
+
+    def stream_name(self, source: str) -> str:
+        """Return the stream name of a source, discovered or not."""
+        return self._streams.get(source) or _stream_name(source)
+
+    def resolve(self, name: str) -> str | None:
+        """Return the discovered source a full or stream name refers to, if any."""
+        if name in self._members:
+            return name
+        return self._by_stream.get(name)
+
+    def match(self, ndi_name: str | None, friendly_name: str | None) -> str | None:
+        """Return the discovered source a decoder reports it is showing, if any.
+
+        Decoders report the full NDI name of the connected source and a
+        friendly name in its URL, and either may differ from the discovered
+        names, so the full name, the friendly name and the stream part of
+        the full name are tried in turn.
+        """
+        for name in (ndi_name, friendly_name, ndi_name and _stream_name(ndi_name)):
+            if name and (source := self.resolve(name)) is not None:
+                return source
+        return None
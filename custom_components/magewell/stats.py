@@ -0,0 +1,117 @@
+"""Small, allocation-free statistics helpers."""
+
+import math
+from array import array
+
+
+class RingBuffer:
+    """Fixed-size ring buffer of floats backed by a preallocated array."""
+
+    def __init__(self, capacity: int) -> None:
+        """Initialize an empty buffer holding at most ``capacity`` samples."""
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self._data = array("d", bytes(8 * capacity))
+        self._capacity = capacity
+        self._next = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        """Return the number of samples held."""
+        return self._count
+
+    @property
+    def capacity(self) -> int:
+        """Return the maximum number of samples held."""
+        return self._capacity
+
+    def append(self, value: float) -> None:
+        """Add a sample, overwriting the oldest one when full."""
+        self._data[self._next] = value
+        self._next = (self._next + 1) % self._capacity
+        if self._count < self._capacity:
+            self._count += 1
+
+    def values(self) -> list[float]:
+        """Return the samples, oldest first."""
+        if self._count < self._capacity:
+            return self._data[: self._count].tolist()
+        return self._data[self._next :].tolist() + self._data[: self._next].tolist()
+
+    def latest(self) -> float | None:
+        """Return the most recent sample."""
+        if not self._count:
+            return None
+        return self._data[self._next - 1]
+
+    def min(self) -> float | None:
+        """Return the smallest sample."""
+        return min(self._data[: self._count]) if self._count else None
+
+    def max(self) -> float | None:
+        """Return the largest sample."""
+        return max(self._data[: self._count]) if self._count else None
+
+    def mean(self) -> float | None:
+        """Return the arithmetic mean of the samples."""
+        return math.fsum(self._data[: self._count]) / self._count if self._count else None
+
+    def percentile(self, pct: float) -> float | None:
+        """Return the nearest-rank percentile (0-100) of the samples."""
+        if not self._count:
+            return None
+        ordered = sorted(self._data[: self._count])
+        rank = max(1, math.ceil(pct / 100 * self._count))
+        return ordered[rank - 1]
+
+
+class CounterRate:
+    """Per-second rate of a cumulative counter, tolerant of counter resets."""
+
+    def __init__(self) -> None:
+        """Initialize with no previous reading."""
+        self._value: float | None = None
+        self._time: float | None = None
+        self.rate: float | None = None
+
+    def update(self, value: float | None, now: float) -> float | None:
+        """Record a reading taken at monotonic time ``now`` and return the rate."""
+        if value is None:
+            self._value = self._time = self.rate = None
+            return None
+        if self._value is not None and self._time is not None and now > self._time:
+            delta = value - self._value
+            if delta < 0:
+                # The counter restarted (device reboot or stream reconnect);
+                # everything counted since the restart happened this interval
+                delta = value
+            self.rate = delta / (now - self._time)
+        self._value = value
+        self._time = now
+        return self.rate
+
+
+class TokenBudget:
+    """Allowance for extra work that is earned by successful work.
+
+    Every deposit adds ``ratio`` of a token up to ``capacity``; spending
+    takes a whole token. Extra work is therefore limited to ``ratio`` of
+    recent work plus a small burst, and stops entirely when nothing succeeds.
+    """
+
+    def __init__(self, ratio: float, capacity: float, initial: float = 0.0) -> None:
+        """Initialize with ``initial`` tokens."""
+        self.ratio = ratio
+        self.capacity = capacity
+        self.balance = min(initial, capacity)
+
+    def deposit(self) -> None:
+        """Earn a fraction of a token."""
+        self.balance = min(self.capacity, self.balance + self.ratio)
+
+    def try_spend(self) -> bool:
+        """Take a token if one is available."""
+        if self.balance < 1:
+            return False
+        self.balance -= 1
+        return True
@@ -0,0 +1,104 @@
+"""Persistent storage of device sessions and queued commands across restarts."""
+
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.singleton import singleton
+from homeassistant.helpers.storage import Store
+from homeassistant.util.hass_dict import HassKey
+
+from .const import DOMAIN
+
+STORAGE_KEY = f"{DOMAIN}.sessions"
+STORAGE_VERSION = 1
+SAVE_DELAY = 10
+
+COMMANDS_STORAGE_KEY = f"{DOMAIN}.commands"
+COMMANDS_STORAGE_VERSION = 1
+
+DATA_SESSIONS: HassKey["MagewellSessionStore"] = HassKey(f"{DOMAIN}_sessions")
+DATA_COMMANDS: HassKey["MagewellCommandStore"] = HassKey(f"{DOMAIN}_commands")
+
+
+class MagewellSessionStore:
+    """Session cookies per config entry, kept in private HA storage.
+
+    Reusing a stored cookie on startup means a restart does not make every
+    decoder log in at once and run out of device sessions.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the store."""
+        self._store: Store[dict[str, dict[str, str]]] = Store(hass, STORAGE_VERSION, STORAGE_KEY, private=True)
+        self._sessions: dict[str, dict[str, str]] = {}
+
+    async def async_load(self) -> None:
+        """Load stored sessions from disk."""
+        self._sessions = await self._store.async_load() or {}
+
+    def get(self, entry_id: str) -> dict[str, str] | None:
+        """Return the stored cookies for an entry."""
+        return self._sessions.get(entry_id)
+
+    @callback
+    def async_set(self, entry_id: str, cookies: dict[str, str]) -> None:
+        """Store new cookies for an entry."""
+        if self._sessions.get(entry_id) == cookies:
+            return
+        self._sessions[entry_id] = cookies
+        self._store.async_delay_save(lambda: self._sessions, SAVE_DELAY)
+
+    @callback
+    def async_remove(self, entry_id: str) -> None:
+        """Forget the cookies of a removed entry."""
+        if self._sessions.pop(entry_id, None) is not None:
+            self._store.async_delay_save(lambda: self._sessions, SAVE_DELAY)
+
+
+@singleton(DATA_SESSIONS, async_=True)
+async def async_get_session_store(hass: HomeAssistant) -> MagewellSessionStore:
+    """Return the loaded domain-wide session store."""
+    store = MagewellSessionStore(hass)
+    await store.async_load()
+    return store
+
+
+class MagewellCommandStore:
+    """The pending channel change of each config entry, kept across restarts.
+
+    Unlike the session cookies, a command is saved right away: it records an
+    operator's intent that must survive a restart that follows shortly after.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the store."""
+        self._store: Store[dict[str, dict[str, Any]]] = Store(hass, COMMANDS_STORAGE_VERSION, COMMANDS_STORAGE_KEY)
+        self._commands: dict[str, dict[str, Any]] = {}
+
+    async def async_load(self) -> None:
+        """Load stored commands from disk."""
+        self._commands = await self._store.async_load() or {}
+
+    def get(self, entry_id: str) -> dict[str, Any] | None:
+        """Return the pending command of an entry."""
+        return self._commands.get(entry_id)
+
+    @callback
+    def async_set(self, entry_id: str, command: dict[str, Any]) -> None:
+        """Store the pending command of an entry, replacing any older one."""
+        self._commands[entry_id] = command
+        self._store.async_delay_save(lambda: self._commands)
+
+    @callback
+    def async_remove(self, entry_id: str) -> None:
+        """Forget the pending command of an entry."""
+        if self._commands.pop(entry_id, None) is not None:
+            self._store.async_delay_save(lambda: self._commands)
+
+
+@singleton(DATA_COMMANDS, async_=True)
+async def async_get_command_store(hass: HomeAssistant) -> MagewellCommandStore:
+    """Return the loaded domain-wide command store."""
+    store = MagewellCommandStore(hass)
+    await store.async_load()
+    return store
@@ -0,0 +1,160 @@
+"""Lightweight per-poll tracing of where a coordinator update spends its time."""
+
+import time
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+
+# Trace of the update running in the current task; the client adds its spans
+# to it without the coordinator having to pass it down
+_CURRENT_TRACE: ContextVar["PollTrace | None"] = ContextVar("magewell_poll_trace", default=None)
+
+
+@dataclass(slots=True)
+class Span:
+    """One timed stage of an update, in monotonic seconds."""
+
+    name: str
+    start: float
+    end: float
+
+
+class PollTrace:
+    """The stages of a single coordinator update."""
+
+    def __init__(self) -> None:
+        """Start a trace now."""
+        self.started_at: datetime = dt_util.utcnow()
+        self.start = time.monotonic()
+        self.end = self.start
+        self.spans: list[Span] = []
+        self.error: str | None = None
+        self.closed = False
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as a span of this trace, unless it has been closed by then."""
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            if not self.closed:
+                end = time.monotonic()
+                self.spans.append(Span(name, start, end))
+                self.end = max(self.end, end)
+
+    def finish(self, error: BaseException | None = None) -> None:
+        """Mark the update as done, recording the error it failed with."""
+        self.end = max(self.end, time.monotonic())
+        if error is not None:
+            self.error = type(error).__name__
+
+    def close(self) -> None:
+        """Stop accepting spans.
+
+        Tasks started during the update inherit it as their current trace;
+        whatever they time after the update is over is not part of it.
+        """
+        self.closed = True
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the trace with offsets and durations in milliseconds."""
+        return {
+            "started_at": self.started_at.isoformat(),
+            "duration": _ms(self.end - self.start),
+            "error": self.error,
+            "spans": [
+                {"name": span.name, "start": _ms(span.start - self.start), "duration": _ms(span.end - span.start)}
+                for span in sorted(self.spans, key=lambda span: span.start)
+            ],
+        }
+
+
+def _ms(seconds: float) -> float:
+    """Return seconds as milliseconds rounded to a microsecond."""
+    return round(seconds * 1000, 3)
+
+
+@contextmanager
+def trace_span(name: str) -> Iterator[None]:
+    """Time the enclosed block as a span of the running update, if any."""
+    if (trace := _CURRENT_TRACE.get()) is None or trace.closed:
+        yield
+        return
+    with trace.span(name):
+        yield
+
+
+class PollTracer:
+    """The most recent update traces of one coordinator."""
+
+    def __init__(self, history: int) -> None:
+        """Initialize an empty tracer keeping ``history`` traces."""
+        self._traces: deque[PollTrace] = deque(maxlen=history)
+
+    def __len__(self) -> int:
+        """Return the number of traces held."""
+        return len(self._traces)
+
+    @contextmanager
+    def trace(self, *, close: bool = True) -> Iterator[PollTrace]:
+        """Record the enclosed update as a new trace.
+
+        With ``close`` false the trace keeps accepting spans after the block,
+        until the caller closes it.
+        """
+        trace = PollTrace()
+        token = _CURRENT_TRACE.set(trace)
+        try:
+            yield trace
+        except BaseException as err:
+            trace.finish(err)
+            raise
+        else:
+            trace.finish()
+        finally:
+            if close:
+                trace.close()
+            _CURRENT_TRACE.reset(token)
+            self._traces.append(trace)
+
+    def as_list(self) -> list[dict[str, Any]]:
+        """Return the traces, oldest first."""
+        return [trace.as_dict() for trace in self._traces]
+
+    def as_trace_events(self, name: str) -> dict[str, Any]:
+        """Return the traces in the Trace Event format read by Perfetto and chrome://tracing."""
+        events: list[dict[str, Any]] = [
+            {"name": "process_name", "ph": "M", "pid": 1, "tid": 1, "args": {"name": name}},
+        ]
+        for trace in self._traces:
+            # Wall-clock microseconds, so traces of several devices line up
+            origin = trace.started_at.timestamp() * 1_000_000
+            events.append(
+                {
+                    "name": "update" if trace.error is None else f"update ({trace.error})",
+                    "ph": "X",
+                    "pid": 1,
+                    "tid": 1,
+                    "ts": round(origin),
+                    "dur": round((trace.end - trace.start) * 1_000_000),
+                }
+            )
+            events.extend(
+                {
+                    "name": span.name,
+                    "ph": "X",
+                    "pid": 1,
+                    "tid": 1,
+                    "ts": round(origin + (span.start - trace.start) * 1_000_000),
+                    "dur": round((span.end - span.start) * 1_000_000),
+                }
+                for span in trace.spans
+            )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
@@ -0,0 +1,144 @@
+"""NDI video format and pipeline health derived from the device summary."""
+
+from dataclasses import dataclass, field
+
+from .stats import CounterRate
+
+# Cumulative counters looked for in the summary's ndi section, next to the
+# video-width/video-height/video-field-rate fields. These key names are
+# unverified: they have not been seen in a response from a real decoder, and
+# the documented summary does not include them. Firmware that does not report
+# a counter leaves its rate sensor unavailable rather than unknown.
+COUNTER_FRAMES = "video-frames"
+COUNTER_DROPPED_FRAMES = "video-frames-dropped"
+COUNTER_REPEATED_FRAMES = "video-frames-repeated"
+COUNTER_BYTES = "total-bytes"
+
+# Counter behind each rate exposed by VideoPipelineTracker
+RATE_COUNTERS = {
+    "frame_rate": COUNTER_FRAMES,
+    "dropped_frame_rate": COUNTER_DROPPED_FRAMES,
+    "repeated_frame_rate": COUNTER_REPEATED_FRAMES,
+    "bitrate": COUNTER_BYTES,
+}
+
+
+@dataclass(frozen=True)
+class VideoFormat:
+    """Resolution and field rate of the decoded NDI video."""
+
+    width: int
+    height: int
+    rate: float
+    label: str = field(init=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """Build the display label once."""
+        object.__setattr__(self, "label", f"{self.width}x{self.height}@{self.rate}fps")
+
+    @classmethod
+    def from_summary(cls, summary: dict) -> "VideoFormat | None":
+        """Return the format in a summary, or None when there is no video."""
+        ndi = summary.get("ndi", {})
+        width = ndi.get("video-width", 0)
+        height = ndi.get("video-height", 0)
+        if not (width and height):
+            return None
+        return cls(width, height, ndi.get("video-field-rate", 0))
+
+    def as_dict(self) -> dict:
+        """Return the typed values for events and attributes."""
+        return {"width": self.width, "height": self.height, "rate": self.rate}
+
+
+class VideoFormatTracker:
+    """Debounce format changes so a flap during a source switch is ignored.
+
+    A new format only replaces the current one after it has been observed
+    for at least the settle time. ``pending`` tells the caller a candidate
+    is waiting, so it can look again once the settle time has passed.
+    """
+
+    def __init__(self, settle_time: float) -> None:
+        """Initialize with no confirmed format."""
+        self.settle_time = settle_time
+        self.current: VideoFormat | None = None
+        self._seeded = False
+        self.pending = False
+        self._candidate: VideoFormat | None = None
+        self._candidate_since = 0.0
+
+    def update(self, video_format: VideoFormat | None, now: float) -> bool:
+        """Observe a format at monotonic time ``now``; return True when it changes."""
+        if not self._seeded:
+            self._seeded = True
+            self.current = video_format
+            return False
+        if video_format == self.current:
+            self.pending = False
+            return False
+        if not self.pending or self._candidate != video_format or self._candidate_since > now:
+            # Losing the video (None) is a candidate like any other format
+            self.pending = True
+            self._candidate = video_format
+            self._candidate_since = now
+        if now - self._candidate_since < self.settle_time:
+            return False
+        self.current = video_format
+        self.pending = False
+        return True
+
+
+class VideoPipelineTracker:
+    """Turn cumulative NDI counters into per-interval rates.
+
+    Rates are computed from the delta between consecutive snapshots, so they
+    describe what happened since the previous poll rather than since boot.
+    """
+
+    def __init__(self) -> None:
+        """Initialize one rate per tracked counter."""
+        self._rates = {
+            COUNTER_FRAMES: CounterRate(),
+            COUNTER_DROPPED_FRAMES: CounterRate(),
+            COUNTER_REPEATED_FRAMES: CounterRate(),
+            COUNTER_BYTES: CounterRate(),
+        }
+        self.nominal_frame_rate: float | None = None
+        self._reported: set[str] = set()
+
+    def update(self, summary: dict, now: float) -> None:
+        """Update all rates from a summary taken at monotonic time ``now``."""
+        ndi = summary.get("ndi", {})
+        self._reported.clear()
+        for key, rate in self._rates.items():
+            value = ndi.get(key)
+            if isinstance(value, int | float):
+                self._reported.add(key)
+            rate.update(value if isinstance(value, int | float) else None, now)
+        self.nominal_frame_rate = ndi.get("video-field-rate") or None
+
+    def reports(self, rate: str) -> bool:
+        """Return True if the last summary carried the counter behind a rate."""
+        return RATE_COUNTERS[rate] in self._reported
+
+    @property
+    def frame_rate(self) -> float | None:
+        """Return the frames actually received per second."""
+        return self._rates[COUNTER_FRAMES].rate
+
+    @property
+    def dropped_frame_rate(self) -> float | None:
+        """Return dropped frames per second."""
+        return self._rates[COUNTER_DROPPED_FRAMES].rate
+
+    @property
+    def repeated_frame_rate(self) -> float | None:
+        """Return repeated frames per second."""
+        return self._rates[COUNTER_REPEATED_FRAMES].rate
+
+    @property
+    def bitrate(self) -> float | None:
+        """Return the received bitrate in kbit/s."""
+        rate = self._rates[COUNTER_BYTES].rate
+        return None if rate is None else rate * 8 / 1000
@@ -0,0 +1,140 @@
+"""Opt-in detection of Magewell callbacks that block the event loop."""
+
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import partial
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HassJob, HomeAssistant, callback
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class _Watch:
+    """A callback being timed; the sampler thread attaches a stack to it."""
+
+    __slots__ = ("name", "sample", "start")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.start = time.monotonic()
+        self.sample: str | None = None
+
+
+@dataclass(slots=True)
+class CallbackStats:
+    """How often a callback ran and how often it was slow."""
+
+    calls: int = 0
+    slow: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+
+
+class MagewellWatchdog:
+    """Time Magewell callbacks on the event loop and flag slow ones.
+
+    A callback only knows it was slow once it has returned, when its stack is
+    gone. A sampler thread therefore looks at the callback running on the loop
+    every half threshold and, once it has run past the threshold, records the
+    loop thread's stack while the callback is still blocking it.
+    """
+
+    def __init__(self, name: str, threshold: float) -> None:
+        """Initialize a stopped watchdog flagging callbacks over ``threshold`` seconds."""
+        self.name = name
+        self.threshold = threshold
+        self.callbacks: dict[str, CallbackStats] = {}
+        self._current: _Watch | None = None
+        self._loop_thread_id: int | None = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @callback
+    def async_start(self, hass: HomeAssistant) -> CALLBACK_TYPE:
+        """Start the sampler thread and return a function that stops it."""
+        self._loop_thread_id = threading.get_ident()
+        self._thread = threading.Thread(target=self._sample_loop, name=f"magewell_watchdog_{self.name}", daemon=True)
+        self._thread.start()
+        remove_shutdown_job = hass.async_add_shutdown_job(HassJob(partial(self._async_stop, hass)))
+
+        @callback
+        def _async_stop_and_forget() -> None:
+            remove_shutdown_job()
+            self._async_stop(hass)
+
+        return _async_stop_and_forget
+
+    @callback
+    def _async_stop(self, hass: HomeAssistant) -> None:
+        """Stop the sampler thread.
+
+        It exits at its next wake-up, at most half a threshold later; it is
+        joined in the executor so the event loop never waits for it.
+        """
+        self._stop.set()
+        if (thread := self._thread) is not None:
+            self._thread = None
+            hass.async_add_executor_job(thread.join)
+
+    def _sample_loop(self) -> None:
+        """Record the loop's stack for a callback that runs past the threshold."""
+        while not self._stop.wait(self.threshold / 2):
+            watch = self._current
+            if watch is None or watch.sample is not None or time.monotonic() - watch.start < self.threshold:
+                continue
+            if (frame := sys._current_frames().get(self._loop_thread_id)) is not None:
+                watch.sample = "".join(traceback.format_stack(frame))
+
+    @contextmanager
+    def watch(self, name: str) -> Iterator[None]:
+        """Time the enclosed callback, flagging it if it exceeds the threshold."""
+        watch = _Watch(name)
+        outer, self._current = self._current, watch
+        try:
+            yield
+        finally:
+            self._current = outer
+            self._record(watch, time.monotonic() - watch.start)
+
+    def _record(self, watch: _Watch, elapsed: float) -> None:
+        """Count a finished callback and report it if it was slow."""
+        if (stats := self.callbacks.get(watch.name)) is None:
+            stats = self.callbacks[watch.name] = CallbackStats()
+        stats.calls += 1
+        stats.total_time += elapsed
+        stats.max_time = max(stats.max_time, elapsed)
+        if elapsed < self.threshold:
+            return
+        stats.slow += 1
+        # Warn once per callback; later occurrences are counted in diagnostics
+        log = _LOGGER.warning if stats.slow == 1 else _LOGGER.debug
+        log(
+            "%s on %s blocked the event loop for %.1f ms (threshold %.1f ms)%s",
+            watch.name,
+            self.name,
+            elapsed * 1000,
+            self.threshold * 1000,
+            f"; stack while blocking:\n{watch.sample}" if watch.sample else "",
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the per-callback counts for diagnostics."""
+        return {
+            "threshold": self.threshold,
+            "callbacks": {
+                name: {
+                    "calls": stats.calls,
+                    "slow": stats.slow,
+                    "mean_time": round(stats.total_time / stats.calls, 6),
+                    "max_time": round(stats.max_time, 6),
+                }
+                for name, stats in self.callbacks.items()
+            },
+        }
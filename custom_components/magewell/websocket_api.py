@@ -0,0 +1,62 @@
+"""Websocket commands for the Magewell integration."""
+
+from typing import Any
+
+import voluptuous as vol
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+
+from .fleet import FLEET_SCHEMA_VERSION, async_get_fleet
+
+
+@callback
+def async_setup_websocket_api(hass: HomeAssistant) -> None:
+    """Register the Magewell websocket commands."""
+    websocket_api.async_register_command(hass, ws_fleet)
+    websocket_api.async_register_command(hass, ws_subscribe_fleet)
+
+
+@websocket_api.websocket_command({vol.Required("type"): "magewell/fleet"})
+@callback
+def ws_fleet(hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]) -> None:
+    """Return a snapshot of every loaded decoder."""
+    connection.send_result(
+        msg["id"],
+        {"version": FLEET_SCHEMA_VERSION, "decoders": async_get_fleet(hass).snapshots()},
+    )
+
+
+@websocket_api.websocket_command({vol.Required("type"): "magewell/fleet/subscribe"})
+@callback
+def ws_subscribe_fleet(hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]) -> None:
+    """Send a snapshot of every decoder, then only the fields that change.
+
+    Each event is one of ``snapshot`` (sent once, with every decoder),
+    ``delta`` (the changed fields of one decoder, or all of them for a
+    decoder that was just loaded) and ``removed`` (a decoder was unloaded).
+    """
+    fleet = async_get_fleet(hass)
+    sent = fleet.snapshots()
+
+    @callback
+    def _async_decoder_changed(entry_id: str) -> None:
+        snapshot = fleet.snapshot(entry_id)
+        if snapshot is None:
+            if sent.pop(entry_id, None) is not None:
+                connection.send_message(
+                    websocket_api.event_message(msg["id"], {"type": "removed", "entry_id": entry_id})
+                )
+            return
+        previous = sent.get(entry_id, {})
+        if not (changes := {key: value for key, value in snapshot.items() if previous.get(key, ...) != value}):
+            return
+        sent[entry_id] = snapshot
+        connection.send_message(
+            websocket_api.event_message(msg["id"], {"type": "delta", "entry_id": entry_id, "changes": changes})
+        )
+
+    connection.subscriptions[msg["id"]] = fleet.async_subscribe(_async_decoder_changed)
+    connection.send_result(msg["id"])
+    connection.send_message(
+        websocket_api.event_message(msg["id"], {"type": "snapshot", "version": FLEET_SCHEMA_VERSION, "decoders": sent})
+    )
@@ -8,7 +8,9 @@ from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME
 from homeassistant.core import HomeAssistant
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
-from custom_components.magewell.const import CONF_SCAN_INTERVAL, DOMAIN
+from custom_components.magewell.api import MagewellClientStats
+from custom_components.magewell.const import CONF_SCAN_INTERVAL, DEFAULT_RATE_BURST, DEFAULT_RATE_LIMIT, DOMAIN
+from custom_components.magewell.limiter import TokenBucket
 
 
 @pytest.fixture(autouse=True)
@@ -90,6 +92,8 @@ def mock_magewell_client() -> Generator[AsyncMock]:
         client.get_ndi_sources = AsyncMock(return_value=MOCK_NDI_SOURCES)
         client.close = AsyncMock(return_value=None)
         client.set_channel = AsyncMock(return_value={"status": 0})
+        client.stats = MagewellClientStats()
+        client.limiter = TokenBucket(DEFAULT_RATE_LIMIT, DEFAULT_RATE_BURST)
         yield client
 
 
@@ -107,6 +111,8 @@ def mock_magewell_client_init() -> Generator[AsyncMock]:
         client.get_ndi_sources = AsyncMock(return_value=MOCK_NDI_SOURCES)
         client.close = AsyncMock(return_value=None)
         client.set_channel = AsyncMock(return_value={"status": 0})
+        client.stats = MagewellClientStats()
+        client.limiter = TokenBucket(DEFAULT_RATE_LIMIT, DEFAULT_RATE_BURST)
         yield client
 
 
@@ -0,0 +1,140 @@
+"""Replay of captured device traffic through the client and coordinator.
+
+Captures written by the ``magewell.capture`` action (see capture.py) are
+served back by a stand-in for the client's HTTP session, so decoder data
+drives ``MagewellClient`` and ``MagewellCoordinator`` unchanged. A test
+helper; it is not shipped with the integration.
+"""
+
+import asyncio
+import json
+from collections import defaultdict, deque
+from collections.abc import Iterable
+from types import TracebackType
+from typing import Any
+
+import aiohttp
+
+from custom_components.magewell.api import MagewellClient
+from custom_components.magewell.coordinator import MagewellCoordinator
+
+SUMMARY_METHOD = "get-summary-info"
+
+
+class ReplayExhaustedError(Exception):
+    """The client asked for more replies than the capture holds."""
+
+
+def load_capture(path: str) -> list[dict[str, Any]]:
+    """Read a capture file, oldest line first."""
+    with open(path, encoding="utf-8") as file:
+        return [json.loads(line) for line in file if line.strip()]
+
+
+class _ReplayResponse:
+    """The reply to one request, usable like an aiohttp response context."""
+
+    def __init__(self, line: dict[str, Any], speed: float | None) -> None:
+        self._line = line
+        self._speed = speed
+
+    async def __aenter__(self) -> "_ReplayResponse":
+        if self._speed:
+            await asyncio.sleep(self._line["duration"] / self._speed)
+        if (error := self._line.get("error")) is not None:
+            if error.startswith("TimeoutError"):
+                raise TimeoutError(error)
+            raise aiohttp.ClientError(error)
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        return None
+
+    async def json(self, **kwargs: Any) -> dict:
+        """Return the captured reply."""
+        return self._line["response"]
+
+
+class ReplaySession:
+    """Stand-in for the client's aiohttp session answering from a capture.
+
+    Each method is answered with its captured replies in order, so the
+    replay stays deterministic however the coordinator interleaves its
+    calls. With a ``speed``, every reply takes its captured duration divided
+    by ``speed``; without one the capture is served as fast as possible.
+    Logins the capture does not hold succeed, since a replayed client may
+    log in at different times than the captured one.
+    """
+
+    def __init__(self, lines: Iterable[dict[str, Any]], speed: float | None = None) -> None:
+        """Initialize a session serving ``lines``."""
+        self._replies: defaultdict[str, deque[dict[str, Any]]] = defaultdict(deque)
+        for line in lines:
+            self._replies[line["method"]].append(line)
+        self.speed = speed
+        self.closed = False
+        self.cookie_jar = aiohttp.DummyCookieJar()
+        # Captured start time of the last poll served
+        self.last_poll: float | None = None
+
+    def remaining(self, method: str) -> int:
+        """Return how many replies to ``method`` are left."""
+        return len(self._replies[method])
+
+    def peek(self, method: str) -> dict[str, Any] | None:
+        """Return the next captured line for ``method`` without consuming it."""
+        replies = self._replies[method]
+        return replies[0] if replies else None
+
+    def get(self, url: str, params: dict[str, Any], **kwargs: Any) -> _ReplayResponse:
+        """Answer a request with the next captured reply to its method."""
+        method = params["method"]
+        replies = self._replies[method]
+        if replies:
+            line = replies.popleft()
+            if method == SUMMARY_METHOD:
+                self.last_poll = line["time"]
+            return _ReplayResponse(line, self.speed)
+        if method == "login":
+            return _ReplayResponse({"duration": 0, "response": {"status": 0}}, self.speed)
+        raise ReplayExhaustedError(f"The capture holds no more replies to {method}")
+
+    async def close(self) -> None:
+        """Close the session."""
+        self.closed = True
+
+
+class MagewellReplay:
+    """Drive a client and coordinator from a capture.
+
+    Create the client with ``client()``, hand it to a coordinator, then call
+    ``async_run()`` to refresh the coordinator once per captured poll, at the
+    captured intervals divided by ``speed`` or back to back without one.
+    """
+
+    def __init__(self, lines: Iterable[dict[str, Any]], speed: float | None = None) -> None:
+        """Initialize a replay of ``lines``."""
+        self.session = ReplaySession(lines, speed)
+
+    def client(
+        self, host: str = "replay", username: str = "Admin", password: str = "", **kwargs: Any
+    ) -> MagewellClient:
+        """Return a client answered by the capture."""
+        return MagewellClient(host, username, password, session=self.session, **kwargs)
+
+    async def async_run(self, coordinator: MagewellCoordinator) -> int:
+        """Refresh ``coordinator`` for every captured poll left; return how many ran."""
+        polls = 0
+        while (line := self.session.peek(SUMMARY_METHOD)) is not None:
+            if self.session.speed and (previous := self.session.last_poll) is not None:
+                await asyncio.sleep(max(0.0, line["time"] - previous) / self.session.speed)
+            await coordinator.async_refresh()
+            if self.session.peek(SUMMARY_METHOD) is line:
+                raise ReplayExhaustedError("The coordinator stopped polling the device")
+            polls += 1
+        return polls
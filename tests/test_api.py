@@ -1,16 +1,22 @@
 """Tests for the Magewell API client."""
 
+import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import aiohttp
 import pytest
+from freezegun.api import FrozenDateTimeFactory
 
 from custom_components.magewell.api import (
     MagewellApiError,
     MagewellAuthError,
     MagewellClient,
+    MagewellDeviceError,
+    SessionLifetime,
 )
 
+SUMMARY = "get-summary-info"
+
 
 @pytest.fixture
 def client() -> MagewellClient:
@@ -205,6 +211,21 @@ async def test_close(client: MagewellClient) -> None:
     assert client._logged_in is False
 
 
+async def test_close_keeps_caller_session() -> None:
+    """Test close leaves a session passed in by the caller open."""
+    mock_session = MagicMock()
+    mock_session.closed = False
+    mock_session.close = AsyncMock()
+    client = MagewellClient("192.168.1.100", "Admin", "password", session=mock_session)
+    client._logged_in = True
+
+    await client.close()
+
+    mock_session.close.assert_not_awaited()
+    assert client._session is mock_session
+    assert client._logged_in is False
+
+
 async def test_close_already_closed(client: MagewellClient) -> None:
     """Test close when session is already closed."""
     client._session = None
@@ -307,3 +328,324 @@ async def test_call_auto_login_when_not_logged_in(client: MagewellClient) -> Non
     result = await client.get_channel()
     assert result == {"status": 0, "result": "data"}
     assert call_count == 2  # login + get-channel
+
+
+async def test_call_device_error_skips_relogin(client: MagewellClient) -> None:
+    """Test a device error status is raised without spending a re-login."""
+    mock_session = MagicMock()
+    mock_session.closed = False
+    mock_session.get = MagicMock(return_value=_mock_response({"status": -2}))
+    client._session = mock_session
+    client._logged_in = True
+
+    with pytest.raises(MagewellDeviceError, match="returned status -2"):
+        await client.get_summary_info()
+    assert mock_session.get.call_count == 1
+
+
+async def test_call_stops_after_rejected_relogin(client: MagewellClient) -> None:
+    """Test a password change fails fast instead of retrying bad credentials."""
+    responses = [_mock_response({"status": -1}), _mock_response({"status": -1})]
+    mock_session = MagicMock()
+    mock_session.closed = False
+    mock_session.get = MagicMock(side_effect=responses)
+    client._session = mock_session
+    client._logged_in = True
+
+    with pytest.raises(MagewellAuthError, match="Login failed"):
+        await client.get_summary_info()
+    assert client.auth_failed is True
+
+    with pytest.raises(MagewellAuthError, match="reauthentication required"):
+        await client.get_summary_info()
+    assert mock_session.get.call_count == 2
+
+
+async def test_keepalive_learns_lifetime_and_refreshes(
+    client: MagewellClient,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test the client refreshes its session before the learned lifetime runs out."""
+    responses = [
+        _mock_response({"status": 0}),  # initial login
+        _mock_response({"status": -1}),  # expired after 120 s idle
+        _mock_response({"status": 0}),  # inline re-login
+        _mock_response({"status": 0, "data": "ok"}),  # retried call
+        _mock_response({"status": 0}),  # proactive refresh
+        _mock_response({"status": 0, "data": "ok"}),  # next call, past the old session's lifetime
+    ]
+    mock_session = MagicMock()
+    mock_session.closed = False
+    mock_session.get = MagicMock(side_effect=responses)
+    client._session = mock_session
+
+    await client.login()
+    assert await client.async_keepalive() is False
+
+    freezer.tick(120)
+    await client.get_summary_info()
+    assert client.stats.session_lifetime == 120
+    assert client.stats.inline_relogins == 1
+
+    freezer.tick(60)
+    assert await client.async_keepalive() is False
+    freezer.tick(40)
+    assert await client.async_keepalive() is True
+    assert client.stats.relogins_avoided == 0
+
+    freezer.tick(30)
+    await client.get_summary_info()
+    assert client.stats.as_dict()["relogins_avoided"] == 1
+    assert client.stats.logins == 3
+    assert client.stats.inline_relogins == 1
+
+
+async def test_early_session_loss_does_not_shrink_lifetime(freezer: FrozenDateTimeFactory) -> None:
+    """Test an eviction shortly after a poll is not taken as the session lifetime."""
+    client = MagewellClient("192.168.1.100", "Admin", "password", min_session_lifetime=30)
+    mock_session = MagicMock()
+    mock_session.closed = False
+    mock_session.get = MagicMock(
+        side_effect=[
+            _mock_response({"status": 0}),  # login
+            _mock_response({"status": -1}),  # evicted 5 s later
+            _mock_response({"status": 0}),  # re-login
+            _mock_response({"status": 0}),  # retried call
+        ]
+    )
+    client._session = mock_session
+    await client.login()
+
+    freezer.tick(5)
+    await client.get_summary_info()
+    assert client.stats.session_lifetime is None
+    assert client.stats.session_evictions == 1
+
+    for _ in range(30):
+        freezer.tick(10)
+        assert await client.async_keepalive() is False
+    assert client.stats.logins == 2
+
+
+def test_session_lifetime_grows_and_detects_absolute_expiry() -> None:
+    """Test the estimate follows recent expiries and picks the mode that fits."""
+    lifetime = SessionLifetime(floor=30)
+    lifetime.observe(idle=60, age=60)
+    assert (lifetime.mode, lifetime.seconds) == ("idle", 60)
+    lifetime.observe(idle=120, age=400)
+    lifetime.observe(idle=120, age=900)
+    assert (lifetime.mode, lifetime.seconds) == ("idle", 120)
+
+    # Polled every 30 s, the device still drops sessions 600 s after login
+    absolute = SessionLifetime(floor=30)
+    for idle in (30, 31, 45):
+        absolute.observe(idle=idle, age=600)
+    assert (absolute.mode, absolute.seconds) == ("absolute", 600)
+
+
+async def test_restore_and_export_session() -> None:
+    """Test saved cookies are loaded into the jar and reported after login."""
+    saved = []
+    client = MagewellClient("192.168.1.100", "Admin", "password", session_callback=saved.append)
+    client.restore_session({"sid": "abc123"})
+    assert client._logged_in is True
+    assert client.session_cookies == {"sid": "abc123"}
+
+    mock_session = MagicMock()
+    mock_session.closed = False
+    mock_session.get = MagicMock(return_value=_mock_response({"status": 0}))
+    mock_session.cookie_jar = [MagicMock(key="sid", value="fresh")]
+    real_session = client._session
+    client._session = mock_session
+    await client.login()
+    assert saved == [{"sid": "fresh"}]
+
+    await real_session.close()
+
+
+def _stalled_response():
+    """Create a mock response that never arrives."""
+    cm = AsyncMock()
+    cm.__aenter__ = AsyncMock(side_effect=asyncio.Event().wait)
+    cm.__aexit__ = AsyncMock(return_value=None)
+    return cm
+
+
+def _slow_response(data: dict, delay: float):
+    """Create a mock response that arrives after ``delay`` seconds."""
+
+    async def _enter():
+        await asyncio.sleep(delay)
+        response = AsyncMock()
+        response.json = AsyncMock(return_value=data)
+        return response
+
+    cm = AsyncMock()
+    cm.__aenter__ = AsyncMock(side_effect=_enter)
+    cm.__aexit__ = AsyncMock(return_value=None)
+    return cm
+
+
+def _hedging_client(reads: int) -> MagewellClient:
+    """Return a hedging client with a fast latency history after ``reads`` reads."""
+    client = MagewellClient("192.168.1.100", "Admin", "password", hedge_reads=True)
+    client._logged_in = True
+    for _ in range(60):
+        client.latency(SUMMARY).append(0.01)
+    for _ in range(reads):
+        client._hedge_budget.deposit()
+    return client
+
+
+async def test_hedged_read_wins_over_stalled_request() -> None:
+    """Test a read slower than its p95 is re-sent and the fast copy wins."""
+    client = _hedging_client(reads=100)
+    mock_session = MagicMock()
+    mock_session.closed = False
+    mock_session.get = MagicMock(side_effect=[_stalled_response(), _mock_response({"status": 0, "data": "fast"})])
+    client._session = mock_session
+
+    assert await client.get_summary_info() == {"status": 0, "data": "fast"}
+    assert mock_session.get.call_count == 2
+    assert client.stats.hedged_requests == 1
+    assert client.stats.hedge_wins == 1
+
+
+async def test_hedged_read_records_caller_latency() -> None:
+    """Test a hedged read records the wait for its first answer, not the hedge's round trip."""
+    client = _hedging_client(reads=100)
+    mock_session = MagicMock()
+    mock_session.closed = False
+    mock_session.get = MagicMock(side_effect=[_stalled_response(), _slow_response({"status": 0}, 0.05)])
+    client._session = mock_session
+    samples = len(client.latency(SUMMARY))
+
+    await client.get_summary_info()
+
+    latency = client.latency(SUMMARY)
+    assert client.stats.hedge_wins == 1
+    assert len(latency) == samples + 1
+    # The p95 hedge delay plus the hedge's own round trip
+    assert latency.latest() >= 0.06
+
+
+async def test_hedging_budget_does_not_accumulate() -> None:
+    """Test a long healthy run does not bank hedges for a later stall."""
+    client = _hedging_client(reads=10_000)
+    mock_session = MagicMock()
+    mock_session.closed = False
+    mock_session.get = MagicMock(side_effect=lambda *args, **kwargs: _slow_response({"status": 0}, 0.05))
+    client._session = mock_session
+
+    for _ in range(3):
+        await client.get_summary_info()
+    assert client.stats.hedged_requests == 2
+
+
+async def test_hedging_skips_writes() -> None:
+    """Test hedging never duplicates a channel change."""
+    client = _hedging_client(reads=100)
+    mock_session = MagicMock()
+    mock_session.closed = False
+    mock_session.get = MagicMock(side_effect=lambda *args, **kwargs: _slow_response({"status": 0}, 0.05))
+    client._session = mock_session
+
+    for _ in range(60):
+        client.latency("set-channel").append(0.01)
+    await client.set_channel("Camera 1")
+    assert mock_session.get.call_count == 1
+    assert client.stats.hedged_requests == 0
+
+
+async def test_read_retries_stale_socket_then_backs_off() -> None:
+    """Test a stale pooled socket is retried at once and later failures back off."""
+    client = MagewellClient("192.168.1.100", "Admin", "password", retry_attempts=2)
+    client._logged_in = True
+    mock_session = MagicMock()
+    mock_session.closed = False
+    mock_session.get = MagicMock(
+        side_effect=[
+            aiohttp.ServerDisconnectedError(),
+            aiohttp.ClientConnectionError("reset"),
+            _mock_response({"status": 0, "data": "ok"}),
+        ]
+    )
+    client._session = mock_session
+
+    with patch("custom_components.magewell.api.asyncio.sleep", new_callable=AsyncMock) as sleep:
+        assert await client.get_summary_info() == {"status": 0, "data": "ok"}
+
+    sleep.assert_awaited_once()
+    assert 0.2 <= sleep.await_args.args[0] <= 0.6
+    assert client.stats.retries == 2
+
+
+async def test_read_retries_exhausted_and_writes_not_retried() -> None:
+    """Test retries stop at the configured attempts and set-channel is sent once."""
+    client = MagewellClient("192.168.1.100", "Admin", "password", retry_attempts=1)
+    client._logged_in = True
+    mock_session = MagicMock()
+    mock_session.closed = False
+    mock_session.get = MagicMock(side_effect=aiohttp.ServerDisconnectedError())
+    client._session = mock_session
+
+    with pytest.raises(MagewellApiError, match="get-summary-info failed"):
+        await client.get_summary_info()
+    assert mock_session.get.call_count == 2
+
+    mock_session.get.reset_mock()
+    with pytest.raises(MagewellApiError, match="set-channel failed"):
+        await client.set_channel("Camera 1")
+    assert mock_session.get.call_count == 1
+    assert client.stats.retries == 1
+
+
+async def test_login_refused_by_device_does_not_start_reauth(client: MagewellClient) -> None:
+    """Test a login refused for lack of sessions is retried instead of latching."""
+    mock_session = MagicMock()
+    mock_session.closed = False
+    mock_session.get = MagicMock(
+        side_effect=[_mock_response({"status": -6}), _mock_response({"status": 0}), _mock_response({"status": 0})]
+    )
+    client._session = mock_session
+
+    with pytest.raises(MagewellDeviceError, match="refused"):
+        await client.login()
+    assert client.auth_failed is False
+
+    assert await client.get_summary_info() == {"status": 0}
+    assert mock_session.get.call_count == 3
+
+
+async def test_refused_connection_backs_off() -> None:
+    """Test a refused connection is not mistaken for a stale pooled socket."""
+    client = MagewellClient("192.168.1.100", "Admin", "password", retry_attempts=1)
+    client._logged_in = True
+    refused = aiohttp.ClientConnectorError(MagicMock(), OSError(111, "Connection refused"))
+    mock_session = MagicMock()
+    mock_session.closed = False
+    mock_session.get = MagicMock(side_effect=[refused, _mock_response({"status": 0})])
+    client._session = mock_session
+
+    with patch("custom_components.magewell.api.asyncio.sleep", new_callable=AsyncMock) as sleep:
+        await client.get_summary_info()
+    sleep.assert_awaited_once()
+
+
+async def test_retry_budget_stops_retries_during_outage() -> None:
+    """Test an outage spends the retry burst once instead of retrying forever."""
+    client = MagewellClient("192.168.1.100", "Admin", "password", retry_attempts=2)
+    client._logged_in = True
+    # A day of healthy polls must not bank extra retries
+    for _ in range(10_000):
+        client._retry_budget.deposit()
+    mock_session = MagicMock()
+    mock_session.closed = False
+    mock_session.get = MagicMock(side_effect=aiohttp.ServerDisconnectedError())
+    client._session = mock_session
+
+    with patch("custom_components.magewell.api.asyncio.sleep", new_callable=AsyncMock):
+        for _ in range(20):
+            with pytest.raises(MagewellApiError):
+                await client.get_summary_info()
+    assert client.stats.retries == 10
@@ -0,0 +1,121 @@
+"""Tests for traffic capture."""
+
+import json
+from datetime import timedelta
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import aiohttp
+import pytest
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.magewell.api import MagewellApiError, MagewellClient
+from custom_components.magewell.capture import CAPTURE_FLUSH_DELAY, MagewellCapture
+from custom_components.magewell.const import DOMAIN
+
+from .conftest import setup_integration
+
+
+def _client(*responses) -> MagewellClient:
+    """Return a client whose requests answer with ``responses`` in turn."""
+    client = MagewellClient("192.168.1.100", "Admin", "password")
+    contexts = []
+    for data in responses:
+        cm = AsyncMock()
+        if isinstance(data, Exception):
+            cm.__aenter__ = AsyncMock(side_effect=data)
+        else:
+            response = AsyncMock()
+            response.json = AsyncMock(return_value=data)
+            cm.__aenter__ = AsyncMock(return_value=response)
+        cm.__aexit__ = AsyncMock(return_value=None)
+        contexts.append(cm)
+    client._session = MagicMock(closed=False, get=MagicMock(side_effect=contexts))
+    return client
+
+
+def _read(path: Path) -> list[dict]:
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+async def test_capture_batches_requests(hass: HomeAssistant, tmp_path: Path, freezer: FrozenDateTimeFactory) -> None:
+    """Requests are written after the flush delay, without the login credentials."""
+    path = tmp_path / "decoder.jsonl"
+    client = _client({"status": 0}, {"status": 0, "ndi-name": "Camera 1"}, aiohttp.ClientError("reset"))
+    capture = MagewellCapture(hass, str(path))
+    capture.async_start(client)
+
+    await client.get_channel()
+    with pytest.raises(MagewellApiError):
+        await client.get_summary_info()
+    await hass.async_block_till_done()
+    assert not path.exists()
+
+    freezer.tick(timedelta(seconds=CAPTURE_FLUSH_DELAY))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    login, channel, summary = _read(path)
+    assert login["method"] == "login"
+    assert login["params"] == {}
+    assert channel["method"] == "get-channel"
+    assert channel["response"] == {"status": 0, "ndi-name": "Camera 1"}
+    assert channel["time"] >= login["time"]
+    assert channel["duration"] >= 0
+    assert summary["error"] == "ClientError: reset"
+    assert "response" not in summary
+
+    await capture.async_stop()
+    assert client.response_hook is None
+
+
+async def test_capture_rotates(hass: HomeAssistant, tmp_path: Path) -> None:
+    """The capture file is rotated once it would grow past the size cap."""
+    path = tmp_path / "decoder.jsonl"
+    client = _client(*[{"status": 0}] * 3)
+    capture = MagewellCapture(hass, str(path), max_bytes=150)
+    capture.async_start(client)
+
+    await client.get_channel()
+    await capture.async_flush()
+    await client.get_channel()
+    await capture.async_flush()
+
+    assert [line["method"] for line in _read(tmp_path / "decoder.jsonl.1")] == ["login", "get-channel"]
+    assert [line["method"] for line in _read(path)] == ["get-channel"]
+    assert capture.lines == 3
+
+
+async def test_capture_service(
+    hass: HomeAssistant,
+    mock_config_entry,
+    mock_magewell_client_init: AsyncMock,
+    tmp_path: Path,
+) -> None:
+    """The capture can be switched on and off at runtime."""
+    hass.config.config_dir = str(tmp_path)
+    await setup_integration(hass, mock_config_entry)
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        "capture",
+        {"config_entry_id": mock_config_entry.entry_id, "enabled": True},
+        blocking=True,
+        return_response=True,
+    )
+    assert response["path"] == str(tmp_path / "magewell_capture" / "192_168_1_100.jsonl")
+    assert mock_magewell_client_init.response_hook is not None
+    assert mock_config_entry.runtime_data.capture is not None
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        "capture",
+        {"config_entry_id": mock_config_entry.entry_id, "enabled": False},
+        blocking=True,
+        return_response=True,
+    )
+    assert response["enabled"] is False
+    assert mock_magewell_client_init.response_hook is None
+    assert mock_config_entry.runtime_data.capture is None
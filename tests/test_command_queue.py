@@ -0,0 +1,199 @@
+"""Tests for queued channel changes."""
+
+from datetime import timedelta
+from unittest.mock import AsyncMock
+
+import pytest
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.const import STATE_UNAVAILABLE
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_capture_events,
+    async_fire_time_changed,
+)
+
+from custom_components.magewell.api import MagewellApiError, MagewellDeviceError
+from custom_components.magewell.const import (
+    CONF_COMMAND_TTL,
+    DOMAIN,
+    EVENT_COMMAND_APPLIED,
+    EVENT_COMMAND_EXPIRED,
+    EVENT_COMMAND_QUEUED,
+)
+from custom_components.magewell.storage import COMMANDS_STORAGE_KEY, COMMANDS_STORAGE_VERSION
+
+from .conftest import MOCK_HOST, MOCK_USER_INPUT, setup_integration
+
+ENTITY_ID = "select.magewelltest_ndi_source_select"
+
+
+@pytest.fixture
+def queued_config_entry() -> MockConfigEntry:
+    """Return a config entry with command queuing enabled."""
+    return MockConfigEntry(
+        domain=DOMAIN,
+        unique_id=MOCK_HOST,
+        data=MOCK_USER_INPUT,
+        options={CONF_COMMAND_TTL: 600},
+        title=f"Magewell ({MOCK_HOST})",
+    )
+
+
+async def _select(hass: HomeAssistant, option: str) -> None:
+    await hass.services.async_call(
+        "select",
+        "select_option",
+        {"entity_id": ENTITY_ID, "option": option},
+        blocking=True,
+    )
+
+
+async def test_queued_while_unreachable(
+    hass: HomeAssistant,
+    queued_config_entry: MockConfigEntry,
+    mock_magewell_client_init: AsyncMock,
+) -> None:
+    """A switch that cannot reach the decoder is queued and applied after the next good poll."""
+    await setup_integration(hass, queued_config_entry)
+    queued = async_capture_events(hass, EVENT_COMMAND_QUEUED)
+    applied = async_capture_events(hass, EVENT_COMMAND_APPLIED)
+
+    mock_magewell_client_init.set_channel.side_effect = MagewellApiError("unreachable")
+    await _select(hass, "Camera 2")
+    assert [event.data["source"] for event in queued] == ["Camera 2"]
+    assert queued[0].data["ttl"] == 600
+    assert queued_config_entry.runtime_data.commands.pending == "Camera 2"
+
+    mock_magewell_client_init.set_channel.side_effect = None
+    mock_magewell_client_init.set_channel.reset_mock()
+    await queued_config_entry.runtime_data.coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    mock_magewell_client_init.set_channel.assert_awaited_once_with("Camera 2")
+    assert [event.data["source"] for event in applied] == ["Camera 2"]
+    assert queued_config_entry.runtime_data.commands.pending is None
+
+
+async def test_queued_after_failed_poll(
+    hass: HomeAssistant,
+    queued_config_entry: MockConfigEntry,
+    mock_magewell_client_init: AsyncMock,
+) -> None:
+    """The picker stays available while the decoder is down, so a switch still reaches the queue."""
+    await setup_integration(hass, queued_config_entry)
+    coordinator = queued_config_entry.runtime_data.coordinator
+
+    mock_magewell_client_init.get_summary_info.side_effect = MagewellApiError("unreachable")
+    mock_magewell_client_init.set_channel.side_effect = MagewellApiError("unreachable")
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert not coordinator.last_update_success
+    assert hass.states.get(ENTITY_ID).state != STATE_UNAVAILABLE
+
+    await _select(hass, "Camera 2")
+    assert queued_config_entry.runtime_data.commands.pending == "Camera 2"
+
+    mock_magewell_client_init.get_summary_info.side_effect = None
+    mock_magewell_client_init.set_channel.side_effect = None
+    mock_magewell_client_init.set_channel.reset_mock()
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    mock_magewell_client_init.set_channel.assert_awaited_once_with("Camera 2")
+    assert queued_config_entry.runtime_data.commands.pending is None
+
+
+async def test_unavailable_without_queue(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_magewell_client_init: AsyncMock,
+) -> None:
+    """Without command queuing the picker is unavailable after a failed poll."""
+    await setup_integration(hass, mock_config_entry)
+
+    mock_magewell_client_init.get_summary_info.side_effect = MagewellApiError("unreachable")
+    await mock_config_entry.runtime_data.coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert hass.states.get(ENTITY_ID).state == STATE_UNAVAILABLE
+
+
+async def test_latest_command_wins(
+    hass: HomeAssistant,
+    queued_config_entry: MockConfigEntry,
+    mock_magewell_client_init: AsyncMock,
+) -> None:
+    """Only the most recent queued switch is sent once the decoder is back."""
+    await setup_integration(hass, queued_config_entry)
+
+    mock_magewell_client_init.set_channel.side_effect = MagewellApiError("unreachable")
+    await _select(hass, "Camera 2")
+    await _select(hass, "Camera 3")
+
+    mock_magewell_client_init.set_channel.side_effect = None
+    mock_magewell_client_init.set_channel.reset_mock()
+    await queued_config_entry.runtime_data.coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    mock_magewell_client_init.set_channel.assert_awaited_once_with("Camera 3")
+
+
+async def test_queued_command_expires(
+    hass: HomeAssistant,
+    queued_config_entry: MockConfigEntry,
+    mock_magewell_client_init: AsyncMock,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """A queued switch is dropped once it is older than the TTL."""
+    await setup_integration(hass, queued_config_entry)
+    expired = async_capture_events(hass, EVENT_COMMAND_EXPIRED)
+
+    mock_magewell_client_init.set_channel.side_effect = MagewellApiError("unreachable")
+    await _select(hass, "Camera 2")
+
+    freezer.tick(timedelta(seconds=601))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    assert [(event.data["source"], event.data["reason"]) for event in expired] == [("Camera 2", "ttl")]
+    assert queued_config_entry.runtime_data.commands.pending is None
+
+
+async def test_queued_command_survives_restart(
+    hass: HomeAssistant,
+    queued_config_entry: MockConfigEntry,
+    mock_magewell_client_init: AsyncMock,
+    hass_storage: dict,
+) -> None:
+    """A command saved before a restart is applied once the decoder is reachable."""
+    hass_storage[COMMANDS_STORAGE_KEY] = {
+        "version": COMMANDS_STORAGE_VERSION,
+        "minor_version": 1,
+        "key": COMMANDS_STORAGE_KEY,
+        "data": {queued_config_entry.entry_id: {"source": "Camera 3", "queued_at": dt_util.utcnow().timestamp() - 30}},
+    }
+    applied = async_capture_events(hass, EVENT_COMMAND_APPLIED)
+
+    await setup_integration(hass, queued_config_entry)
+
+    mock_magewell_client_init.set_channel.assert_awaited_once_with("Camera 3")
+    assert len(applied) == 1
+    assert applied[0].data["delay"] >= 30
+
+
+async def test_rejected_switch_not_queued(
+    hass: HomeAssistant,
+    queued_config_entry: MockConfigEntry,
+    mock_magewell_client_init: AsyncMock,
+) -> None:
+    """A switch the decoder refuses still fails instead of being queued."""
+    await setup_integration(hass, queued_config_entry)
+
+    mock_magewell_client_init.set_channel.side_effect = MagewellDeviceError("bad source")
+    with pytest.raises(HomeAssistantError):
+        await _select(hass, "Camera 2")
+
+    assert queued_config_entry.runtime_data.commands.pending is None
@@ -9,7 +9,18 @@ from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResultType
 
 from custom_components.magewell.api import MagewellApiError, MagewellAuthError
-from custom_components.magewell.const import CONF_SCAN_INTERVAL, DOMAIN
+from custom_components.magewell.const import (
+    CONF_COMMAND_TTL,
+    CONF_FORMAT_SETTLE_TIME,
+    CONF_HEDGE_READS,
+    CONF_RATE_BURST,
+    CONF_RATE_LIMIT,
+    CONF_RETRY_ATTEMPTS,
+    CONF_SAMPLE_INTERVAL,
+    CONF_SCAN_INTERVAL,
+    CONF_WATCHDOG_THRESHOLD,
+    DOMAIN,
+)
 
 
 async def test_full_user_flow(
@@ -311,3 +322,56 @@ async def test_reconfigure_flow_auth_error(
     assert result["type"] is FlowResultType.FORM
     assert result["step_id"] == "reconfigure"
     assert result["errors"] == {"base": "invalid_auth"}
+
+
+async def test_options_flow(
+    hass: HomeAssistant,
+    mock_setup_entry: AsyncMock,
+    mock_config_entry,
+) -> None:
+    """Test setting the sample interval through the options flow."""
+    mock_config_entry.add_to_hass(hass)
+
+    result = await hass.config_entries.options.async_init(mock_config_entry.entry_id)
+    assert result["type"] is FlowResultType.FORM
+    assert result["step_id"] == "init"
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={CONF_SAMPLE_INTERVAL: 5},
+    )
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert mock_config_entry.options == {
+        CONF_SAMPLE_INTERVAL: 5,
+        CONF_FORMAT_SETTLE_TIME: 5,
+        CONF_HEDGE_READS: False,
+        CONF_RETRY_ATTEMPTS: 2,
+        CONF_RATE_LIMIT: 5.0,
+        CONF_RATE_BURST: 10,
+        CONF_COMMAND_TTL: 0,
+        CONF_WATCHDOG_THRESHOLD: 0,
+    }
+
+
+async def test_options_flow_watchdog_threshold_too_low(
+    hass: HomeAssistant,
+    mock_setup_entry: AsyncMock,
+    mock_config_entry,
+) -> None:
+    """Test a watchdog threshold below the minimum is refused, but 0 still turns it off."""
+    mock_config_entry.add_to_hass(hass)
+
+    result = await hass.config_entries.options.async_init(mock_config_entry.entry_id)
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={CONF_WATCHDOG_THRESHOLD: 1},
+    )
+    assert result["type"] is FlowResultType.FORM
+    assert result["errors"] == {CONF_WATCHDOG_THRESHOLD: "watchdog_threshold_too_low"}
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={CONF_WATCHDOG_THRESHOLD: 10},
+    )
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert mock_config_entry.options[CONF_WATCHDOG_THRESHOLD] == 10
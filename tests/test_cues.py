@@ -0,0 +1,164 @@
+"""Tests for scheduled source switches."""
+
+from datetime import timedelta
+from unittest.mock import AsyncMock
+
+import pytest
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_capture_events, async_fire_time_changed
+
+from custom_components.magewell.api import MagewellApiError
+from custom_components.magewell.const import DOMAIN, EVENT_CUE_FIRED
+from custom_components.magewell.stats import RingBuffer
+
+from .conftest import setup_integration
+
+
+@pytest.fixture
+def latencies(mock_magewell_client_init: AsyncMock) -> dict[str, RingBuffer]:
+    """Give the mocked client real latency histories."""
+    buffers: dict[str, RingBuffer] = {}
+    mock_magewell_client_init.latency.side_effect = lambda method: buffers.setdefault(method, RingBuffer(10))
+    return buffers
+
+
+async def _schedule(hass: HomeAssistant, entry_id: str, at) -> dict:
+    return await hass.services.async_call(
+        DOMAIN,
+        "schedule_source",
+        {"config_entry_id": entry_id, "source": "Camera 2", "at": at},
+        blocking=True,
+        return_response=True,
+    )
+
+
+async def test_cue_warms_up_and_fires_early(
+    hass: HomeAssistant,
+    mock_config_entry,
+    mock_magewell_client_init: AsyncMock,
+    latencies: dict[str, RingBuffer],
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """The connection is warmed before the cue and the switch is sent early by its latency."""
+    await setup_integration(hass, mock_config_entry)
+    latencies.setdefault("set-channel", RingBuffer(10)).append(0.25)
+    events = async_capture_events(hass, EVENT_CUE_FIRED)
+    # Closer than the warm-up time, so the connection is warmed at once
+    target = dt_util.utcnow().replace(microsecond=0) + timedelta(seconds=3)
+    mock_magewell_client_init.get_channel.reset_mock()
+
+    response = await _schedule(hass, mock_config_entry.entry_id, target)
+    assert response == {"target": target.isoformat(), "source": "Camera 2", "lead": 0.25}
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done(wait_background_tasks=True)
+    mock_magewell_client_init.async_keepalive.assert_awaited_once()
+    mock_magewell_client_init.get_channel.assert_awaited_once()
+    mock_magewell_client_init.set_channel.assert_not_called()
+
+    freezer.move_to(target - timedelta(seconds=0.25))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done(wait_background_tasks=True)
+    mock_magewell_client_init.set_channel.assert_awaited_once_with("Camera 2")
+    assert len(events) == 1
+    assert events[0].data == {
+        "config_entry_id": mock_config_entry.entry_id,
+        "source": "Camera 2",
+        "target": target.isoformat(),
+        "lead": 0.25,
+        "offset": -0.25,
+        "error": None,
+    }
+
+
+async def test_cue_reports_failure(
+    hass: HomeAssistant,
+    mock_config_entry,
+    mock_magewell_client_init: AsyncMock,
+    latencies: dict[str, RingBuffer],
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """A switch that fails at the cue is reported, and warm-up failures do not stop it."""
+    await setup_integration(hass, mock_config_entry)
+    mock_magewell_client_init.get_channel.side_effect = MagewellApiError("timeout")
+    mock_magewell_client_init.set_channel.side_effect = MagewellApiError("timeout")
+    events = async_capture_events(hass, EVENT_CUE_FIRED)
+    target = dt_util.utcnow() + timedelta(seconds=2)
+
+    await _schedule(hass, mock_config_entry.entry_id, target)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done(wait_background_tasks=True)
+    freezer.move_to(target)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert len(events) == 1
+    assert events[0].data["error"] == "timeout"
+    assert events[0].data["lead"] == 0
+
+
+async def test_cue_rejected_in_past_and_cancelled_on_unload(
+    hass: HomeAssistant,
+    mock_config_entry,
+    mock_magewell_client_init: AsyncMock,
+    latencies: dict[str, RingBuffer],
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Cues in the past are refused, and pending cues die with the entry."""
+    await setup_integration(hass, mock_config_entry)
+    with pytest.raises(ServiceValidationError):
+        await _schedule(hass, mock_config_entry.entry_id, dt_util.utcnow() - timedelta(seconds=1))
+
+    target = dt_util.utcnow() + timedelta(seconds=60)
+    await _schedule(hass, mock_config_entry.entry_id, target)
+    await hass.config_entries.async_unload(mock_config_entry.entry_id)
+    freezer.move_to(target)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done(wait_background_tasks=True)
+    mock_magewell_client_init.set_channel.assert_not_called()
+
+
+async def test_cue_source_checked_locally(
+    hass: HomeAssistant,
+    mock_config_entry,
+    mock_magewell_client_init: AsyncMock,
+    latencies: dict[str, RingBuffer],
+) -> None:
+    """Unknown sources are refused from the cached index, refreshing it only when asked."""
+    await setup_integration(hass, mock_config_entry)
+    mock_magewell_client_init.get_ndi_sources.reset_mock()
+    target = dt_util.utcnow() + timedelta(seconds=60)
+
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            DOMAIN,
+            "schedule_source",
+            {"config_entry_id": mock_config_entry.entry_id, "source": "Camera 4", "at": target},
+            blocking=True,
+        )
+    mock_magewell_client_init.get_ndi_sources.assert_not_called()
+
+    # A source that appeared since the last discovery is found by the refresh
+    mock_magewell_client_init.get_ndi_sources.return_value = ["Camera 1", "Camera 4"]
+    response = await hass.services.async_call(
+        DOMAIN,
+        "schedule_source",
+        {"config_entry_id": mock_config_entry.entry_id, "source": "Camera 4", "at": target, "refresh": True},
+        blocking=True,
+        return_response=True,
+    )
+    assert response["source"] == "Camera 4"
+    mock_magewell_client_init.get_ndi_sources.assert_awaited_once()
+    state = hass.states.get("select.magewelltest_ndi_source_select")
+    assert state.attributes["options"] == ["Camera 1", "Camera 4"]
+
+    # Known sources never trigger a refresh
+    await hass.services.async_call(
+        DOMAIN,
+        "schedule_source",
+        {"config_entry_id": mock_config_entry.entry_id, "source": "Camera 1", "at": target, "refresh": True},
+        blocking=True,
+    )
+    mock_magewell_client_init.get_ndi_sources.assert_awaited_once()
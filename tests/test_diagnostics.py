@@ -30,3 +30,7 @@ async def test_diagnostics(
     # Coordinator data should be present
     assert diag["coordinator_data"]["summary"] == MOCK_SUMMARY_INFO
     assert diag["coordinator_data"]["ndi_sources"] == MOCK_NDI_SOURCES
+    assert diag["rate_limiter"]["queue_depth"] == 0
+    assert diag["rate_limiter"]["rate"] == 5.0
+    assert len(diag["traces"]) == 1
+    assert diag["trace_events"]["traceEvents"][0]["args"] == {"name": mock_config_entry.title}
@@ -0,0 +1,91 @@
+"""Tests for the shared NDI source discovery cache."""
+
+from datetime import timedelta
+from unittest.mock import MagicMock
+
+from custom_components.magewell.discovery import MagewellDiscovery, network_segment
+
+
+def _coordinator() -> MagicMock:
+    """Return a stand-in coordinator that is healthy and polls every 30 s."""
+    coordinator = MagicMock()
+    coordinator.last_update_success = True
+    coordinator.update_interval = timedelta(seconds=30)
+    return coordinator
+
+
+def test_network_segment() -> None:
+    """Test hosts are grouped by /24 and hostnames stand alone."""
+    assert network_segment("192.168.1.100") == "192.168.1.0/24"
+    assert network_segment("192.168.1.7") == network_segment("192.168.1.200")
+    assert network_segment("192.168.2.7") != network_segment("192.168.1.7")
+    assert network_segment("decoder.local") == "decoder.local"
+
+
+def test_only_pollers_query_the_device() -> None:
+    """Test that non-poller members reuse the list published by a poller."""
+    discovery = MagewellDiscovery()
+    first, second, third = _coordinator(), _coordinator(), _coordinator()
+    for coordinator in (first, second, third):
+        discovery.async_register(coordinator, "10.0.0.1")
+
+    assert discovery.is_poller(first)
+    assert discovery.is_poller(second)
+    assert not discovery.is_poller(third)
+
+    # Nothing published yet, so the third decoder has to poll itself
+    assert discovery.cached_sources(third) is None
+
+    discovery.async_publish(first, ["Camera 1"])
+    assert discovery.cached_sources(third) == ["Camera 1"]
+    assert discovery.cached_sources(first) is None
+    third.async_set_ndi_sources.assert_called_once_with(["Camera 1"])
+    second.async_set_ndi_sources.assert_called_once_with(["Camera 1"])
+
+    # Republishing an unchanged list does not fan out again
+    discovery.async_publish(second, ["Camera 1"])
+    assert third.async_set_ndi_sources.call_count == 1
+
+
+def test_failover_to_next_healthy_member() -> None:
+    """Test that a failed poller hands discovery to the next healthy decoder."""
+    discovery = MagewellDiscovery()
+    first, second, third = _coordinator(), _coordinator(), _coordinator()
+    for coordinator in (first, second, third):
+        discovery.async_register(coordinator, "10.0.0.1")
+
+    first.last_update_success = False
+    assert not discovery.is_poller(first)
+    assert discovery.is_poller(third)
+
+
+def test_unregister_removes_member() -> None:
+    """Test unregistering shrinks and finally removes the segment."""
+    discovery = MagewellDiscovery()
+    first = _coordinator()
+    unregister = discovery.async_register(first, "10.0.0.1")
+    assert discovery.as_dict(first) == {"segment": "10.0.0.0/24", "members": 1, "poller": True}
+
+    unregister()
+    assert discovery.as_dict(first) == {}
+    assert discovery.cached_sources(first) is None
+
+
+def test_standby_poller_does_not_override_owner() -> None:
+    """Test the second poller's differing list is ignored while the owner's is fresh."""
+    discovery = MagewellDiscovery()
+    first, second, third, fourth = _coordinator(), _coordinator(), _coordinator(), _coordinator()
+    for coordinator in (first, second, third, fourth):
+        discovery.async_register(coordinator, "10.0.0.1")
+
+    discovery.async_publish(first, ["Camera 1", "Camera 2"])
+    discovery.async_publish(second, ["Camera 1"])
+    discovery.async_publish(first, ["Camera 1", "Camera 2"])
+    assert discovery.cached_sources(fourth) == ["Camera 1", "Camera 2"]
+    assert fourth.async_set_ndi_sources.call_count == 1
+
+    # Once the owner fails, the standby's list takes over
+    first.last_update_success = False
+    discovery.async_publish(second, ["Camera 1"])
+    assert discovery.cached_sources(fourth) == ["Camera 1"]
+    assert fourth.async_set_ndi_sources.call_count == 2
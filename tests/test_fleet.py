@@ -0,0 +1,94 @@
+"""Tests for the fleet totals and sensors."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.magewell.const import DOMAIN
+from custom_components.magewell.fleet import FleetTotals
+
+from .conftest import MOCK_HOST, MOCK_SUMMARY_INFO, MOCK_USER_INPUT, setup_integration
+
+
+def _coordinator(temperature: float | None, cpu: float = 20.0, connected: bool = True, status: int = 0) -> MagicMock:
+    device = {"cpu-usage": cpu}
+    if temperature is not None:
+        device["core-temp"] = temperature
+    summary = {"status": status, "device": device, "ndi": {"connected": connected}}
+    return MagicMock(last_update_success=True, data={"summary": summary})
+
+
+def test_totals_follow_each_update() -> None:
+    """Replacing or removing one decoder adjusts the totals without a rescan."""
+    totals = FleetTotals()
+    totals.update("a", _coordinator(50.0, cpu=10.0))
+    totals.update("b", _coordinator(70.0, cpu=30.0, connected=False))
+    totals.update("c", _coordinator(None, connected=False, status=1))
+    assert (totals.decoders, totals.connected, totals.errors) == (3, 1, 1)
+    assert totals.max_core_temperature == 70.0
+    assert totals.mean_cpu_usage == 20.0
+
+    # The hottest decoder cools down, then leaves
+    totals.update("b", _coordinator(40.0, cpu=30.0))
+    assert totals.max_core_temperature == 50.0
+    assert totals.connected == 2
+    totals.update("a", None)
+    assert totals.max_core_temperature == 40.0
+    assert totals.mean_cpu_usage == 25.0
+    assert totals.decoders == 2
+
+    unavailable = _coordinator(90.0)
+    unavailable.last_update_success = False
+    totals.update("b", unavailable)
+    assert totals.max_core_temperature is None
+    assert totals.errors == 2
+
+
+def test_temperature_heap_stays_bounded() -> None:
+    """Outdated readings of a decoder that is never the hottest are compacted away."""
+    totals = FleetTotals()
+    totals.update("hot", _coordinator(90.0))
+    for reading in range(1000):
+        totals.update("cool", _coordinator(40.0 + reading % 10))
+    assert len(totals._temperature_heap) < 20
+    assert totals.max_core_temperature == 90.0
+
+
+async def test_fleet_sensors_move_between_decoders(
+    hass: HomeAssistant,
+    entity_registry: er.EntityRegistry,
+    mock_config_entry: MockConfigEntry,
+    mock_magewell_client_init: AsyncMock,
+) -> None:
+    """The fleet sensors total every decoder and survive the unload of their host."""
+    mock_magewell_client_init.get_summary_info.return_value = {
+        **MOCK_SUMMARY_INFO,
+        "device": {**MOCK_SUMMARY_INFO["device"], "core-temp": 60.0},
+    }
+    await setup_integration(hass, mock_config_entry)
+    second = MockConfigEntry(
+        domain=DOMAIN,
+        unique_id="192.168.1.101",
+        data={**MOCK_USER_INPUT, "host": "192.168.1.101"},
+        title="Magewell (192.168.1.101)",
+    )
+    mock_magewell_client_init.get_summary_info.return_value = MOCK_SUMMARY_INFO
+    await setup_integration(hass, second)
+
+    assert hass.states.get("sensor.magewell_fleet_connected_decoders").state == "2"
+    assert hass.states.get("sensor.magewell_fleet_decoders_in_error").state == "0"
+    assert hass.states.get("sensor.magewell_fleet_hottest_core_temperature").state == "60.0"
+    assert hass.states.get("sensor.magewell_fleet_mean_cpu_usage").state == "25.0"
+    entity = entity_registry.async_get("sensor.magewell_fleet_connected_decoders")
+    assert entity.config_entry_id == mock_config_entry.entry_id
+
+    await hass.config_entries.async_unload(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert hass.states.get("sensor.magewell_fleet_connected_decoders").state == "1"
+    assert hass.states.get("sensor.magewell_fleet_hottest_core_temperature").state == "45.0"
+    entity = entity_registry.async_get("sensor.magewell_fleet_connected_decoders")
+    assert entity.config_entry_id == second.entry_id
+    assert MOCK_HOST not in entity.entity_id
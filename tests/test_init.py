@@ -1,18 +1,42 @@
 """Tests for the Magewell integration setup and teardown."""
 
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, MagicMock, patch
 
 from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers import issue_registry as ir
+from homeassistant.setup import async_setup_component
 
-from custom_components.magewell.api import MagewellApiError, MagewellAuthError
-from custom_components.magewell.const import DOMAIN
+from custom_components.magewell.api import MagewellApiError, MagewellAuthError, MagewellDeviceError
+from custom_components.magewell.const import CONF_HOSTS, DOMAIN
 from custom_components.magewell.coordinator import CONSECUTIVE_FAILURE_THRESHOLD
 
 from .conftest import MOCK_SUMMARY_INFO, setup_integration
 
 
+async def test_setup_entry_restores_saved_session(
+    hass: HomeAssistant,
+    hass_storage: dict,
+    mock_config_entry,
+    mock_magewell_client_init: AsyncMock,
+) -> None:
+    """Test a saved session cookie is reused instead of logging in."""
+    hass_storage["magewell.sessions"] = {
+        "version": 1,
+        "minor_version": 1,
+        "key": "magewell.sessions",
+        "data": {mock_config_entry.entry_id: {"sid": "abc123"}},
+    }
+
+    await setup_integration(hass, mock_config_entry)
+
+    assert mock_config_entry.state is ConfigEntryState.LOADED
+    mock_magewell_client_init.restore_session.assert_called_once_with({"sid": "abc123"})
+    mock_magewell_client_init.login.assert_not_awaited()
+
+
 async def test_setup_entry(
     hass: HomeAssistant,
     mock_config_entry,
@@ -107,3 +131,106 @@ async def test_coordinator_recovery_deletes_repair_issue(
     assert issue_reg.async_get_issue(
         DOMAIN, f"persistent_connection_failure_{mock_config_entry.entry_id}"
     ) is None
+
+
+async def test_yaml_bulk_import(
+    hass: HomeAssistant,
+    mock_setup_entry: AsyncMock,
+) -> None:
+    """Test bulk YAML import creates one entry per good host and reports failures."""
+
+    def _client(host, username, password, **kwargs):
+        client = MagicMock()
+        client.login = AsyncMock(side_effect=MagewellAuthError("bad") if host == "10.0.0.2" else None)
+        client.get_summary_info = AsyncMock(
+            side_effect=MagewellApiError("offline") if host == "10.0.0.3" else None,
+            return_value=MOCK_SUMMARY_INFO,
+        )
+        client.close = AsyncMock()
+        return client
+
+    with patch("custom_components.magewell.config_flow.MagewellClient", side_effect=_client):
+        assert await async_setup_component(
+            hass,
+            DOMAIN,
+            {
+                DOMAIN: {
+                    CONF_HOSTS: ["10.0.0.1", "10.0.0.2", "10.0.0.3", "10.0.0.4", "10.0.0.1"],
+                    CONF_USERNAME: "Admin",
+                    CONF_PASSWORD: "secret",
+                }
+            },
+        )
+        await hass.async_block_till_done()
+
+    entries = hass.config_entries.async_entries(DOMAIN)
+    assert sorted(entry.unique_id for entry in entries) == ["10.0.0.1", "10.0.0.4"]
+
+    issue = ir.async_get(hass).async_get_issue(DOMAIN, "bulk_import_failed")
+    assert issue is not None
+    assert issue.translation_placeholders["count"] == "2"
+    assert "10.0.0.2: invalid_auth" in issue.translation_placeholders["failures"]
+    assert "10.0.0.3: cannot_connect" in issue.translation_placeholders["failures"]
+
+
+async def test_device_registry_updated_on_identity_change(
+    hass: HomeAssistant,
+    mock_config_entry,
+    mock_magewell_client_init: AsyncMock,
+) -> None:
+    """Test the device registry follows a firmware upgrade."""
+    await setup_integration(hass, mock_config_entry)
+    coordinator = mock_config_entry.runtime_data.coordinator
+
+    device_registry = dr.async_get(hass)
+    device = device_registry.async_get_device(identifiers={(DOMAIN, mock_config_entry.entry_id)})
+    assert device.sw_version == "1.3.456"
+    assert device.serial_number == "ABC123"
+
+    device_info = coordinator.device_info
+    await coordinator.async_refresh()
+    assert coordinator.device_info is device_info
+
+    upgraded = {**MOCK_SUMMARY_INFO["device"], "firmware-version": "1.4.0"}
+    mock_magewell_client_init.get_summary_info.return_value = {**MOCK_SUMMARY_INFO, "device": upgraded}
+    await coordinator.async_refresh()
+
+    device = device_registry.async_get_device(identifiers={(DOMAIN, mock_config_entry.entry_id)})
+    assert device.sw_version == "1.4.0"
+
+
+async def test_coordinator_auth_failure_starts_reauth(
+    hass: HomeAssistant,
+    mock_config_entry,
+    mock_magewell_client_init: AsyncMock,
+) -> None:
+    """Test a credential rejection during a poll starts reauth and stops polling."""
+    await setup_integration(hass, mock_config_entry)
+    coordinator = mock_config_entry.runtime_data.coordinator
+
+    mock_magewell_client_init.get_summary_info.side_effect = MagewellAuthError("bad creds")
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert coordinator.last_update_success is False
+    assert coordinator._unsub_refresh is None
+    flows = hass.config_entries.flow.async_progress_by_handler(DOMAIN)
+    assert [flow["context"]["source"] for flow in flows] == ["reauth"]
+    assert ir.async_get(hass).async_get_issue(
+        DOMAIN, f"persistent_connection_failure_{mock_config_entry.entry_id}"
+    ) is None
+
+
+async def test_session_exhaustion_does_not_start_reauth(
+    hass: HomeAssistant,
+    mock_config_entry,
+    mock_magewell_client_init: AsyncMock,
+) -> None:
+    """Test a device out of sessions leaves the entry retrying, not in reauth."""
+    mock_magewell_client_init.login.side_effect = MagewellDeviceError("Login refused (status=-6)")
+    mock_config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert mock_config_entry.state is ConfigEntryState.SETUP_RETRY
+    assert hass.config_entries.flow.async_progress_by_handler(DOMAIN) == []
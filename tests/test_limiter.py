@@ -0,0 +1,79 @@
+"""Tests for the per-host rate limiter."""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+from homeassistant.core import HomeAssistant
+
+from custom_components import magewell
+from custom_components.magewell.limiter import TokenBucket, async_get_limiter
+
+from .conftest import MOCK_HOST, setup_integration
+
+
+async def test_limiter_shared_per_host(
+    hass: HomeAssistant,
+    mock_config_entry,
+    mock_magewell_client_init: AsyncMock,
+) -> None:
+    """Test the entry's client and any other caller share the host's bucket."""
+    await setup_integration(hass, mock_config_entry)
+
+    limiter = async_get_limiter(hass, MOCK_HOST)
+    assert async_get_limiter(hass, MOCK_HOST) is limiter
+    assert async_get_limiter(hass, "192.168.1.101") is not limiter
+    assert magewell.MagewellClient.call_args.kwargs["limiter"] is limiter
+
+
+async def test_burst_then_throttle() -> None:
+    """Test the burst is admitted at once and later callers wait for tokens."""
+    bucket = TokenBucket(rate=20, burst=2)
+    await bucket.acquire()
+    await bucket.acquire()
+    assert bucket.throttled == 0
+
+    waiter = asyncio.ensure_future(bucket.acquire())
+    await asyncio.sleep(0)
+    assert not waiter.done()
+    assert bucket.queue_depth == 1
+
+    await asyncio.wait_for(waiter, 1)
+    assert bucket.throttled == 1
+    assert bucket.as_dict()["queue_depth"] == 0
+
+
+async def test_waiters_are_served_in_order() -> None:
+    """Test queued callers get tokens in arrival order."""
+    bucket = TokenBucket(rate=1000, burst=1)
+    await bucket.acquire()
+    order: list[int] = []
+
+    async def _caller(index: int) -> None:
+        await bucket.acquire()
+        order.append(index)
+
+    await asyncio.gather(*(_caller(index) for index in range(5)))
+    assert order == [0, 1, 2, 3, 4]
+    assert bucket.max_queue_depth >= 4
+
+
+async def test_cancelled_head_hands_over() -> None:
+    """Test a cancelled caller does not block the queue behind it."""
+    bucket = TokenBucket(rate=1000, burst=1)
+    await bucket.acquire()
+    first = asyncio.ensure_future(bucket.acquire())
+    second = asyncio.ensure_future(bucket.acquire())
+    await asyncio.sleep(0)
+    first.cancel()
+
+    await asyncio.wait_for(second, 1)
+    assert bucket.queue_depth == 0
+
+
+async def test_zero_rate_disables_limit() -> None:
+    """Test a rate of 0 admits every caller immediately."""
+    bucket = TokenBucket(rate=1, burst=1)
+    bucket.configure(0, 1)
+    for _ in range(10):
+        await bucket.acquire()
+    assert bucket.throttled == 0
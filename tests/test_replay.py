@@ -0,0 +1,69 @@
+"""Tests driven by a capture of decoder traffic.
+
+The capture in fixtures/capture.jsonl is synthetic: it was written by hand
+in the format of the capture action, not recorded from a real decoder.
+"""
+
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import async_capture_events
+
+from custom_components.magewell.const import EVENT_NDI_SOURCE_APPEARED
+
+from .conftest import setup_integration
+from .replay import MagewellReplay, ReplayExhaustedError, load_capture
+
+CAPTURE = load_capture(str(Path(__file__).parent / "fixtures" / "capture.jsonl"))
+
+
+@pytest.fixture
+async def replay(hass: HomeAssistant) -> MagewellReplay:
+    """Replay the captured traffic through the real client."""
+    replay = MagewellReplay(CAPTURE)
+    with patch("custom_components.magewell.MagewellClient", side_effect=replay.client):
+        yield replay
+
+
+async def test_replay_drives_coordinator(hass: HomeAssistant, mock_config_entry, replay: MagewellReplay) -> None:
+    """The captured polls update entities, fire events and exercise a session expiry."""
+    appeared = async_capture_events(hass, EVENT_NDI_SOURCE_APPEARED)
+    await setup_integration(hass, mock_config_entry)
+    coordinator = mock_config_entry.runtime_data.coordinator
+
+    assert hass.states.get("select.studio_decoder_ndi_source_select").attributes["options"] == ["CAM 1", "CAM 2"]
+    assert hass.states.get("binary_sensor.studio_decoder_ndi_connected").state == "on"
+
+    assert await replay.async_run(coordinator) == 3
+
+    assert [event.data["source"] for event in appeared] == ["REPLAY 1"]
+    assert hass.states.get("select.studio_decoder_ndi_source_select").attributes["options"] == [
+        "CAM 1",
+        "CAM 2",
+        "REPLAY 1",
+    ]
+    client = mock_config_entry.runtime_data.client
+    assert client.stats.inline_relogins == 1
+    assert client.stats.logins == 2
+    # 720p50 showed up on the last poll and is still waiting to settle
+    assert coordinator.video_format.pending
+    assert coordinator.video_format.current.width == 1920
+
+    with pytest.raises(ReplayExhaustedError):
+        await client.get_channel()
+
+
+async def test_replay_at_speed(hass: HomeAssistant) -> None:
+    """At a given speed the replay keeps the captured poll intervals and latencies."""
+    replay = MagewellReplay(CAPTURE, speed=1000)
+    client = replay.client()
+    coordinator = type("Poller", (), {"async_refresh": client.get_summary_info})()
+
+    started = time.monotonic()
+    await client.get_summary_info()
+    assert await replay.async_run(coordinator) == 3
+    # Three 30 s poll intervals at 1000x
+    assert time.monotonic() - started >= 0.085
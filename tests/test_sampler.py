@@ -0,0 +1,99 @@
+"""Tests for the CPU and temperature sampler."""
+
+from datetime import timedelta
+from unittest.mock import AsyncMock
+
+import pytest
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry, async_fire_time_changed
+
+from custom_components.magewell.const import CONF_SAMPLE_INTERVAL, DOMAIN
+from custom_components.magewell.sampler import MagewellSampler
+from custom_components.magewell.stats import RingBuffer
+
+from .conftest import MOCK_HOST, MOCK_SUMMARY_INFO, MOCK_USER_INPUT, setup_integration
+
+
+def test_ring_buffer_wraps() -> None:
+    """Test the ring buffer keeps only the newest samples."""
+    buffer = RingBuffer(3)
+    assert buffer.min() is None
+    assert buffer.percentile(95) is None
+
+    for value in (1, 2, 3, 4, 5):
+        buffer.append(value)
+
+    assert len(buffer) == 3
+    assert buffer.values() == [3, 4, 5]
+    assert buffer.latest() == 5
+    assert buffer.min() == 3
+    assert buffer.max() == 5
+    assert buffer.mean() == 4
+
+
+def test_ring_buffer_percentile() -> None:
+    """Test nearest-rank percentiles."""
+    buffer = RingBuffer(100)
+    for value in range(1, 101):
+        buffer.append(value)
+    assert buffer.percentile(95) == 95
+    assert buffer.percentile(50) == 50
+
+
+def test_ring_buffer_rejects_zero_capacity() -> None:
+    """Test a buffer needs room for at least one sample."""
+    with pytest.raises(ValueError):
+        RingBuffer(0)
+
+
+def test_sampler_aggregates() -> None:
+    """Test the sampler aggregates summaries over its window."""
+    sampler = MagewellSampler(10)
+    assert sampler.buffers["cpu-usage"].capacity == 30
+
+    for cpu in (10.0, 90.0, 20.0):
+        sampler.add({"device": {"cpu-usage": cpu, "core-temp": 40.0}})
+    sampler.add({"device": {}})
+
+    assert sampler.statistic("cpu-usage", "min") == 10.0
+    assert sampler.statistic("cpu-usage", "max") == 90.0
+    assert sampler.statistic("cpu-usage", "mean") == 40.0
+    assert sampler.statistic("cpu-usage", "p95") == 90.0
+    assert sampler.statistic("core-temp", "mean") == 40.0
+    with pytest.raises(ValueError):
+        sampler.statistic("cpu-usage", "median")
+
+
+async def test_sampling_between_polls(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    mock_magewell_client_init: AsyncMock,
+) -> None:
+    """Test samples are taken at the configured interval, between polls."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        unique_id=MOCK_HOST,
+        data=MOCK_USER_INPUT,
+        options={CONF_SAMPLE_INTERVAL: 5},
+    )
+    await setup_integration(hass, entry)
+    sampler = entry.runtime_data.coordinator.sampler
+    assert len(sampler.buffers["cpu-usage"]) == 1
+
+    spike = {**MOCK_SUMMARY_INFO, "device": {**MOCK_SUMMARY_INFO["device"], "cpu-usage": 99.0}}
+    mock_magewell_client_init.get_summary_info.return_value = spike
+    freezer.tick(timedelta(seconds=5))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    assert len(sampler.buffers["cpu-usage"]) == 2
+    assert sampler.statistic("cpu-usage", "max") == 99.0
+
+    # The poll and the sampler are both due; only the sampler adds a sample
+    freezer.tick(timedelta(seconds=25))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert mock_magewell_client_init.get_channel.call_count == 2
+    assert len(sampler.buffers["cpu-usage"]) == 3
+    assert sampler.buffers["cpu-usage"].capacity == 60
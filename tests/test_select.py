@@ -8,7 +8,7 @@ from homeassistant.exceptions import HomeAssistantError
 
 from custom_components.magewell.api import MagewellApiError
 
-from .conftest import setup_integration
+from .conftest import MOCK_SUMMARY_INFO, setup_integration
 
 
 async def test_select_entity_options(
@@ -25,6 +25,28 @@ async def test_select_entity_options(
     assert state.state == "Camera 1"
 
 
+@pytest.mark.parametrize(
+    "ndi_name",
+    ["STUDIO (Camera 1)", "MAGEWELL (Test)"],
+)
+async def test_select_current_option_matches_full_names(
+    hass: HomeAssistant,
+    mock_config_entry,
+    mock_magewell_client_init: AsyncMock,
+    ndi_name: str,
+) -> None:
+    """The shown source is found among full NDI names by its reported or friendly name."""
+    mock_magewell_client_init.get_summary_info.return_value = {
+        **MOCK_SUMMARY_INFO,
+        "ndi": {**MOCK_SUMMARY_INFO["ndi"], "name": ndi_name},
+    }
+    mock_magewell_client_init.get_ndi_sources.return_value = ["STUDIO (Camera 1)", "STUDIO (Camera 2)"]
+    await setup_integration(hass, mock_config_entry)
+
+    assert hass.states.get("select.magewelltest_ndi_source_select").state == "STUDIO (Camera 1)"
+    assert hass.states.get("sensor.magewelltest_ndi_source").state == "Camera 1"
+
+
 async def test_select_option(
     hass: HomeAssistant,
     mock_config_entry,
@@ -1,12 +1,18 @@
 """Tests for the Magewell sensor platform."""
 
-from unittest.mock import AsyncMock
+from datetime import timedelta
+from unittest.mock import AsyncMock, patch
 
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.const import EVENT_STATE_CHANGED
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import entity_registry as er
+from pytest_homeassistant_custom_component.common import async_capture_events
 
 from custom_components.magewell.api import MagewellApiError
-from custom_components.magewell.sensor import _get_ndi_source_name, _get_resolution
+from custom_components.magewell.sensor import MagewellVideoRateSensor, _format_label
+from custom_components.magewell.sources import _get_ndi_source_name
+from custom_components.magewell.video import VideoFormat
 
 from .conftest import MOCK_SUMMARY_INFO, setup_integration
 
@@ -24,7 +30,7 @@ async def test_sensors_created(
     assert state.state == "ok"
     assert state.attributes["device_name"] == "MagewellTest"
     assert state.attributes["firmware"] == "1.3.456"
-    assert state.attributes["uptime"] == 86400
+    assert state.attributes["boot_time"] is not None
 
     state = hass.states.get("sensor.magewelltest_ndi_source")
     assert state is not None
@@ -34,6 +40,37 @@ async def test_sensors_created(
     assert state.attributes["ip_addr"] == "192.168.1.50"
 
 
+async def test_status_sensor_stable_between_polls(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    mock_config_entry,
+    mock_magewell_client_init: AsyncMock,
+) -> None:
+    """Test the status sensor does not change state as uptime advances."""
+    await setup_integration(hass, mock_config_entry)
+    coordinator = mock_config_entry.runtime_data.coordinator
+    boot_time = hass.states.get("sensor.magewelltest_status").attributes["boot_time"]
+    events = async_capture_events(hass, EVENT_STATE_CHANGED)
+
+    for poll in range(1, 4):
+        freezer.tick(timedelta(seconds=30))
+        device = {**MOCK_SUMMARY_INFO["device"], "up-time": 86400 + 30 * poll + 1}
+        mock_magewell_client_init.get_summary_info.return_value = {**MOCK_SUMMARY_INFO, "device": device}
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+    assert [e for e in events if e.data["entity_id"] == "sensor.magewelltest_status"] == []
+
+    # A reboot resets the counter and moves the boot time
+    freezer.tick(timedelta(seconds=30))
+    device = {**MOCK_SUMMARY_INFO["device"], "up-time": 20}
+    mock_magewell_client_init.get_summary_info.return_value = {**MOCK_SUMMARY_INFO, "device": device}
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert hass.states.get("sensor.magewelltest_status").attributes["boot_time"] != boot_time
+
+
 async def test_disabled_by_default_sensors(
     hass: HomeAssistant,
     mock_config_entry,
@@ -123,7 +160,7 @@ def test_get_ndi_source_name_empty_summary() -> None:
     assert _get_ndi_source_name({}) == "unknown"
 
 
-def test_get_resolution() -> None:
+def test_format_label() -> None:
     """Test resolution string building."""
     summary = {
         "ndi": {
@@ -132,10 +169,85 @@ def test_get_resolution() -> None:
             "video-field-rate": 60,
         }
     }
-    assert _get_resolution(summary) == "1920x1080@60fps"
+    assert _format_label(VideoFormat.from_summary(summary)) == "1920x1080@60fps"
 
 
-def test_get_resolution_no_video() -> None:
+def test_format_label_no_video() -> None:
     """Test resolution returns empty string when no video info."""
-    assert _get_resolution({}) == ""
-    assert _get_resolution({"ndi": {}}) == ""
+    assert _format_label(VideoFormat.from_summary({})) == ""
+    assert _format_label(VideoFormat.from_summary({"ndi": {}})) == ""
+
+
+# Unverified counter names (see video.py); the documented summary in
+# MOCK_SUMMARY_INFO does not carry them
+_VIDEO_COUNTERS = {
+    "video-frames": 5184000,
+    "video-frames-dropped": 12,
+    "video-frames-repeated": 3,
+    "total-bytes": 108000000000,
+}
+
+
+async def test_video_rate_sensors_without_counters(
+    hass: HomeAssistant,
+    mock_config_entry,
+    mock_magewell_client_init: AsyncMock,
+) -> None:
+    """Test the rate sensors stay unavailable when the summary has no counters."""
+    with patch.object(MagewellVideoRateSensor, "_attr_entity_registry_enabled_default", True):
+        await setup_integration(hass, mock_config_entry)
+    await mock_config_entry.runtime_data.coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    for entity_id in (
+        "sensor.magewelltest_video_frame_rate",
+        "sensor.magewelltest_dropped_frames",
+        "sensor.magewelltest_repeated_frames",
+        "sensor.magewelltest_ndi_bitrate",
+    ):
+        assert hass.states.get(entity_id).state == "unavailable"
+
+
+async def test_video_rate_sensors(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    mock_config_entry,
+    mock_magewell_client_init: AsyncMock,
+) -> None:
+    """Test pipeline rates are read from the summary counters through the coordinator."""
+    ndi = {**MOCK_SUMMARY_INFO["ndi"], **_VIDEO_COUNTERS}
+    mock_magewell_client_init.get_summary_info.return_value = {**MOCK_SUMMARY_INFO, "ndi": ndi}
+    with patch.object(MagewellVideoRateSensor, "_attr_entity_registry_enabled_default", True):
+        await setup_integration(hass, mock_config_entry)
+    coordinator = mock_config_entry.runtime_data.coordinator
+    assert hass.states.get("sensor.magewelltest_video_frame_rate").state == "unknown"
+
+    freezer.tick(timedelta(seconds=30))
+    mock_magewell_client_init.get_summary_info.return_value = {
+        **MOCK_SUMMARY_INFO,
+        "ndi": {
+            **ndi,
+            "video-frames": ndi["video-frames"] + 1770,
+            "video-frames-dropped": ndi["video-frames-dropped"] + 30,
+            "video-frames-repeated": ndi["video-frames-repeated"],
+            "total-bytes": ndi["total-bytes"] + 37_500_000,
+        },
+    }
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.magewelltest_video_frame_rate")
+    assert float(state.state) == 59.0
+    assert state.attributes["nominal_frame_rate"] == 60
+    assert float(hass.states.get("sensor.magewelltest_dropped_frames").state) == 1.0
+    assert float(hass.states.get("sensor.magewelltest_repeated_frames").state) == 0.0
+    assert float(hass.states.get("sensor.magewelltest_ndi_bitrate").state) == 10000.0
+
+    # Firmware without the counters leaves the sensors unavailable
+    mock_magewell_client_init.get_summary_info.return_value = {
+        **MOCK_SUMMARY_INFO,
+        "ndi": {key: value for key, value in ndi.items() if key != "video-frames"},
+    }
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.magewelltest_video_frame_rate").state == "unavailable"
@@ -0,0 +1,71 @@
+"""Tests for the Magewell service actions."""
+
+import asyncio
+import os
+from pathlib import Path
+from unittest.mock import AsyncMock
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.setup import async_setup_component
+
+from custom_components.magewell.const import DOMAIN
+from custom_components.magewell.profiler import async_get_profiler
+
+from .conftest import setup_integration
+
+
+async def test_profile_updates(
+    hass: HomeAssistant,
+    mock_config_entry,
+    mock_magewell_client_init: AsyncMock,
+    tmp_path: Path,
+) -> None:
+    """The profile covers the requested number of updates and is written to disk."""
+    hass.config.config_dir = str(tmp_path)
+    await setup_integration(hass, mock_config_entry)
+    coordinator = mock_config_entry.runtime_data.coordinator
+
+    call = hass.async_create_task(
+        hass.services.async_call(DOMAIN, "profile", {"updates": 2}, blocking=True, return_response=True)
+    )
+    await asyncio.sleep(0)
+    assert async_get_profiler(hass).session is not None
+
+    await coordinator.async_refresh()
+    await coordinator.async_refresh()
+    response = await call
+
+    assert response["updates"] == 2
+    assert response["top"]
+    assert {"function", "calls", "total_time", "cumulative_time"} <= response["top"][0].keys()
+    assert os.path.dirname(response["path"]) == str(tmp_path)
+    assert os.path.exists(response["path"])
+    assert async_get_profiler(hass).session is None
+
+
+async def test_profile_timeout(
+    hass: HomeAssistant,
+    mock_config_entry,
+    mock_magewell_client_init: AsyncMock,
+    tmp_path: Path,
+) -> None:
+    """The profile stops at the timeout with whatever it collected."""
+    hass.config.config_dir = str(tmp_path)
+    await setup_integration(hass, mock_config_entry)
+
+    response = await hass.services.async_call(
+        DOMAIN, "profile", {"updates": 5, "timeout": 1}, blocking=True, return_response=True
+    )
+
+    assert response["updates"] == 0
+    assert async_get_profiler(hass).session is None
+
+
+async def test_profile_without_devices(hass: HomeAssistant) -> None:
+    """The profile service needs a loaded device."""
+    assert await async_setup_component(hass, DOMAIN, {})
+
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(DOMAIN, "profile", {}, blocking=True, return_response=True)
@@ -0,0 +1,109 @@
+"""Tests for the NDI source index."""
+
+from unittest.mock import AsyncMock
+
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import async_capture_events
+
+from custom_components.magewell.const import EVENT_NDI_SOURCE_APPEARED, EVENT_NDI_SOURCE_DISAPPEARED
+from custom_components.magewell.sources import NdiSourceIndex
+
+from .conftest import setup_integration
+
+
+def test_index_is_stably_ordered() -> None:
+    """Test that device ordering does not affect the index."""
+    index = NdiSourceIndex()
+    added, removed = index.update(["camera 2", "Camera 1", "Camera 3"])
+    assert added == ["Camera 1", "camera 2", "Camera 3"]
+    assert removed == []
+    names = index.names
+
+    assert index.update(["Camera 3", "camera 2", "Camera 1"]) == ([], [])
+    assert index.names is names
+    assert "Camera 1" in index
+    assert "Camera 4" not in index
+    assert len(index) == 3
+
+
+def test_index_reports_changes() -> None:
+    """Test added and removed sources are computed from the previous set."""
+    index = NdiSourceIndex()
+    index.update(["Camera 1", "Camera 2"])
+
+    assert index.update(["Camera 2", "Camera 3"]) == (["Camera 3"], ["Camera 1"])
+    assert index.names == ["Camera 2", "Camera 3"]
+
+
+def test_index_resolves_stream_names() -> None:
+    """Sources are found by full name, or by stream name when only one machine offers it."""
+    index = NdiSourceIndex()
+    index.update(["STUDIO (Camera 1)", "STUDIO (Camera 2)", "TRUCK (Camera 2)", "Bare"])
+    assert index.resolve("STUDIO (Camera 1)") == "STUDIO (Camera 1)"
+    assert index.resolve("Camera 1") == "STUDIO (Camera 1)"
+    assert index.resolve("Camera 2") is None
+    assert index.resolve("Bare") == "Bare"
+    assert index.resolve("Camera 9") is None
+    assert index.stream_name("TRUCK (Camera 2)") == "Camera 2"
+
+
+def test_index_matches_reported_source() -> None:
+    """The source a decoder reports is matched by full, friendly or stream name."""
+    index = NdiSourceIndex()
+    index.update(["STUDIO (Camera 1)", "Camera 2"])
+    assert index.match("STUDIO (Camera 1)", "Camera 1") == "STUDIO (Camera 1)"
+    assert index.match("MAGEWELL (Test)", "Camera 1") == "STUDIO (Camera 1)"
+    assert index.match("OTHER (Camera 2)", "unknown") == "Camera 2"
+    assert index.match("OTHER (Camera 3)", "Camera 3") is None
+    assert index.match(None, None) is None
+
+
+async def test_source_events_fire_only_on_change(
+    hass: HomeAssistant,
+    mock_config_entry,
+    mock_magewell_client_init: AsyncMock,
+) -> None:
+    """Test appear/disappear events fire for real membership changes only."""
+    appeared = async_capture_events(hass, EVENT_NDI_SOURCE_APPEARED)
+    disappeared = async_capture_events(hass, EVENT_NDI_SOURCE_DISAPPEARED)
+    await setup_integration(hass, mock_config_entry)
+    coordinator = mock_config_entry.runtime_data.coordinator
+
+    # Initial population and reordering are not changes
+    assert appeared == []
+    mock_magewell_client_init.get_ndi_sources.return_value = ["Camera 3", "Camera 2", "Camera 1"]
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert appeared == []
+    assert disappeared == []
+
+    mock_magewell_client_init.get_ndi_sources.return_value = ["Camera 2", "Camera 4", "Camera 3"]
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert [event.data["source"] for event in appeared] == ["Camera 4"]
+    assert [event.data["source"] for event in disappeared] == ["Camera 1"]
+    assert appeared[0].data["config_entry_id"] == mock_config_entry.entry_id
+
+    state = hass.states.get("select.magewelltest_ndi_source_select")
+    assert state.attributes["options"] == ["Camera 2", "Camera 3", "Camera 4"]
+
+
+async def test_shared_sources_leave_health_and_schedule_alone(
+    hass: HomeAssistant,
+    mock_config_entry,
+    mock_magewell_client_init: AsyncMock,
+) -> None:
+    """Test a list from another decoder does not revive or reschedule this one."""
+    await setup_integration(hass, mock_config_entry)
+    coordinator = mock_config_entry.runtime_data.coordinator
+    unsub_refresh = coordinator._unsub_refresh
+
+    coordinator.async_set_ndi_sources(["Camera 1", "Camera 4"])
+    assert coordinator.data["ndi_sources"] == ["Camera 1", "Camera 4"]
+    assert coordinator._unsub_refresh is unsub_refresh
+
+    coordinator.last_update_success = False
+    coordinator.async_set_ndi_sources(["Camera 5"])
+    assert coordinator.last_update_success is False
+    assert coordinator.data["ndi_sources"] == ["Camera 1", "Camera 4"]
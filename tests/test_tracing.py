@@ -0,0 +1,142 @@
+"""Tests for per-poll tracing."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.magewell.api import MagewellClient
+from custom_components.magewell.tracing import PollTracer, trace_span
+
+from .conftest import setup_integration
+
+
+def test_span_outside_trace_is_ignored() -> None:
+    """Spans outside a traced update record nothing."""
+    tracer = PollTracer(2)
+    with trace_span("login"):
+        pass
+    assert len(tracer) == 0
+
+
+def test_tracer_keeps_recent_traces() -> None:
+    """The tracer is bounded and records failed updates with their error."""
+    tracer = PollTracer(2)
+    for name in ("first", "second"):
+        with tracer.trace(), trace_span(name):
+            pass
+    with pytest.raises(TimeoutError), tracer.trace():
+        raise TimeoutError
+
+    traces = tracer.as_list()
+    assert len(traces) == 2
+    assert [span["name"] for span in traces[0]["spans"]] == ["second"]
+    assert traces[1]["error"] == "TimeoutError"
+    assert traces[1]["spans"] == []
+
+
+def test_trace_events_export() -> None:
+    """The export uses complete events in microseconds, one per update and span."""
+    tracer = PollTracer(5)
+    with tracer.trace(), trace_span("get-channel"):
+        pass
+
+    export = tracer.as_trace_events("Decoder")
+    metadata, update, span = export["traceEvents"]
+    assert metadata["args"] == {"name": "Decoder"}
+    assert update["name"] == "update"
+    assert span["name"] == "get-channel"
+    assert span["ph"] == "X"
+    assert update["ts"] <= span["ts"]
+    assert span["dur"] <= update["dur"]
+
+
+async def test_spans_after_trace_are_ignored() -> None:
+    """A task started during an update does not stretch its trace afterwards."""
+    tracer = PollTracer(1)
+    release = asyncio.Event()
+
+    async def _later() -> None:
+        await release.wait()
+        with trace_span("set-channel"):
+            await asyncio.sleep(0.05)
+
+    with tracer.trace():
+        task = asyncio.create_task(_later())
+        with trace_span("fetch"):
+            pass
+    before = tracer.as_list()[0]
+
+    release.set()
+    await task
+
+    after = tracer.as_list()[0]
+    assert after == before
+    assert [span["name"] for span in after["spans"]] == ["fetch"]
+    assert after["duration"] < 50
+
+
+async def test_client_spans() -> None:
+    """The client records login, each call and the body decoding."""
+    client = MagewellClient("192.168.1.100", "Admin", "password")
+    response = AsyncMock()
+    response.json = AsyncMock(return_value={"status": 0})
+    cm = AsyncMock()
+    cm.__aenter__ = AsyncMock(return_value=response)
+    cm.__aexit__ = AsyncMock(return_value=None)
+    client._session = MagicMock(closed=False, get=MagicMock(return_value=cm))
+
+    tracer = PollTracer(1)
+    with tracer.trace():
+        await client.get_channel()
+
+    names = [span["name"] for span in tracer.as_list()[0]["spans"]]
+    assert names == ["get-channel", "login", "login parse", "get-channel parse"]
+
+
+async def test_coordinator_traces_updates(
+    hass: HomeAssistant,
+    mock_config_entry,
+    mock_magewell_client_init: AsyncMock,
+) -> None:
+    """Each update is traced, including processing and listener dispatch."""
+    await setup_integration(hass, mock_config_entry)
+    coordinator = mock_config_entry.runtime_data.coordinator
+
+    await coordinator.async_refresh()
+
+    traces = coordinator.traces.as_list()
+    assert len(traces) == 2
+    names = [span["name"] for span in traces[-1]["spans"]]
+    assert names == ["process", "dispatch"]
+    assert traces[-1]["error"] is None
+
+
+async def test_coordinator_trace_closes_after_dispatch(
+    hass: HomeAssistant,
+    mock_config_entry,
+    mock_magewell_client_init: AsyncMock,
+) -> None:
+    """Work started during an update is not added to its trace once it is over."""
+    await setup_integration(hass, mock_config_entry)
+    coordinator = mock_config_entry.runtime_data.coordinator
+    client = mock_config_entry.runtime_data.client
+    summary = client.get_summary_info.return_value
+    tasks: list[asyncio.Task] = []
+
+    async def _later() -> None:
+        await asyncio.sleep(0.01)
+        with trace_span("set-channel"):
+            pass
+
+    async def _get_summary_info() -> dict:
+        tasks.append(hass.async_create_task(_later()))
+        return summary
+
+    client.get_summary_info.side_effect = _get_summary_info
+    await coordinator.async_refresh()
+    await asyncio.gather(*tasks)
+
+    names = [span["name"] for span in coordinator.traces.as_list()[-1]["spans"]]
+    assert names == ["process", "dispatch"]
@@ -0,0 +1,157 @@
+"""Tests for the NDI video pipeline metrics."""
+
+from datetime import timedelta
+from unittest.mock import AsyncMock
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import async_capture_events, async_fire_time_changed
+
+from custom_components.magewell.const import EVENT_VIDEO_FORMAT_CHANGED
+from custom_components.magewell.stats import CounterRate
+from custom_components.magewell.video import VideoFormat, VideoFormatTracker, VideoPipelineTracker
+
+from .conftest import MOCK_SUMMARY_INFO, setup_integration
+
+
+def test_counter_rate() -> None:
+    """Test rates come from deltas and survive counter resets."""
+    rate = CounterRate()
+    assert rate.update(100, 0.0) is None
+    assert rate.update(400, 10.0) == 30.0
+
+    # Counter restarted at 50 after a reboot
+    assert rate.update(50, 20.0) == 5.0
+
+    # A missing reading forgets the history
+    assert rate.update(None, 30.0) is None
+    assert rate.update(10, 40.0) is None
+
+
+def _summary(frames: int, dropped: int, repeated: int, total_bytes: int) -> dict:
+    return {
+        "ndi": {
+            "video-field-rate": 60,
+            "video-frames": frames,
+            "video-frames-dropped": dropped,
+            "video-frames-repeated": repeated,
+            "total-bytes": total_bytes,
+        }
+    }
+
+
+def test_video_pipeline_tracker() -> None:
+    """Test per-interval frame and bitrate metrics."""
+    tracker = VideoPipelineTracker()
+    tracker.update(_summary(0, 0, 0, 0), 0.0)
+    assert tracker.frame_rate is None
+    assert tracker.bitrate is None
+
+    tracker.update(_summary(1770, 30, 3, 75_000_000), 30.0)
+    assert tracker.frame_rate == 59.0
+    assert tracker.dropped_frame_rate == 1.0
+    assert tracker.repeated_frame_rate == 0.1
+    assert tracker.bitrate == 20_000.0
+    assert tracker.nominal_frame_rate == 60
+
+
+def test_video_pipeline_tracker_without_counters() -> None:
+    """Test firmware without counters leaves the rates empty."""
+    tracker = VideoPipelineTracker()
+    tracker.update({"ndi": {}}, 0.0)
+    tracker.update({"ndi": {}}, 30.0)
+    assert tracker.frame_rate is None
+    assert tracker.nominal_frame_rate is None
+
+
+def test_video_format_from_summary() -> None:
+    """Test typed format extraction and its label."""
+    video_format = VideoFormat.from_summary(
+        {"ndi": {"video-width": 1920, "video-height": 1080, "video-field-rate": 60}}
+    )
+    assert video_format == VideoFormat(1920, 1080, 60)
+    assert video_format.label == "1920x1080@60fps"
+    assert video_format.as_dict() == {"width": 1920, "height": 1080, "rate": 60}
+    assert VideoFormat.from_summary({}) is None
+
+
+def test_video_format_tracker_debounces() -> None:
+    """Test a format change is only reported once it has settled."""
+    hd = VideoFormat(1920, 1080, 60)
+    uhd = VideoFormat(3840, 2160, 30)
+    tracker = VideoFormatTracker(settle_time=5)
+
+    # The first observation seeds the tracker without a change
+    assert tracker.update(hd, 0.0) is False
+    assert tracker.current == hd
+
+    # A brief flap that reverts before settling is ignored
+    assert tracker.update(None, 1.0) is False
+    assert tracker.update(hd, 2.0) is False
+    assert tracker.current == hd
+
+    assert tracker.update(uhd, 10.0) is False
+    assert tracker.pending is True
+    assert tracker.update(uhd, 15.0) is True
+    assert tracker.current == uhd
+    assert tracker.pending is False
+    assert tracker.update(uhd, 20.0) is False
+
+    # Losing the video must settle too
+    assert tracker.update(None, 21.0) is False
+    assert tracker.update(None, 26.0) is True
+    assert tracker.current is None
+
+
+async def test_video_format_changed_event(
+    hass: HomeAssistant,
+    mock_config_entry,
+    mock_magewell_client_init: AsyncMock,
+) -> None:
+    """Test one event is fired per settled format change."""
+    events = async_capture_events(hass, EVENT_VIDEO_FORMAT_CHANGED)
+    await setup_integration(hass, mock_config_entry)
+    coordinator = mock_config_entry.runtime_data.coordinator
+    coordinator.video_format.settle_time = 0
+
+    ndi = {**MOCK_SUMMARY_INFO["ndi"], "video-width": 1280, "video-height": 720}
+    mock_magewell_client_init.get_summary_info.return_value = {**MOCK_SUMMARY_INFO, "ndi": ndi}
+    await coordinator.async_refresh()
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert len(events) == 1
+    assert events[0].data["width"] == 1280
+    assert events[0].data["height"] == 720
+    assert events[0].data["previous"] == {"width": 1920, "height": 1080, "rate": 60}
+
+    state = hass.states.get("sensor.magewelltest_ndi_source")
+    assert state.attributes["video_resolution"] == "1280x720@60fps"
+    assert state.attributes["video_width"] == 1280
+
+
+async def test_video_format_confirmed_after_settle_time(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    mock_config_entry,
+    mock_magewell_client_init: AsyncMock,
+) -> None:
+    """Test a new format is reported after the settle time, not at the next poll."""
+    events = async_capture_events(hass, EVENT_VIDEO_FORMAT_CHANGED)
+    await setup_integration(hass, mock_config_entry)
+    coordinator = mock_config_entry.runtime_data.coordinator
+
+    ndi = {**MOCK_SUMMARY_INFO["ndi"], "video-width": 1280, "video-height": 720}
+    mock_magewell_client_init.get_summary_info.return_value = {**MOCK_SUMMARY_INFO, "ndi": ndi}
+    await coordinator.async_refresh()
+    assert coordinator.video_format.pending
+    assert events == []
+
+    freezer.tick(timedelta(seconds=5))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    assert len(events) == 1
+    assert mock_magewell_client_init.get_summary_info.call_count == 3
+    state = hass.states.get("sensor.magewelltest_ndi_source")
+    assert state.attributes["video_resolution"] == "1280x720@60fps"
@@ -0,0 +1,75 @@
+"""Tests for the slow callback watchdog."""
+
+import logging
+import time
+from unittest.mock import AsyncMock
+
+import pytest
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.magewell.const import CONF_WATCHDOG_THRESHOLD, DOMAIN
+from custom_components.magewell.diagnostics import async_get_config_entry_diagnostics
+from custom_components.magewell.watchdog import MagewellWatchdog
+
+from .conftest import MOCK_HOST, MOCK_USER_INPUT, setup_integration
+
+
+def _block_the_loop() -> None:
+    time.sleep(0.1)
+
+
+async def test_slow_callback_flagged_with_stack(hass: HomeAssistant, caplog: pytest.LogCaptureFixture) -> None:
+    """A callback over the threshold is counted and logged once with the blocking stack."""
+    watchdog = MagewellWatchdog("Decoder", 0.02)
+    stop = watchdog.async_start(hass)
+    try:
+        with caplog.at_level(logging.DEBUG):
+            for _ in range(2):
+                with watchdog.watch("slow"):
+                    _block_the_loop()
+            with watchdog.watch("fast"):
+                pass
+    finally:
+        stop()
+
+    callbacks = watchdog.as_dict()["callbacks"]
+    assert callbacks["slow"]["calls"] == 2
+    assert callbacks["slow"]["slow"] == 2
+    assert callbacks["fast"]["slow"] == 0
+    warnings = [record for record in caplog.records if record.levelno == logging.WARNING]
+    assert len(warnings) == 1
+    assert "slow on Decoder blocked the event loop" in warnings[0].getMessage()
+    assert "_block_the_loop" in warnings[0].getMessage()
+
+
+async def test_watchdog_times_entity_updates(
+    hass: HomeAssistant,
+    mock_magewell_client_init: AsyncMock,
+) -> None:
+    """With the option set, state writes and the dispatch are timed and reported."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        unique_id=MOCK_HOST,
+        data=MOCK_USER_INPUT,
+        options={CONF_WATCHDOG_THRESHOLD: 1000},
+        title=f"Magewell ({MOCK_HOST})",
+    )
+    await setup_integration(hass, entry)
+    coordinator = entry.runtime_data.coordinator
+    thread = coordinator.watchdog._thread
+    assert thread.is_alive()
+
+    await coordinator.async_refresh()
+
+    diag = await async_get_config_entry_diagnostics(hass, entry)
+    callbacks = diag["watchdog"]["callbacks"]
+    assert callbacks["listener dispatch"]["calls"] == 2
+    assert callbacks["select.magewelltest_ndi_source_select state write"]["calls"] == 1
+    assert callbacks["NDI source index"]["calls"] == 2
+
+    await hass.config_entries.async_unload(entry.entry_id)
+    assert coordinator.watchdog._stop.is_set()
+    # Joined in the executor rather than on the event loop
+    await hass.async_block_till_done()
+    assert not thread.is_alive()
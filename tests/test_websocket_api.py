@@ -0,0 +1,86 @@
+"""Tests for the fleet websocket commands."""
+
+from unittest.mock import AsyncMock
+
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.typing import WebSocketGenerator
+
+from custom_components.magewell.fleet import FLEET_SCHEMA_VERSION
+from custom_components.magewell.stats import RingBuffer
+
+from .conftest import MOCK_SUMMARY_INFO, setup_integration
+
+
+def _latency(seconds: float) -> RingBuffer:
+    buffer = RingBuffer(10)
+    buffer.append(seconds)
+    return buffer
+
+
+async def test_fleet_snapshot(
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+    mock_config_entry: MockConfigEntry,
+    mock_magewell_client_init: AsyncMock,
+) -> None:
+    """The fleet command returns every decoder in one payload."""
+    mock_magewell_client_init.latency.return_value = _latency(0.0123)
+    await setup_integration(hass, mock_config_entry)
+
+    client = await hass_ws_client(hass)
+    await client.send_json_auto_id({"type": "magewell/fleet"})
+    msg = await client.receive_json()
+
+    assert msg["success"]
+    assert msg["result"] == {
+        "version": FLEET_SCHEMA_VERSION,
+        "decoders": {
+            mock_config_entry.entry_id: {
+                "name": mock_config_entry.title,
+                "available": True,
+                "status": "ok",
+                "source": "Camera 1",
+                "connected": True,
+                "resolution": "1920x1080@60fps",
+                "cpu_usage": 25.0,
+                "core_temperature": 45.0,
+                "latency": 12,
+            }
+        },
+    }
+
+
+async def test_fleet_subscription_streams_deltas(
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+    mock_config_entry: MockConfigEntry,
+    mock_magewell_client_init: AsyncMock,
+) -> None:
+    """After the snapshot only changed fields are sent, and nothing when nothing changed."""
+    mock_magewell_client_init.latency.return_value = _latency(0.01)
+    await setup_integration(hass, mock_config_entry)
+    coordinator = mock_config_entry.runtime_data.coordinator
+    entry_id = mock_config_entry.entry_id
+
+    client = await hass_ws_client(hass)
+    await client.send_json_auto_id({"type": "magewell/fleet/subscribe"})
+    msg = await client.receive_json()
+    assert msg["success"]
+    msg = await client.receive_json()
+    assert msg["event"]["type"] == "snapshot"
+    assert msg["event"]["decoders"][entry_id]["core_temperature"] == 45.0
+
+    # An identical poll sends nothing; a hotter one sends only the temperature
+    await coordinator.async_refresh()
+    mock_magewell_client_init.get_summary_info.return_value = {
+        **MOCK_SUMMARY_INFO,
+        "device": {**MOCK_SUMMARY_INFO["device"], "core-temp": 61.0},
+    }
+    await coordinator.async_refresh()
+    msg = await client.receive_json()
+    assert msg["event"] == {"type": "delta", "entry_id": entry_id, "changes": {"core_temperature": 61.0}}
+
+    await hass.config_entries.async_unload(entry_id)
+    msg = await client.receive_json()
+    assert msg["event"] == {"type": "removed", "entry_id": entry_id}